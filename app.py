@@ -1,5 +1,5 @@
 import streamlit as st
-import sympy
+from importlib.metadata import PackageNotFoundError, version
 
 st.set_page_config(
     page_title="Ingeniería Civil — Estructuras con SymPy",
@@ -31,12 +31,12 @@ Este proyecto es una colección de herramientas interactivas para resolver probl
 
 with st.sidebar:
     st.header("Verificación de versiones")
-    st.write(f"**SymPy:** {sympy.__version__}")
-    try:
-        import streamlit as st_pkg
-        st.write(f"**Streamlit:** {st_pkg.__version__}")
-    except Exception:
-        st.write("No se pudo verificar la versión de Streamlit.")
+    # Versiones desde los metadatos de los paquetes: no importa SymPy al abrir la app
+    for paquete, nombre in (("sympy", "SymPy"), ("streamlit", "Streamlit")):
+        try:
+            st.write(f"**{nombre}:** {version(paquete)}")
+        except PackageNotFoundError:
+            st.write(f"No se pudo verificar la versión de {nombre}.")
 
     st.markdown("---")
     st.info("Selecciona una página para comenzar.")
@@ -1,191 +1,465 @@
+import uuid
 import streamlit as st
+from functools import partial
 import sympy as sp
 import numpy as np
 import pandas as pd
 from utils.structural_helpers import (
     symbols_safe, solve_positive, piecewise_load_to_expr,
-    integrate_shear_moment, plot_piecewise,
+    integrate_shear_moment, plot_piecewise, simplified_latex,
     validar_longitud, validar_area, validar_modulo_elastico, UNIDADES
 )
+from utils.piecewise_poly import PiecewisePolynomial
+from utils.beam_solver import (
+    continuous_beam_diagrams, assemble_continuous_beam, solve_continuous_beam,
+    beam_deflection, parse_distributed_loads, PESO_PROPIO
+)
+from utils.moving_loads import axle_train, moving_load_envelope, critical_axle_positions
+from utils.load_combinations import case_diagrams, combination_matrix, combination_envelopes
+import plotly.graph_objs as go
+from utils.result_cache import RESULT_CACHE, memoize, model_key
+from utils.background import JOBS
+from utils.stage_graph import StageGraph
+from utils.profiling import Profiler, span
+
+# Etapas de cálculo con caché por contenido: cambiar solo opciones de salida no vuelve a resolver
+ensamblar_viga = memoize("viga.estructura")(assemble_continuous_beam)
+resolver_viga_continua = memoize("viga.rigidez")(solve_continuous_beam)
+resolver_flechas = memoize("viga.flechas")(beam_deflection)
+RA, RB = symbols_safe('RA RB')
+
+@memoize("viga.reacciones")
+def reacciones_viga_simple(L, w_pp, puntuales, moms):
+    # --- Ensamblaje de ecuaciones de equilibrio ---
+    eqs = []
+    # Equilibrio vertical
+    eqs.append(RA + RB - sum(P for P, _ in puntuales) - w_pp.integrate(0, L))
+    # Momento en A
+    mom_puntuales = sum(P * (a) for P, a in puntuales)
+    mom_w = (w_pp * PiecewisePolynomial.from_global(0, L, [0, 1])).integrate(0, L)
+    mom_moms = sum(M for M, a in moms)
+    # Momentos aplicados con el convenio de M(x) = ... - Σ M_i H(x - a_i)
+    eqs.append(RB * L - mom_puntuales - mom_w + mom_moms)
+
+    # --- Resolución de reacciones ---
+    try:
+        return solve_positive(eqs, [RA, RB], timeout=10)
+    except TimeoutError:
+        return []
 
 st.set_page_config(page_title="Viga apoyada: reacciones y diagramas")
 st.title("Viga apoyada: reacciones y diagramas")
 
-# --- Entradas ---
-st.header("Datos de la viga")
-col1, col2 = st.columns(2)
-with col1:
-    L = st.number_input("Longitud L [m]", min_value=0.01, value=6.0, step=0.1, format="%.2f")
+# --- Medición de tiempos por etapa (cProfile opcional) ---
+perfil = Profiler("viga", cprofile=st.sidebar.checkbox("Capturar perfil con cProfile", value=False),
+                  sesion=st.session_state.setdefault("sesion_id", uuid.uuid4().hex)).start()
+try:
+    # --- Entradas ---
+    st.header("Datos de la viga")
+    col1, col2 = st.columns(2)
+    with col1:
+        L = st.number_input("Longitud L [m]", min_value=0.01, value=6.0, step=0.1, format="%.2f")
+        try:
+            validar_longitud(L, "longitud de viga")
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+    with col2:
+        tipo_apoyos = st.selectbox(
+            "Tipo de apoyos",
+            ["simple-simple", "empotrado-empotrado", "empotrado-simple", "empotrado-libre", "continua"],
+            index=0
+        )
+
+    # Nudos de la viga para el método de rigidez (extremos y apoyos intermedios)
+    if tipo_apoyos == "continua":
+        st.subheader("Apoyos intermedios")
+        intermedios = st.data_editor(
+            pd.DataFrame({"x [m]": [L / 2], "Tipo": ["simple"]}),
+            num_rows="dynamic", key="apoyos_intermedios",
+            column_config={"Tipo": st.column_config.SelectboxColumn(options=["simple", "empotrado"])},
+        )
+        col3, col4 = st.columns(2)
+        with col3:
+            apoyo_izq = st.selectbox("Apoyo en x = 0", ["simple", "empotrado", "libre"], index=0)
+        with col4:
+            apoyo_der = st.selectbox("Apoyo en x = L", ["simple", "empotrado", "libre"], index=0)
+        nudos = {0.0: apoyo_izq, float(L): apoyo_der}
+        for xi, tipo in zip(intermedios["x [m]"], intermedios["Tipo"]):
+            if not pd.isna(xi) and 0 < float(xi) < L:
+                nudos[float(xi)] = tipo or "simple"
+        x_nudos = sorted(nudos)
+        tipos_nudos = [nudos[xi] for xi in x_nudos]
+    else:
+        x_nudos = [0.0, float(L)]
+        tipos_nudos = tipo_apoyos.split("-")
+
+    st.subheader("Cargas puntuales")
+    cargas_puntuales = st.data_editor(
+        pd.DataFrame({"P [kN]":[], "a [m]":[]}),
+        num_rows="dynamic", key="puntuales"
+    )
+
+    st.subheader("Cargas distribuidas por tramos")
+    def_cargas = st.text_area(
+        "Definición de cargas distribuidas (ejemplo: 0 3 5 uniforme; 3 6 2x+1 triangular)",
+        value=""
+    )
+
+    st.subheader("Momentos aplicados")
+    momentos = st.data_editor(
+        pd.DataFrame({"M [kN·m]":[], "a [m]":[]}),
+        num_rows="dynamic", key="momentos"
+    )
+
+    peso_propio = st.checkbox("Incluir peso propio (γ=25 kN/m³, sección 0.3x0.5 m²)", value=False)
+
+    st.subheader("Rigidez a flexión")
+    col5, col6 = st.columns(2)
+    with col5:
+        E_viga = st.number_input("Módulo elástico E [kPa]", min_value=1.0, value=2.5e7, format="%.3e")
+    with col6:
+        I_viga = st.number_input("Inercia I [m⁴]", min_value=1e-10, value=0.3 * 0.5**3 / 12, format="%.3e")
+    with st.expander("Tramos con inercia distinta"):
+        tramos_I = st.data_editor(
+            pd.DataFrame({"desde [m]": [], "hasta [m]": [], "I [m⁴]": []}),
+            num_rows="dynamic", key="tramos_inercia"
+        )
     try:
-        validar_longitud(L, "longitud de viga")
+        validar_modulo_elastico(E_viga)
+        validar_area(I_viga, "inercia")
     except ValueError as e:
         st.error(str(e))
         st.stop()
-with col2:
-    tipo_apoyos = st.selectbox("Tipo de apoyos", ["simple-simple"], index=0)
+    # Segmentos (a, b, EI) que cubren la viga; los tramos de la tabla reemplazan la inercia base
+    filas_I = [(float(a), float(b), float(I)) for a, b, I in
+               zip(tramos_I["desde [m]"], tramos_I["hasta [m]"], tramos_I["I [m⁴]"])
+               if not (pd.isna(a) or pd.isna(b) or pd.isna(I)) and a < b and I > 0]
+    cortes_I = sorted({0.0, float(L)} | {min(max(v, 0.0), L) for a, b, _ in filas_I for v in (a, b)})
+    EI_segmentos = []
+    for a, b in zip(cortes_I[:-1], cortes_I[1:]):
+        I_tramo = next((I for a_i, b_i, I in reversed(filas_I) if a_i <= (a + b) / 2 <= b_i), I_viga)
+        EI_segmentos.append((a, b, E_viga * I_tramo))
 
-st.subheader("Cargas puntuales")
-cargas_puntuales = st.data_editor(
-    pd.DataFrame({"P [kN]":[], "a [m]":[]}),
-    num_rows="dynamic", key="puntuales"
-)
+    # --- Procesamiento de cargas ---
+    x = symbols_safe('x')
+    cargas_pw = []
 
-st.subheader("Cargas distribuidas por tramos")
-def_cargas = st.text_area(
-    "Definición de cargas distribuidas (ejemplo: 0 3 5 uniforme; 3 6 2x+1 triangular)",
-    value=""
-)
+    # Cargas distribuidas por tramos
+    if def_cargas.strip():
+        cargas_pw, no_reconocidos = parse_distributed_loads(def_cargas)
+        for tipo in no_reconocidos:
+            st.warning(f"Tipo de carga no reconocido: {tipo}")
 
-st.subheader("Momentos aplicados")
-momentos = st.data_editor(
-    pd.DataFrame({"M [kN·m]":[], "a [m]":[]}),
-    num_rows="dynamic", key="momentos"
-)
+    # Peso propio
+    if peso_propio:
+        cargas_pw.append(((0, L), PESO_PROPIO, 'x'))
+
+    # Carga total como polinomio por tramos: integrales exactas por coeficientes
+    w_pp = PiecewisePolynomial.from_loads(cargas_pw, (0, L))
+
+    # Cargas puntuales y momentos
+    # Solo se descartan filas incompletas: una carga o un momento en a = 0 (sobre el apoyo) es válido
+    puntuales = [(float(P), float(a)) for P, a in zip(cargas_puntuales["P [kN]"], cargas_puntuales["a [m]"])
+                 if pd.notna(P) and pd.notna(a)]
+    moms = [(float(M), float(a)) for M, a in zip(momentos["M [kN·m]"], momentos["a [m]"]) if pd.notna(M) and pd.notna(a)]
+
+    # Validación de posiciones
+    for _, a in puntuales + moms:
+        if not (0 <= a <= L):
+            st.warning(f"Carga o momento fuera del rango [0, L]: posición {a}")
+
+    # Resultantes de las cargas
+    sum_puntuales = sum(P for P, _ in puntuales)
+    sum_w = w_pp.integrate(0, L)
+
+    # --- Grafo de etapas: ensamblaje → solución → diagramas → flechas; solo se recalcula lo afectado ---
+    # (editar una carga reutiliza la estructura ensamblada; las opciones de salida no vuelven a resolver)
+    etapas = StageGraph(st.session_state.setdefault("etapas_viga", {}))
+    etapas.set_inputs(L=L, w_pp=w_pp, cargas_pw=cargas_pw, puntuales=puntuales, moms=moms,
+                      x_nudos=x_nudos, tipos_nudos=tipos_nudos, EI_segmentos=EI_segmentos)
+
+    @etapas.stage("reacciones_simple", entradas=("L", "w_pp", "puntuales", "moms"))
+    def etapa_reacciones_simple(L, w_pp, puntuales, moms):
+        return reacciones_viga_simple(L, w_pp, puntuales, moms)
+
+    @etapas.stage("estructura", entradas=("x_nudos", "tipos_nudos", "EI_segmentos"))
+    def etapa_estructura(x_nudos, tipos_nudos, EI_segmentos):
+        return ensamblar_viga(x_nudos, tipos_nudos, EI_segmentos)
 
-peso_propio = st.checkbox("Incluir peso propio (γ=25 kN/m³, sección 0.3x0.5 m²)", value=False)
-
-# --- Procesamiento de cargas ---
-x = symbols_safe('x')
-cargas_pw = []
-
-# Cargas distribuidas por tramos
-if def_cargas.strip():
-    for linea in def_cargas.strip().split(';'):
-        partes = linea.strip().split()
-        if len(partes) >= 4:
-            a, b = float(partes[0]), float(partes[1])
-            expr = partes[2]
-            tipo = partes[3].lower()
-            if tipo == "uniforme":
-                expr_pw = float(expr)
-            elif tipo == "triangular":
-                expr_pw = sp.sympify(expr)
+    @etapas.stage("viga_continua", entradas=("cargas_pw", "puntuales", "moms"), depende=("estructura",))
+    def etapa_viga_continua(cargas_pw, puntuales, moms, estructura):
+        return resolver_viga_continua(estructura, cargas_pw, puntuales, moms)
+
+    if tipo_apoyos == "simple-simple":
+        sols = etapas.get("reacciones_simple")
+        if not sols:
+            st.error("No se pudo resolver el sistema de reacciones. Verifica las cargas y apoyos.")
+            st.stop()
+        reacciones = sols[0]
+
+        st.subheader("Reacciones de apoyo")
+        st.latex(f"R_A = {sp.latex(reacciones[RA])} \\,\\text{{kN}}")
+        st.latex(f"R_B = {sp.latex(reacciones[RB])} \\,\\text{{kN}}")
+
+        # --- Construcción de V(x) y M(x) ---
+        # Escalones exactos para puntuales y momentos; la carga distribuida se integra por coeficientes
+        V_pp = PiecewisePolynomial.constant(0, L, float(reacciones[RA]))
+        for P, a in puntuales:
+            V_pp = V_pp - PiecewisePolynomial.constant(a, L, P)
+        Vw, _ = integrate_shear_moment(w_pp)
+        V_pp = V_pp + Vw
+        M_pp = V_pp.antiderivative()
+        for M, a in moms:
+            M_pp = M_pp - PiecewisePolynomial.constant(a, L, M)
+        sum_reacciones = float(reacciones[RA] + reacciones[RB])
+        x_apoyos, tipos_apoyos = [0.0, float(L)], ["simple", "simple"]
+    else:
+        # --- Viga continua o hiperestática: método de rigidez en banda ---
+        try:
+            viga = etapas.get("viga_continua")
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+        V_pp, M_pp = viga["V"], viga["M"]
+        x_apoyos, tipos_apoyos = viga["x_nodos"], viga["apoyos"]
+        sum_reacciones = float(viga["reacciones"][:, 0].sum())
+        st.subheader("Reacciones de apoyo")
+        st.table(pd.DataFrame({
+            "x [m]": viga["x_nodos"],
+            "Apoyo": viga["apoyos"],
+            "R [kN]": viga["reacciones"][:, 0],
+            "M [kN·m]": viga["reacciones"][:, 1],
+        }))
+
+    # --- Expresiones simbólicas (bajo demanda) ---
+    # Solo se construyen, simplifican y renderizan al abrir el panel. sympy.simplify corre en procesos
+    # aparte con presupuesto de tiempo: si se agota, o si las entradas cambian antes de terminar,
+    # el proceso se termina y se muestra la expresión sin simplificar.
+    st.subheader("Expresiones simbólicas")
+    if st.checkbox("Mostrar V(x) y M(x) simbólicas (simplificación y LaTeX)", value=False):
+        presupuesto = st.number_input("Presupuesto para simplificar [s]", min_value=0.1, value=2.0, step=0.5)
+        sesion = st.session_state.setdefault("sesion_id", uuid.uuid4().hex)
+        expresiones = {"V": V_pp.to_sympy(x), "M": M_pp.to_sympy(x)}
+        claves = {"V": model_key("viga.latex", V_pp), "M": model_key("viga.latex", M_pp)}
+        latex_diagramas = {n: RESULT_CACHE.get(claves[n]) for n in expresiones}
+        trabajos = {n: JOBS.submit(f"{sesion}:viga.{n}", claves[n], simplified_latex, expr, None, timeout=presupuesto)
+                    for n, expr in expresiones.items() if latex_diagramas[n] is None}
+        barra = st.progress(0.0, text="Simplificando expresiones...")
+        for n, trabajo in trabajos.items():
+            try:
+                latex_diagramas[n] = JOBS.wait(trabajo, lambda t: barra.progress(
+                    t.progress, text=f"Simplificando {n}(x): {t.estado} ({t.elapsed:.1f} s)"))
+                RESULT_CACHE.put(claves[n], latex_diagramas[n])
+            except TimeoutError:
+                latex_diagramas[n] = sp.latex(expresiones[n])
+                st.caption(f"{n}(x): la simplificación excedió {presupuesto:.1f} s; se muestra sin simplificar.")
+        barra.empty()
+        st.markdown("**Cortante V(x):**")
+        st.latex(f"V(x) = {latex_diagramas['V']}")
+        st.markdown("**Momento M(x):**")
+        st.latex(f"M(x) = {latex_diagramas['M']}")
+
+    # --- Cálculo de posiciones de V=0 y máximos de |M| ---
+    # Tramo por tramo: ceros de V (incluidos los saltos que cruzan cero) y extremos de M
+    V0_pos = [float(p) for p in V_pp.zero_crossings() if 0 <= p <= L]
+    M_max_pos = [float(p) for p in M_pp.critical_points() if 0 <= p <= L]
+    V_max, pos_max_V = V_pp.abs_max()
+    M_max, pos_max_M = M_pp.abs_max()
+
+    # --- Evaluación numérica y gráficos ---
+    N = 400
+    x_vals = np.linspace(0, L, N)
+    V_vals = V_pp(x_vals)
+    M_vals = M_pp(x_vals)
+
+    fig_v = plot_piecewise(V_pp, x, (0, L), num=N, title="Diagrama de cortante V(x)")
+    fig_m = plot_piecewise(M_pp, x, (0, L), num=N, title="Diagrama de momento M(x)")
+
+    st.subheader("Diagramas")
+    st.plotly_chart(fig_v, use_container_width=True)
+    st.plotly_chart(fig_m, use_container_width=True)
+
+    # --- Tabla de máximos ---
+    df_max = pd.DataFrame({
+        "Magnitud": ["|V| máximo", "|M| máximo"],
+        "Valor": [abs(V_max), abs(M_max)],
+        "Posición [m]": [pos_max_V, pos_max_M]
+    })
+    st.subheader("Máximos absolutos")
+    st.table(df_max)
+    if V0_pos:
+        st.markdown("**Posiciones con V = 0 [m]:** " + ", ".join(f"{p:.3f}" for p in V0_pos))
+
+    # --- Giros y flechas ---
+    # Doble integración exacta de M/EI por tramos; constantes por las condiciones de apoyo
+    etapas.set_inputs(M_pp=M_pp, x_apoyos=x_apoyos, tipos_apoyos=tipos_apoyos)
+
+    @etapas.stage("flechas", entradas=("M_pp", "x_apoyos", "tipos_apoyos", "EI_segmentos"))
+    def etapa_flechas(M_pp, x_apoyos, tipos_apoyos, EI_segmentos):
+        return resolver_flechas(M_pp, x_apoyos, tipos_apoyos, EI_segmentos)
+
+    deflexion = etapas.get("flechas")
+    v_vals = deflexion["v"](x_vals)
+    theta_vals = deflexion["theta"](x_vals)
+    st.subheader("Giros y flechas")
+    fig_def = plot_piecewise(deflexion["v"] * 1000, x, (0, L), num=N, title="Flecha v(x) [mm]")
+    st.plotly_chart(fig_def, use_container_width=True)
+    st.table(pd.DataFrame({
+        "Magnitud": ["Flecha máxima", "Giro máximo"],
+        "Valor": [deflexion["v_max"] * 1000, deflexion["theta_max"]],
+        "Unidades": ["mm", "rad"],
+        "Posición [m]": [deflexion["x_v_max"], deflexion["x_theta_max"]],
+    }))
+    if abs(deflexion["v_max"]) > 0:
+        st.markdown(f"**Relación L/δ:** {L / abs(deflexion['v_max']):.0f}")
+
+    # --- Cargas móviles ---
+    with st.expander("Cargas móviles: tren de ejes, líneas de influencia y envolventes"):
+        tren = st.data_editor(
+            pd.DataFrame({"P [kN]": [35.0, 145.0, 145.0], "d [m]": [0.0, 4.3, 8.6]}),
+            num_rows="dynamic", key="tren"
+        )
+        incluir_fijas = st.checkbox("Sumar las cargas fijas a las envolventes", value=True)
+        ejes = axle_train(tren["P [kN]"], tren["d [m]"])
+        if tipo_apoyos != "simple-simple":
+            st.info("Las líneas de influencia están disponibles para la viga simplemente apoyada.")
+        elif ejes:
+            P_ejes, d_ejes = zip(*ejes)
+            etapas.set_inputs(ejes=ejes, x_vals=x_vals)
+
+            @etapas.stage("envolvente_movil", entradas=("L", "ejes", "x_vals"))
+            def etapa_envolvente_movil(L, ejes, x_vals):
+                P_ejes, d_ejes = zip(*ejes)
+                return moving_load_envelope(L, P_ejes, d_ejes, x_vals)
+
+            try:
+                env = etapas.get("envolvente_movil")
+            except ValueError as e:
+                st.error(str(e))
             else:
-                st.warning(f"Tipo de carga no reconocido: {tipo}")
+                V_fijo = V_vals if incluir_fijas else 0.0
+                M_fijo = M_vals if incluir_fijas else 0.0
+                for nombre, fijo, unidades in (("V", V_fijo, "kN"), ("M", M_fijo, "kN·m")):
+                    fig_env = go.Figure()
+                    fig_env.add_trace(go.Scatter(x=x_vals, y=env[f"{nombre}_max"] + fijo, mode="lines", name="Máximo"))
+                    fig_env.add_trace(go.Scatter(x=x_vals, y=env[f"{nombre}_min"] + fijo, mode="lines", name="Mínimo"))
+                    fig_env.update_layout(title=f"Envolvente de {nombre}(x)", xaxis_title="x [m]",
+                                          yaxis_title=f"{nombre} [{unidades}]")
+                    st.plotly_chart(fig_env, use_container_width=True)
+                filas = []
+                for clave in ("V_max", "V_min", "M_max", "M_min"):
+                    valor, x_c, pos_ejes = critical_axle_positions(env, d_ejes, clave)
+                    filas.append({
+                        "Envolvente": clave,
+                        "Valor (solo tren)": valor,
+                        "Estación [m]": x_c,
+                        "Posición de los ejes [m]": ", ".join(f"{p:.2f}" for p in pos_ejes),
+                    })
+                st.table(pd.DataFrame(filas))
+                st.caption(f"{env['posiciones'].size} posiciones del tren × {len(x_vals)} estaciones evaluadas.")
+
+    # --- Combinaciones de carga ---
+    with st.expander("Combinaciones de carga: envolventes por superposición"):
+        st.markdown(
+            "Cada caso básico se resuelve una vez en la malla de x; las combinaciones se obtienen "
+            "con un producto matricial (combinaciones × casos)."
+        )
+        casos_tabla = st.data_editor(
+            pd.DataFrame({
+                "Caso": ["D", "L", "W"],
+                "Tipo": ["distribuida", "puntual", "puntual"],
+                "Valor": [5.0, 20.0, -10.0],
+                "a [m]": [0.0, L / 2, L / 3],
+                "b [m]": [L, None, None],
+            }),
+            num_rows="dynamic", key="casos_basicos",
+            column_config={"Tipo": st.column_config.SelectboxColumn(options=["distribuida", "puntual", "momento"])},
+        )
+        texto_combos = st.text_area("Combinaciones (separadas por ';')", value="1.4D; 1.2D+1.6L; 1.2D+1.0W+1.0L; 0.9D+1.0W")
+        casos = {}
+        for caso, tipo, valor, a, b in zip(casos_tabla["Caso"], casos_tabla["Tipo"], casos_tabla["Valor"],
+                                           casos_tabla["a [m]"], casos_tabla["b [m]"]):
+            if not caso or pd.isna(valor):
                 continue
-            cargas_pw.append(((a, b), expr_pw, 'x'))
+            c = casos.setdefault(str(caso).strip(), {"distribuidas": [], "puntuales": [], "momentos": []})
+            a = float(a) if not pd.isna(a) else 0.0
+            if tipo == "distribuida":
+                b = float(b) if not pd.isna(b) else L
+                c["distribuidas"].append(((a, b), float(valor), 'x'))
+            elif tipo == "momento":
+                c["momentos"].append((float(valor), a))
+            else:
+                c["puntuales"].append((float(valor), a))
+        combos = [c.strip() for c in texto_combos.split(";") if c.strip()]
+        if casos and combos:
+            etapas.set_inputs(casos=casos, combos=combos, tipo_apoyos=tipo_apoyos, x_vals=x_vals)
 
-# Peso propio
-if peso_propio:
-    gamma = 25  # kN/m³
-    b = 0.3
-    h = 0.5
-    w_pp = gamma * b * h  # kN/m
-    cargas_pw.append(((0, L), w_pp, 'x'))
+            @etapas.stage("combinaciones", entradas=("L", "casos", "combos", "tipo_apoyos", "x_nudos",
+                                                     "tipos_nudos", "x_vals"))
+            def etapa_combinaciones(L, casos, combos, tipo_apoyos, x_nudos, tipos_nudos, x_vals):
+                resolver = None
+                if tipo_apoyos != "simple-simple":
+                    resolver = partial(continuous_beam_diagrams, x_nudos, tipos_nudos)
+                nombres_casos, V_casos, M_casos = case_diagrams(L, casos, x_vals, resolver)
+                F = combination_matrix(combos, nombres_casos)
+                return combination_envelopes(V_casos, M_casos, F, combos)
 
-w_expr = piecewise_load_to_expr(cargas_pw) if cargas_pw else 0
+            try:
+                env_c = etapas.get("combinaciones")
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                for nombre, unidades in (("V", "kN"), ("M", "kN·m")):
+                    fig_c = go.Figure()
+                    for sufijo in ("max", "min"):
+                        fig_c.add_trace(go.Scatter(
+                            x=x_vals, y=env_c[f"{nombre}_{sufijo}"], mode="lines",
+                            name="Máximo" if sufijo == "max" else "Mínimo",
+                            customdata=env_c[f"control_{nombre}_{sufijo}"],
+                            hovertemplate="x=%{x:.3f}<br>%{y:.3f}<br>%{customdata}<extra></extra>",
+                        ))
+                    fig_c.update_layout(title=f"Envolvente de combinaciones: {nombre}(x)", xaxis_title="x [m]",
+                                        yaxis_title=f"{nombre} [{unidades}]")
+                    st.plotly_chart(fig_c, use_container_width=True)
+                filas = []
+                for clave in ("V_max", "V_min", "M_max", "M_min"):
+                    j = int(np.argmax(env_c[clave]) if clave.endswith("max") else np.argmin(env_c[clave]))
+                    filas.append({"Envolvente": clave, "Valor": env_c[clave][j], "x [m]": x_vals[j],
+                                  "Combinación que controla": env_c[f"control_{clave}"][j]})
+                st.table(pd.DataFrame(filas))
 
-# Cargas puntuales y momentos
-puntuales = [(float(P), float(a)) for P, a in zip(cargas_puntuales["P [kN]"], cargas_puntuales["a [m]"]) if P and a]
-moms = [(float(M), float(a)) for M, a in zip(momentos["M [kN·m]"], momentos["a [m]"]) if M and a]
+    # --- Exportar CSV ---
+    if st.button("Exportar resultados a CSV"):
+        df_export = pd.DataFrame({
+            "x [m]": x_vals,
+            "V(x) [kN]": V_vals,
+            "M(x) [kN·m]": M_vals,
+            "θ(x) [rad]": theta_vals,
+            "v(x) [m]": v_vals
+        })
+        df_export.to_csv("data/ejemplo_viga_resultados.csv", index=False)
+        st.success("Archivo exportado en data/ejemplo_viga_resultados.csv")
 
-# Validación de posiciones
-for _, a in puntuales + moms:
-    if not (0 <= a <= L):
-        st.warning(f"Carga o momento fuera del rango [0, L]: posición {a}")
+    # --- Validación de equilibrio ---
+    sum_cargas = float(sum_puntuales + sum_w)
+    if abs(sum_reacciones - sum_cargas) > 1e-3:
+        st.warning(f"Advertencia: el equilibrio vertical no se cumple exactamente (ΣR={sum_reacciones:.3f}, ΣCargas={sum_cargas:.3f})")
+    if sum_reacciones < 0:
+        st.warning("Advertencia: la suma de reacciones es negativa, revisa las cargas aplicadas.")
+finally:
+    # También al salir con st.stop() o por una excepción: cProfile queda desactivado
+    # y la ejecución interrumpida llega al registro
+    perfil.stop()
+    perfil.write_log()
 
-# --- Ensamblaje de ecuaciones de equilibrio ---
-RA, RB = symbols_safe('RA RB')
+# --- Tiempos de la ejecución ---
+with st.sidebar.expander("Tiempos de la ejecución"):
+    st.caption(f"Total: {1000 * perfil.total:.0f} ms")
+    st.dataframe(perfil.table(), hide_index=True)
+    if perfil.profile_text():
+        st.code(perfil.profile_text())
 
-eqs = []
-# Equilibrio vertical
-sum_puntuales = sum(P for P, _ in puntuales)
-sum_w = sp.integrate(w_expr, (x, 0, L)) if w_expr != 0 else 0
-sum_momentos = sum(M for M, _ in moms)
-
-eqs.append(RA + RB - sum_puntuales - sum_w)
-# Momento en A
-mom_puntuales = sum(P * (a) for P, a in puntuales)
-mom_w = sp.integrate(w_expr * (x), (x, 0, L)) if w_expr != 0 else 0
-mom_moms = sum(M for M, a in moms)
-eqs.append(RB * L - mom_puntuales - mom_w - mom_moms)
-
-# --- Resolución de reacciones ---
-sols = solve_positive(eqs, [RA, RB])
-if not sols:
-    st.error("No se pudo resolver el sistema de reacciones. Verifica las cargas y apoyos.")
-    st.stop()
-reacciones = sols[0]
-
-st.subheader("Reacciones de apoyo")
-st.latex(f"R_A = {sp.latex(reacciones[RA])} \,\text{{kN}}")
-st.latex(f"R_B = {sp.latex(reacciones[RB])} \,\text{{kN}}")
-
-# --- Construcción de V(x) y M(x) ---
-# Suma de Heaviside para puntuales y momentos
-Vx = reacciones[RA]
-Mx = reacciones[RA]*x
-for P, a in puntuales:
-    Vx -= P * sp.Heaviside(x - a, 0)
-    Mx -= P * sp.Heaviside(x - a, 0) * (x - a)
-for M, a in moms:
-    Mx -= M * sp.Heaviside(x - a, 0)
-if w_expr != 0:
-    Vw, Mw = integrate_shear_moment(w_expr, x)
-    Vx -= (Vw.subs(x, x) - Vw.subs(x, 0))
-    Mx -= (Mw.subs(x, x) - Mw.subs(x, 0))
-Mx += reacciones[RB]*(0)  # Momento en B=0 para viga simple-simple
-
-st.subheader("Expresiones simbólicas")
-st.markdown("**Cortante V(x):**")
-st.latex(f"V(x) = {sp.latex(Vx)}")
-st.markdown("**Momento M(x):**")
-st.latex(f"M(x) = {sp.latex(Mx)}")
-
-# --- Cálculo de posiciones de V=0 y máximos de |M| ---
-Vx_s = sp.simplify(Vx)
-Mx_s = sp.simplify(Mx)
-V0_pos = sp.solve(Vx_s, x)
-M_abs = sp.Abs(Mx_s)
-M_max_pos = sp.solve(sp.diff(M_abs, x), x)
-
-# Filtrar soluciones reales y dentro de [0, L]
-V0_pos = [float(p.evalf()) for p in V0_pos if p.is_real and 0 <= p.evalf() <= L]
-M_max_pos = [float(p.evalf()) for p in M_max_pos if p.is_real and 0 <= p.evalf() <= L]
-
-# --- Evaluación numérica y gráficos ---
-N = 400
-x_vals = np.linspace(0, L, N)
-V_func = sp.lambdify(x, Vx_s, modules=["numpy"])
-M_func = sp.lambdify(x, Mx_s, modules=["numpy"])
-V_vals = V_func(x_vals)
-M_vals = M_func(x_vals)
-
-fig_v = plot_piecewise(Vx_s, x, (0, L), num=N, title="Diagrama de cortante V(x)")
-fig_m = plot_piecewise(Mx_s, x, (0, L), num=N, title="Diagrama de momento M(x)")
-
-st.subheader("Diagramas")
-st.plotly_chart(fig_v, use_container_width=True)
-st.plotly_chart(fig_m, use_container_width=True)
-
-# --- Tabla de máximos ---
-max_V = np.max(np.abs(V_vals))
-pos_max_V = x_vals[np.argmax(np.abs(V_vals))]
-max_M = np.max(np.abs(M_vals))
-pos_max_M = x_vals[np.argmax(np.abs(M_vals))]
-
-df_max = pd.DataFrame({
-    "Magnitud": ["|V| máximo", "|M| máximo"],
-    "Valor": [max_V, max_M],
-    "Posición [m]": [pos_max_V, pos_max_M]
-})
-st.subheader("Máximos absolutos")
-st.table(df_max)
-
-# --- Exportar CSV ---
-if st.button("Exportar resultados a CSV"):
-    df_export = pd.DataFrame({
-        "x [m]": x_vals,
-        "V(x) [kN]": V_vals,
-        "M(x) [kN·m]": M_vals
-    })
-    df_export.to_csv("data/ejemplo_viga_resultados.csv", index=False)
-    st.success("Archivo exportado en data/ejemplo_viga_resultados.csv")
-
-# --- Validación de equilibrio ---
-sum_reacciones = float(reacciones[RA] + reacciones[RB])
-sum_cargas = float(sum_puntuales + sum_w)
-if abs(sum_reacciones - sum_cargas) > 1e-3:
-    st.warning(f"Advertencia: el equilibrio vertical no se cumple exactamente (ΣR={sum_reacciones:.3f}, ΣCargas={sum_cargas:.3f})")
-if sum_reacciones < 0:
-    st.warning("Advertencia: la suma de reacciones es negativa, revisa las cargas aplicadas.")
+# --- Caché de resultados ---
+st.sidebar.caption(RESULT_CACHE.summary())
+st.sidebar.caption("Etapas recalculadas: " + (", ".join(etapas.ejecutadas) or "ninguna"))
@@ -1,165 +1,321 @@
+import uuid
 import streamlit as st
-import sympy as sp
 import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
-from utils.structural_helpers import symbols_safe, solve_positive, validar_longitud
+from utils.structural_helpers import solve_positive, validar_longitud
+from utils.truss_solver import FactorizedTruss, TrussModel, truss_stability, solve_truss_symbolic
+from utils.frame_solver import FrameModel, StiffnessSolver
+from utils.result_cache import RESULT_CACHE, memoize, model_key
+from utils.background import JOBS, report_progress
+from utils.stage_graph import StageGraph
+from utils.profiling import Profiler, span
+
+@st.cache_resource(max_entries=8)
+def factorizar_rigidez(nodos_t, barras_t, apoyos_t, E, A):
+    # Rigidez ensamblada, reordenada (RCM) y factorizada una vez por geometría, apoyos y material
+    return StiffnessSolver(FrameModel(dict(nodos_t), list(barras_t), dict(apoyos_t), E, A))
+
+# El diagnóstico (SVD) se guarda por contenido del modelo: se comparte entre sesiones
+estabilidad_cercha = memoize("cercha.estabilidad")(truss_stability)
+
+@memoize("cercha.rigidez")
+def resolver_rigidez(nodos, barras, apoyos, E, A, cargas):
+    return factorizar_rigidez(tuple(nodos.items()), tuple(barras), tuple(apoyos.items()), E, A).analyze(cargas)
 
 st.set_page_config(page_title="Cercha plana: método de nudos")
 st.title("Cercha plana: método de nudos")
 
-st.header("Definición de la cercha")
-
-# --- Entradas de nodos ---
-st.subheader("Nodos (coordenadas)")
-def_nodos = st.data_editor(
-    pd.DataFrame({"nodo":[], "x [m]":[], "y [m]":[]}),
-    num_rows="dynamic", key="nodos"
-)
-
-# --- Entradas de barras ---
-st.subheader("Barras (conectividad)")
-def_barras = st.data_editor(
-    pd.DataFrame({"barra":[], "nodo_i":[], "nodo_j":[]}),
-    num_rows="dynamic", key="barras"
-)
-
-# --- Apoyos ---
-st.subheader("Apoyos")
-def_apoyos = st.data_editor(
-    pd.DataFrame({"nodo":[], "tipo":[]}),
-    num_rows="dynamic", key="apoyos"
-)
-
-# --- Cargas puntuales ---
-st.subheader("Cargas puntuales en nodos")
-def_cargas = st.data_editor(
-    pd.DataFrame({"nodo":[], "Fx [kN]":[], "Fy [kN]":[]}),
-    num_rows="dynamic", key="cargas"
-)
-
-# --- Procesamiento de datos ---
-# Nodos
-nodos = {row["nodo"]: (float(row["x [m]"]), float(row["y [m]"])) for _, row in def_nodos.iterrows() if row["nodo"]}
-# Barras
-barras = [(row["barra"], row["nodo_i"], row["nodo_j"]) for _, row in def_barras.iterrows() if row["barra"] and row["nodo_i"] and row["nodo_j"]]
-# Apoyos
-apoyos = {row["nodo"]: row["tipo"] for _, row in def_apoyos.iterrows() if row["nodo"] and row["tipo"]}
-# Cargas
-cargas = {row["nodo"]: (float(row["Fx [kN]"] or 0), float(row["Fy [kN]"] or 0)) for _, row in def_cargas.iterrows() if row["nodo"]}
-
-if not nodos or not barras:
-    st.info("Define al menos dos nodos y una barra para continuar.")
-    st.stop()
-
-# --- Variables simbólicas para fuerzas en barras ---
-N_barras = {b: symbols_safe(f'N_{b}') for b, _, _ in barras}
-# Reacciones
-reacciones = {}
-for n, tipo in apoyos.items():
-    if tipo.lower() == "pasador":
-        reacciones[f"Rx_{n}"] = symbols_safe(f"Rx_{n}")
-        reacciones[f"Ry_{n}"] = symbols_safe(f"Ry_{n}")
-    elif tipo.lower() == "rodillo":
-        reacciones[f"Ry_{n}"] = symbols_safe(f"Ry_{n}")
-
-# --- Ensamblaje de ecuaciones de nudos ---
-eqs = []
-incognitas = list(N_barras.values()) + list(reacciones.values())
-for n, (x0, y0) in nodos.items():
-    # Barras conectadas al nodo
-    barras_n = [(b, ni, nj) for b, ni, nj in barras if ni == n or nj == n]
-    eq_fx = 0
-    eq_fy = 0
-    for b, ni, nj in barras_n:
-        xi, yi = nodos[ni]
-        xj, yj = nodos[nj]
-        # Sentido: de i a j
-        dx = xj - xi
-        dy = yj - yi
-        L = np.hypot(dx, dy)
-        if L == 0:
-            continue
-        cos = (dx / L) if n == ni else (-dx / L)
-        sen = (dy / L) if n == ni else (-dy / L)
-        eq_fx += N_barras[b] * cos
-        eq_fy += N_barras[b] * sen
-    # Reacciones
-    if f"Rx_{n}" in reacciones:
-        eq_fx += reacciones[f"Rx_{n}"]
-    if f"Ry_{n}" in reacciones:
-        eq_fy += reacciones[f"Ry_{n}"]
+# --- Medición de tiempos por etapa (cProfile opcional) ---
+sesion = st.session_state.setdefault("sesion_id", uuid.uuid4().hex)
+perfil = Profiler("cercha", cprofile=st.sidebar.checkbox("Capturar perfil con cProfile", value=False),
+                  sesion=sesion).start()
+try:
+    st.header("Definición de la cercha")
+
+    # --- Entradas de nodos ---
+    st.subheader("Nodos (coordenadas)")
+    def_nodos = st.data_editor(
+        pd.DataFrame({"nodo":[], "x [m]":[], "y [m]":[]}),
+        num_rows="dynamic", key="nodos"
+    )
+
+    # --- Entradas de barras ---
+    st.subheader("Barras (conectividad)")
+    def_barras = st.data_editor(
+        pd.DataFrame({"barra":[], "nodo_i":[], "nodo_j":[]}),
+        num_rows="dynamic", key="barras"
+    )
+
+    # --- Apoyos ---
+    st.subheader("Apoyos")
+    def_apoyos = st.data_editor(
+        pd.DataFrame({"nodo":[], "tipo":[]}),
+        num_rows="dynamic", key="apoyos"
+    )
+
+    # --- Cargas puntuales ---
+    st.subheader("Cargas puntuales en nodos")
+    def_cargas = st.data_editor(
+        pd.DataFrame({"nodo":[], "Fx [kN]":[], "Fy [kN]":[]}),
+        num_rows="dynamic", key="cargas"
+    )
+
+    # --- Procesamiento de datos ---
+    # Nodos
+    nodos = {row["nodo"]: (float(row["x [m]"]), float(row["y [m]"])) for _, row in def_nodos.iterrows() if row["nodo"]}
+    # Barras
+    barras = [(row["barra"], row["nodo_i"], row["nodo_j"]) for _, row in def_barras.iterrows() if row["barra"] and row["nodo_i"] and row["nodo_j"]]
+    # Apoyos
+    apoyos = {row["nodo"]: row["tipo"] for _, row in def_apoyos.iterrows() if row["nodo"] and row["tipo"]}
     # Cargas
-    fx, fy = cargas.get(n, (0, 0))
-    eq_fx -= fx
-    eq_fy -= fy
-    eqs.append(eq_fx)
-    eqs.append(eq_fy)
-
-# --- Validación de isostaticidad ---
-edof = 2 * len(nodos)
-if len(eqs) != len(incognitas):
-    st.warning(f"Sistema no isostático: ecuaciones={len(eqs)}, incógnitas={len(incognitas)}. Puede haber mecanismo o indeterminación.")
-
-# --- Resolución simbólica ---
-sols = sp.solve(eqs, incognitas, dict=True)
-if not sols:
-    st.error("No se pudo resolver el sistema. Revisa la geometría, apoyos y cargas.")
-    st.stop()
-sol = sols[0]
-
-# --- Salidas: tabla de esfuerzos ---
-data_barras = []
-for b, _, _ in barras:
-    Nval = sol[N_barras[b]]
-    tipo = "Tensión" if Nval > 0 else "Compresión" if Nval < 0 else "Nulo"
-    data_barras.append({"Barra": b, "N [kN]": float(Nval), "Tipo": tipo})
-df_barras = pd.DataFrame(data_barras)
-
-st.subheader("Esfuerzos en barras")
-st.table(df_barras)
-
-# --- Máximos ---
-max_N = df_barras["N [kN]"].abs().max()
-barra_max = df_barras.iloc[df_barras["N [kN]"].abs().idxmax()]["Barra"]
-st.markdown(f"**Máximo |N|:** {max_N:.2f} kN en barra {barra_max}")
-
-# --- Gráfica de la cercha ---
-fig = go.Figure()
-for b, ni, nj in barras:
-    xi, yi = nodos[ni]
-    xj, yj = nodos[nj]
-    Nval = float(sol[N_barras[b]])
-    color = "red" if Nval < 0 else "blue" if Nval > 0 else "gray"
-    width = 2 + 6 * abs(Nval) / (max_N if max_N else 1)
-    fig.add_trace(go.Scatter(
-        x=[xi, xj], y=[yi, yj],
-        mode="lines+markers+text",
-        line=dict(color=color, width=width),
-        marker=dict(size=8),
-        text=[ni, nj],
-        textposition="top center",
-        name=f"{b}"
-    ))
-fig.update_layout(title="Cercha: diagrama de esfuerzos", xaxis_title="x [m]", yaxis_title="y [m]", showlegend=False)
-st.plotly_chart(fig, use_container_width=True)
-
-# --- Exportar CSV ---
-if st.button("Exportar resultados a CSV"):
-    df_nodos = pd.DataFrame([{"nodo": n, "x [m]": x, "y [m]": y} for n, (x, y) in nodos.items()])
-    df_barras_exp = pd.DataFrame([{"barra": b, "nodo_i": ni, "nodo_j": nj} for b, ni, nj in barras])
-    df_apoyos = pd.DataFrame([{"nodo": n, "tipo": t} for n, t in apoyos.items()])
-    df_cargas = pd.DataFrame([{"nodo": n, "Fx [kN]": fx, "Fy [kN]": fy} for n, (fx, fy) in cargas.items()])
-    df_reacciones = pd.DataFrame([{k: float(sol[v])} for k, v in reacciones.items()])
-    with pd.ExcelWriter("data/ejemplo_cercha_resultados.xlsx") as writer:
-        df_nodos.to_excel(writer, sheet_name="nodos", index=False)
-        df_barras_exp.to_excel(writer, sheet_name="barras", index=False)
-        df_apoyos.to_excel(writer, sheet_name="apoyos", index=False)
-        df_cargas.to_excel(writer, sheet_name="cargas", index=False)
-        df_barras.to_excel(writer, sheet_name="esfuerzos", index=False)
-        df_reacciones.to_excel(writer, sheet_name="reacciones", index=False)
-    st.success("Archivo exportado en data/ejemplo_cercha_resultados.xlsx")
-
-# --- Ejemplos en data/ejemplos.csv ---
-st.markdown("---")
-st.markdown("Ejemplos de cerchas tipo Pratt y Howe disponibles en [data/ejemplos.csv](data/ejemplos.csv)")
+    cargas = {row["nodo"]: (float(row["Fx [kN]"] or 0), float(row["Fy [kN]"] or 0)) for _, row in def_cargas.iterrows() if row["nodo"]}
+
+    if not nodos or not barras:
+        st.info("Define al menos dos nodos y una barra para continuar.")
+        st.stop()
+
+    # --- Grafo de etapas: modelo → estabilidad / factorización → solución; cambiar una carga reutiliza
+    # el modelo y la factorización guardados en la sesión ---
+    etapas = StageGraph(st.session_state.setdefault("etapas_cercha", {}))
+    etapas.set_inputs(nodos=nodos, barras=barras, apoyos=apoyos, cargas=cargas)
+
+    @etapas.stage("modelo", entradas=("nodos", "barras", "apoyos"))
+    def etapa_modelo(nodos, barras, apoyos):
+        return TrussModel(nodos, barras, apoyos)
+
+    @etapas.stage("estabilidad", depende=("modelo",))
+    def etapa_estabilidad(modelo):
+        return estabilidad_cercha(modelo)
+
+    @etapas.stage("factorizacion", depende=("modelo",))
+    def etapa_factorizacion(modelo):
+        return FactorizedTruss.from_model(modelo)
+
+    @etapas.stage("solucion_nudos", entradas=("cargas",), depende=("factorizacion",))
+    def etapa_solucion_nudos(cargas, factorizacion):
+        return factorizacion.solve(cargas)
+
+    modo_simbolico = st.checkbox("Resolución simbólica con SymPy (solo ejemplos pequeños)", value=False)
+    if modo_simbolico:
+        presupuesto = st.number_input("Presupuesto de tiempo para sympy.solve [s]", min_value=0.5, value=20.0, step=5.0)
+        etapas.set_inputs(presupuesto=presupuesto)
+
+        @etapas.stage("solucion_simbolica", entradas=("nodos", "barras", "apoyos", "cargas", "presupuesto"))
+        def etapa_solucion_simbolica(nodos, barras, apoyos, cargas, presupuesto):
+            # sympy.solve en un proceso aparte: progreso visible, presupuesto de tiempo y cancelación
+            # del trabajo anterior de la sesión si las entradas cambian antes de que termine. Un resultado
+            # en caché no lanza ningún proceso; un presupuesto agotado se recuerda (JOBS) hasta que
+            # cambien las entradas o el presupuesto.
+            clave = model_key("cercha.simbolica", nodos, barras, apoyos, cargas)
+            faltante = object()
+            resultado = RESULT_CACHE.get(clave, faltante)
+            if resultado is not faltante:
+                return resultado
+            trabajo = JOBS.submit(f"{sesion}:cercha", clave, solve_truss_symbolic, nodos, barras, apoyos, cargas,
+                                  progreso=report_progress, timeout=presupuesto)
+            barra = st.progress(0.0, text="Resolución simbólica en cola...")
+            try:
+                resultado = JOBS.wait(trabajo, lambda t: barra.progress(
+                    t.progress, text=f"{t.mensaje or t.estado} ({t.elapsed:.1f} s)"))
+            finally:
+                barra.empty()
+            RESULT_CACHE.put(clave, resultado)
+            return resultado
+    usar_rigidez = st.checkbox("Método de rigidez directa (desplazamientos; necesario en cerchas hiperestáticas)", value=False)
+
+    # --- Verificación de estabilidad e isostaticidad (antes de resolver) ---
+    try:
+        modelo = etapas.get("modelo")
+    except ValueError as e:
+        st.error(f"No se pudo resolver el sistema. {e}")
+        st.stop()
+    estabilidad = etapas.get("estabilidad")
+    # Hiperestática estable (rango completo de filas, más incógnitas que ecuaciones) o demasiado
+    # grande para el diagnóstico con SVD: se resuelve por rigidez, que detecta los mecanismos
+    hiperestatica = estabilidad["incognitas"] > estabilidad["ecuaciones"] and (
+        estabilidad["estable"] or estabilidad["rango"] is None)
+    if not estabilidad["isostatica"] and hiperestatica:
+        if not usar_rigidez:
+            st.info(
+                f"Cercha hiperestática (ecuaciones={estabilidad['ecuaciones']}, incógnitas={estabilidad['incognitas']}): "
+                "se resuelve por el método de rigidez directa."
+            )
+        usar_rigidez = True
+    elif not estabilidad["isostatica"]:
+        st.error(
+            f"Sistema no isostático: ecuaciones={estabilidad['ecuaciones']}, "
+            f"incógnitas={estabilidad['incognitas']}, rango={estabilidad['rango']}."
+        )
+        for k, nudos_m in enumerate(estabilidad["mecanismos"], start=1):
+            st.markdown(f"- Mecanismo {k}: nudos {', '.join(map(str, nudos_m))}")
+        for k, incog_r in enumerate(estabilidad["redundantes"], start=1):
+            st.markdown(f"- Redundancia {k}: {', '.join(map(str, incog_r))}")
+        st.stop()
+
+    if usar_rigidez:
+        st.subheader("Material y sección (método de rigidez)")
+        colE, colA = st.columns(2)
+        with colE:
+            E_barras = st.number_input("Módulo elástico E [kPa]", min_value=1.0, value=2.0e8, format="%.3e")
+        with colA:
+            A_barras = st.number_input("Área A [m²]", min_value=1e-8, value=1.0e-3, format="%.2e")
+        etapas.set_inputs(E=E_barras, A=A_barras)
+
+        @etapas.stage("solucion_rigidez", entradas=("nodos", "barras", "apoyos", "E", "A", "cargas"))
+        def etapa_solucion_rigidez(nodos, barras, apoyos, E, A, cargas):
+            return resolver_rigidez(nodos, barras, apoyos, E, A, cargas)
+
+        # --- Método de rigidez directa: K·u = F ---
+        try:
+            cercha = factorizar_rigidez(tuple(nodos.items()), tuple(barras), tuple(apoyos.items()), E_barras, A_barras)
+            resultado = etapas.get("solucion_rigidez")
+        except ValueError as e:
+            st.error(f"No se pudo resolver el sistema. {e}")
+            st.stop()
+        N_vals, R_vals = resultado["N"], resultado["reacciones"]
+    else:
+        resultado_simbolico = None
+        if modo_simbolico:
+            try:
+                resultado_simbolico = etapas.get("solucion_simbolica")
+            except TimeoutError:
+                st.warning(f"La resolución simbólica excedió {presupuesto:.1f} s: se usa la solución numérica dispersa.")
+            else:
+                if resultado_simbolico is None:
+                    st.error("No se pudo resolver el sistema. Revisa la geometría, apoyos y cargas.")
+                    st.stop()
+        if resultado_simbolico is not None:
+            N_vals, R_vals = resultado_simbolico
+        else:
+            # --- Resolución numérica dispersa ---
+            try:
+                N_vals, R_vals = etapas.get("solucion_nudos")
+            except ValueError as e:
+                st.error(f"No se pudo resolver el sistema. {e}")
+                st.stop()
+
+    # --- Salidas: tabla de esfuerzos ---
+    data_barras = []
+    for b, _, _ in barras:
+        Nval = N_vals[b]
+        tipo = "Tensión" if Nval > 0 else "Compresión" if Nval < 0 else "Nulo"
+        data_barras.append({"Barra": b, "N [kN]": float(Nval), "Tipo": tipo})
+    df_barras = pd.DataFrame(data_barras)
+
+    st.subheader("Esfuerzos en barras")
+    st.table(df_barras)
+
+    # --- Máximos ---
+    max_N = df_barras["N [kN]"].abs().max()
+    barra_max = df_barras.iloc[df_barras["N [kN]"].abs().idxmax()]["Barra"]
+    st.markdown(f"**Máximo |N|:** {max_N:.2f} kN en barra {barra_max}")
+
+    # --- Gráfica de la cercha ---
+    with span("figura cercha"):
+        fig = go.Figure()
+        for b, ni, nj in barras:
+            xi, yi = nodos[ni]
+            xj, yj = nodos[nj]
+            Nval = N_vals[b]
+            color = "red" if Nval < 0 else "blue" if Nval > 0 else "gray"
+            width = 2 + 6 * abs(Nval) / (max_N if max_N else 1)
+            fig.add_trace(go.Scatter(
+                x=[xi, xj], y=[yi, yj],
+                mode="lines+markers+text",
+                line=dict(color=color, width=width),
+                marker=dict(size=8),
+                text=[ni, nj],
+                textposition="top center",
+                name=f"{b}"
+            ))
+        fig.update_layout(title="Cercha: diagrama de esfuerzos", xaxis_title="x [m]", yaxis_title="y [m]", showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+
+    # --- Desplazamientos (método de rigidez) ---
+    if usar_rigidez:
+        desp = resultado["desplazamientos"]
+        st.subheader("Desplazamientos de nudos")
+        st.table(pd.DataFrame({
+            "Nudo": list(desp),
+            "ux [mm]": [1000 * u[0] for u in desp.values()],
+            "uy [mm]": [1000 * u[1] for u in desp.values()],
+        }))
+        u_max = max((np.hypot(*u[:2]) for u in desp.values()), default=0.0)
+        L_ref = max(np.ptp([c[0] for c in nodos.values()]), np.ptp([c[1] for c in nodos.values()]))
+        escala = 0.1 * L_ref / u_max if u_max > 0 else 1.0
+        fig_def = go.Figure()
+        for b, ni, nj in barras:
+            (xi, yi), (xj, yj) = nodos[ni], nodos[nj]
+            fig_def.add_trace(go.Scatter(x=[xi, xj], y=[yi, yj], mode="lines", line=dict(color="lightgray")))
+            fig_def.add_trace(go.Scatter(
+                x=[xi + escala * desp[ni][0], xj + escala * desp[nj][0]],
+                y=[yi + escala * desp[ni][1], yj + escala * desp[nj][1]],
+                mode="lines+markers", line=dict(color="black"), name=f"{b}"
+            ))
+        fig_def.update_layout(title=f"Deformada (escala ×{escala:.0f})", xaxis_title="x [m]", yaxis_title="y [m]",
+                              showlegend=False)
+        st.plotly_chart(fig_def, use_container_width=True)
+        st.caption(f"Ancho de banda de K: {cercha.ancho_banda_original} → {cercha.ancho_banda} tras Reverse Cuthill–McKee.")
+
+    # --- Casos de carga ---
+    with st.expander("Casos de carga múltiples"):
+        st.caption("Cada caso se resuelve contra la misma factorización de la cercha.")
+        def_casos = st.data_editor(
+            pd.DataFrame({"caso":[], "nodo":[], "Fx [kN]":[], "Fy [kN]":[]}),
+            num_rows="dynamic", key="casos"
+        )
+        casos = {}
+        for _, row in def_casos.iterrows():
+            if row["caso"] and row["nodo"]:
+                casos.setdefault(row["caso"], {})
+                fx, fy = casos[row["caso"]].get(row["nodo"], (0.0, 0.0))
+                casos[row["caso"]][row["nodo"]] = (fx + float(row["Fx [kN]"] or 0), fy + float(row["Fy [kN]"] or 0))
+        if casos:
+            try:
+                if not usar_rigidez:
+                    cercha = etapas.get("factorizacion")
+                N_casos, _, N_max_casos = cercha.solve_cases(casos)
+            except ValueError as e:
+                st.error(f"No se pudieron resolver los casos de carga. {e}")
+            else:
+                st.markdown("**N [kN] por barra y caso:**")
+                st.dataframe(pd.DataFrame(N_casos, index=cercha.barras, columns=list(casos)))
+                st.markdown("**Máximo |N| por caso [kN]:**")
+                st.table(pd.DataFrame({"Caso": list(casos), "|N| máx [kN]": N_max_casos}))
+
+    # --- Exportar CSV ---
+    if st.button("Exportar resultados a CSV"):
+        df_nodos = pd.DataFrame([{"nodo": n, "x [m]": x, "y [m]": y} for n, (x, y) in nodos.items()])
+        df_barras_exp = pd.DataFrame([{"barra": b, "nodo_i": ni, "nodo_j": nj} for b, ni, nj in barras])
+        df_apoyos = pd.DataFrame([{"nodo": n, "tipo": t} for n, t in apoyos.items()])
+        df_cargas = pd.DataFrame([{"nodo": n, "Fx [kN]": fx, "Fy [kN]": fy} for n, (fx, fy) in cargas.items()])
+        df_reacciones = pd.DataFrame([{k: v} for k, v in R_vals.items()])
+        with pd.ExcelWriter("data/ejemplo_cercha_resultados.xlsx") as writer:
+            df_nodos.to_excel(writer, sheet_name="nodos", index=False)
+            df_barras_exp.to_excel(writer, sheet_name="barras", index=False)
+            df_apoyos.to_excel(writer, sheet_name="apoyos", index=False)
+            df_cargas.to_excel(writer, sheet_name="cargas", index=False)
+            df_barras.to_excel(writer, sheet_name="esfuerzos", index=False)
+            df_reacciones.to_excel(writer, sheet_name="reacciones", index=False)
+        st.success("Archivo exportado en data/ejemplo_cercha_resultados.xlsx")
+
+    # --- Ejemplos en data/ejemplos.csv ---
+    st.markdown("---")
+    st.markdown("Ejemplos de cerchas tipo Pratt y Howe disponibles en [data/ejemplos.csv](data/ejemplos.csv)")
+finally:
+    # También al salir con st.stop() o por una excepción: cProfile queda desactivado
+    # y la ejecución interrumpida llega al registro
+    perfil.stop()
+    perfil.write_log()
+
+# --- Tiempos de la ejecución ---
+with st.sidebar.expander("Tiempos de la ejecución"):
+    st.caption(f"Total: {1000 * perfil.total:.0f} ms")
+    st.dataframe(perfil.table(), hide_index=True)
+    if perfil.profile_text():
+        st.code(perfil.profile_text())
+
+# --- Caché de resultados ---
+st.sidebar.caption(RESULT_CACHE.summary())
+st.sidebar.caption("Etapas recalculadas: " + (", ".join(etapas.ejecutadas) or "ninguna"))
@@ -1,141 +1,209 @@
+import uuid
 import streamlit as st
-import sympy as sp
 import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
-from utils.structural_helpers import symbols_safe, validar_longitud
+from utils.structural_helpers import validar_longitud, validar_modulo_elastico, validar_area
+from utils.catenary import (
+    solve_catenary, catenary_profile, catenary_design_chart,
+    unstretched_lengths, solve_cable_chain, cable_chain_profile
+)
+from utils.result_cache import RESULT_CACHE, memoize
+from utils.stage_graph import StageGraph
+from utils.profiling import Profiler, span
+
+# Etapas de cálculo con caché por contenido: cambiar solo opciones de gráfica no vuelve a resolver
+resolver_catenaria = memoize("cable.catenaria")(solve_catenary)
+longitudes_sin_estirar = memoize("cable.longitudes")(unstretched_lengths)
+resolver_cadena = memoize("cable.cadena")(solve_cable_chain)
 
 st.set_page_config(page_title="Cable catenaria: tensiones y flecha")
 st.title("Cable catenaria: tensiones y flecha")
 
-st.header("Datos del cable")
-col1, col2 = st.columns(2)
-with col1:
-    L = st.number_input("Separación horizontal entre apoyos L [m]", min_value=0.01, value=20.0, step=0.1, format="%.2f")
-    w = st.number_input("Peso por unidad horizontal w [kN/m]", min_value=0.001, value=1.0, step=0.01, format="%.3f")
-with col2:
-    delta_h = st.number_input("Diferencia de altura Δh [m] (positivo si apoyo derecho más alto)", value=0.0, step=0.1, format="%.2f")
-    f_obj = st.number_input("Flecha máxima objetivo f_obj [m] (opcional)", min_value=0.0, value=0.0, step=0.1, format="%.2f")
-    H_in = st.number_input("Tensión horizontal H en punto bajo [kN] (opcional)", min_value=0.0, value=0.0, step=0.1, format="%.2f")
-
+# --- Medición de tiempos por etapa (cProfile opcional) ---
+perfil = Profiler("cable", cprofile=st.sidebar.checkbox("Capturar perfil con cProfile", value=False),
+                  sesion=st.session_state.setdefault("sesion_id", uuid.uuid4().hex)).start()
 try:
-    validar_longitud(L, "separación entre apoyos")
-    validar_longitud(w, "peso por unidad horizontal")
-except ValueError as e:
-    st.error(str(e))
-    st.stop()
-
-# --- Modelo simbólico ---
-x, a, x0, C, H = symbols_safe('x a x0 C H')
-
-# Catenaria exacta: y(x) = a·cosh((x−x0)/a) + C, a = H/w
-# Apoyos en (0,0) y (L, Δh)
-# Condiciones: y(0)=0, y(L)=Δh
-
-# Resolver x0 y C en función de a, L, Δh
-# y(0) = a*cosh(-x0/a) + C = 0
-# y(L) = a*cosh((L-x0)/a) + C = Δh
-
-C_expr = -a*sp.cosh(-x0/a)
-yL_expr = a*sp.cosh((L-x0)/a) + C_expr
-
-# Ecuación para x0: yL_expr = Δh
-# Resolver x0 numéricamente para a dado
-
-# Si H_in dado, a=H_in/w
-if H_in > 0:
-    a_val = H_in / w
-    # Resolver x0
-    eq_x0 = a_val*sp.cosh((L-x0)/a_val) - a_val*sp.cosh(x0/a_val) - delta_h
-    x0_sol = sp.nsolve(eq_x0, x0, L/2)
-    C_val = -a_val*sp.cosh(-x0_sol/a_val)
-    y_expr = a_val*sp.cosh((x-x0_sol)/a_val) + C_val
-    # Flecha máxima
-    f_max = y_expr.subs(x, x0_sol)
-    # Tensiones
-    T_left = w*a_val*sp.cosh(x0_sol/a_val)
-    T_right = w*a_val*sp.cosh((L-x0_sol)/a_val)
-    H_val = a_val * w
-elif f_obj > 0:
-    # Buscar a que cumpla flecha máxima
-    def flecha_a(a_num):
-        x0_num = sp.nsolve(a_num*sp.cosh((L-x0)/a_num) - a_num*sp.cosh(x0/a_num) - delta_h, x0, L/2)
-        C_num = -a_num*sp.cosh(-x0_num/a_num)
-        return float(a_num*sp.cosh(-x0_num/a_num) + C_num - f_obj)
+    st.header("Datos del cable")
+    col1, col2 = st.columns(2)
+    with col1:
+        L = st.number_input("Separación horizontal entre apoyos L [m]", min_value=0.01, value=20.0, step=0.1, format="%.2f")
+        w = st.number_input("Peso por unidad horizontal w [kN/m]", min_value=0.001, value=1.0, step=0.01, format="%.3f")
+    with col2:
+        delta_h = st.number_input("Diferencia de altura Δh [m] (positivo si apoyo derecho más alto)", value=0.0, step=0.1, format="%.2f")
+        f_obj = st.number_input("Flecha máxima objetivo f_obj [m] (opcional)", min_value=0.0, value=0.0, step=0.1, format="%.2f")
+        H_in = st.number_input("Tensión horizontal H en punto bajo [kN] (opcional)", min_value=0.0, value=0.0, step=0.1, format="%.2f")
+
     try:
-        from scipy.optimize import brentq
-        a_min = 0.01
-        a_max = 10*L
-        a_val = brentq(flecha_a, a_min, a_max)
-        x0_sol = sp.nsolve(a_val*sp.cosh((L-x0)/a_val) - a_val*sp.cosh(x0/a_val) - delta_h, x0, L/2)
-        C_val = -a_val*sp.cosh(-x0_sol/a_val)
-        y_expr = a_val*sp.cosh((x-x0_sol)/a_val) + C_val
-        f_max = y_expr.subs(x, x0_sol)
-        T_left = w*a_val*sp.cosh(x0_sol/a_val)
-        T_right = w*a_val*sp.cosh((L-x0_sol)/a_val)
-        H_val = a_val * w
-    except Exception:
+        validar_longitud(L, "separación entre apoyos")
+        validar_longitud(w, "peso por unidad horizontal")
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    # --- Grafo de etapas: solo se recalcula lo que depende de una entrada modificada ---
+    etapas = StageGraph(st.session_state.setdefault("etapas_cable", {}))
+    etapas.set_inputs(L=L, delta_h=delta_h, w=w, f_obj=f_obj, H_in=H_in)
+    N = 400
+
+    # --- Modelo numérico ---
+    # Catenaria exacta: y(x) = a·cosh((x−x0)/a) + C, a = H/w, apoyos en (0,0) y (L, Δh)
+    # x0 en forma cerrada (asinh) y a por Newton salvaguardado cuando se da la flecha objetivo
+    @etapas.stage("catenaria", entradas=("L", "delta_h", "w", "f_obj", "H_in"))
+    def etapa_catenaria(L, delta_h, w, f_obj, H_in):
+        if H_in > 0:
+            return resolver_catenaria(L, delta_h, w, H=H_in)
+        if f_obj > 0:
+            return resolver_catenaria(L, delta_h, w, f_obj=f_obj)
+        # Caso general: a desconocido, se grafica con un valor arbitrario
+        return resolver_catenaria(L, delta_h, w, H=w * L / 4)
+
+    @etapas.stage("perfil", entradas=("L",), depende=("catenaria",))
+    def etapa_perfil(L, catenaria):
+        x_vals = np.linspace(0, L, N)
+        return x_vals, catenary_profile(catenaria, x_vals)
+
+    @etapas.stage("abaco", entradas=("L", "delta_h", "w"), depende=("catenaria",))
+    def etapa_abaco(L, delta_h, w, catenaria):
+        H_malla = np.linspace(0.2 * catenaria["H"], 5 * catenaria["H"], 200)
+        return H_malla, catenary_design_chart([L], H_malla, delta_h, w)["f_max"][0]
+
+    try:
+        sol = etapas.get("catenaria")
+    except (ValueError, FloatingPointError, OverflowError):
         st.error("No se pudo encontrar una solución para la flecha objetivo con los parámetros dados.")
         st.stop()
-else:
-    # Caso general: a desconocido, pero se puede graficar para H arbitrario
-    a_val = L/4  # valor arbitrario para graficar
-    x0_sol = L/2
-    C_val = -a_val*sp.cosh(-x0_sol/a_val)
-    y_expr = a_val*sp.cosh((x-x0_sol)/a_val) + C_val
-    f_max = y_expr.subs(x, x0_sol)
-    T_left = w*a_val*sp.cosh(x0_sol/a_val)
-    T_right = w*a_val*sp.cosh((L-x0_sol)/a_val)
-    H_val = a_val * w
-
-# --- Parábola aproximada ---
-parab = st.checkbox("Mostrar comparación con parábola (flechas pequeñas)", value=True)
-if parab:
-    # y(x) = 4*f_max/L**2 * x*(L-x) + delta_h/L*x
-    y_parab = 4*float(f_max)/L**2 * x*(L-x) + delta_h/L*x
-
-# --- Gráfica del perfil ---
-N = 400
-x_vals = np.linspace(0, L, N)
-y_func = sp.lambdify(x, y_expr, modules=["numpy"])
-y_vals = y_func(x_vals)
-fig = go.Figure()
-fig.add_trace(go.Scatter(x=x_vals, y=y_vals, mode="lines", name="Catenaria exacta"))
-if parab:
-    y_parab_func = sp.lambdify(x, y_parab, modules=["numpy"])
-    y_parab_vals = y_parab_func(x_vals)
-    fig.add_trace(go.Scatter(x=x_vals, y=y_parab_vals, mode="lines", name="Parábola"))
-fig.add_trace(go.Scatter(x=[0, L], y=[0, delta_h], mode="markers", name="Apoyos"))
-fig.update_layout(title="Perfil del cable", xaxis_title="x [m]", yaxis_title="y [m]", legend_title="Modelo")
-st.plotly_chart(fig, use_container_width=True)
-
-# --- Tabla de resultados ---
-st.subheader("Resultados")
-df_res = pd.DataFrame({
-    "Magnitud": ["Flecha máxima", "Tensión horizontal H", "Tensión en apoyo izquierdo", "Tensión en apoyo derecho"],
-    "Valor": [float(f_max), float(H_val), float(T_left), float(T_right)],
-    "Unidades": ["m", "kN", "kN", "kN"]
-})
-st.table(df_res)
-
-# --- Exportar CSV ---
-if st.button("Exportar resultados a CSV"):
-    df_export = pd.DataFrame({
-        "x [m]": x_vals,
-        "y_catenaria [m]": y_vals
+    f_max, H_val, T_left, T_right = sol["f_max"], sol["H"], sol["T_left"], sol["T_right"]
+
+    # --- Parábola aproximada ---
+    parab = st.checkbox("Mostrar comparación con parábola (flechas pequeñas)", value=True)
+
+    # --- Gráfica del perfil ---
+    x_vals, y_vals = etapas.get("perfil")
+    with span("figura perfil"):
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=x_vals, y=y_vals, mode="lines", name="Catenaria exacta"))
+        if parab:
+            # y(x) = Δh/L·x − 4f/L²·x(L−x), con la flecha f medida desde la cuerda
+            y_parab_vals = delta_h / L * x_vals - 4 * f_max / L**2 * x_vals * (L - x_vals)
+            fig.add_trace(go.Scatter(x=x_vals, y=y_parab_vals, mode="lines", name="Parábola"))
+        fig.add_trace(go.Scatter(x=[0, L], y=[0, delta_h], mode="markers", name="Apoyos"))
+        fig.update_layout(title="Perfil del cable", xaxis_title="x [m]", yaxis_title="y [m]", legend_title="Modelo")
+        st.plotly_chart(fig, use_container_width=True)
+
+    # --- Tabla de resultados ---
+    st.subheader("Resultados")
+    df_res = pd.DataFrame({
+        "Magnitud": ["Flecha máxima", "Tensión horizontal H", "Tensión en apoyo izquierdo", "Tensión en apoyo derecho"],
+        "Valor": [float(f_max), float(H_val), float(T_left), float(T_right)],
+        "Unidades": ["m", "kN", "kN", "kN"]
     })
-    if parab:
-        df_export["y_parabola [m]"] = y_parab_vals
-    df_export.to_csv("data/ejemplo_catenaria_resultados.csv", index=False)
-    st.success("Archivo exportado en data/ejemplo_catenaria_resultados.csv")
-
-# --- Validaciones y advertencias ---
-if L <= 0 or w <= 0:
-    st.warning("L y w deben ser mayores que cero.")
-if abs(delta_h) > L:
-    st.warning("La diferencia de alturas es mayor que la separación horizontal, puede no haber solución física.")
-if f_obj > 0 and (not (0 < float(f_max) <= f_obj + 1e-3)):
-    st.warning("No se pudo cumplir la flecha objetivo con los parámetros dados.")
-
-st.markdown("---")
-st.markdown("Ver ejemplos de catenaria en [data/ejemplos.csv](data/ejemplos.csv)")
+    st.table(df_res)
+
+    # --- Ábaco H–flecha ---
+    with st.expander("Ábaco de diseño H–flecha"):
+        H_malla, f_abaco = etapas.get("abaco")
+        fig_abaco = go.Figure()
+        fig_abaco.add_trace(go.Scatter(x=H_malla, y=f_abaco, mode="lines", name="Flecha"))
+        fig_abaco.add_trace(go.Scatter(x=[H_val], y=[f_max], mode="markers", name="Solución actual"))
+        fig_abaco.update_layout(xaxis_title="H [kN]", yaxis_title="Flecha [m]")
+        st.plotly_chart(fig_abaco, use_container_width=True)
+
+    # --- Cadena de vanos elásticos ---
+    with st.expander("Cadena de vanos elásticos (E·A, suspensiones libres en horizontal)"):
+        st.markdown(
+            "Se tiende el cable con la tensión H de la solución actual y peso w; luego se cambia el peso "
+            "(por ejemplo, hielo o viento) y se resuelven todos los vanos acoplados: las suspensiones se "
+            "desplazan hasta igualar la tensión horizontal."
+        )
+        vanos = st.data_editor(
+            pd.DataFrame({"l [m]": [L, 1.2 * L, 0.8 * L], "Δh [m]": [delta_h, 0.0, 0.0]}),
+            num_rows="dynamic", key="vanos"
+        )
+        colc1, colc2, colc3 = st.columns(3)
+        with colc1:
+            E_cable = st.number_input("Módulo elástico E [kPa]", min_value=1.0, value=1.0e8, format="%.3e")
+        with colc2:
+            A_cable = st.number_input("Área A [m²]", min_value=1e-8, value=4.0e-4, format="%.2e")
+        with colc3:
+            w_final = st.number_input("Peso final w' [kN/m]", min_value=0.001, value=1.5 * w, step=0.01, format="%.3f")
+        # Filas sin longitud (p. ej. una fila nueva vacía) se descartan; Δh vacío es 0
+        filas_vanos = [(float(v), float(d) if pd.notna(d) else 0.0)
+                       for v, d in zip(vanos["l [m]"], vanos["Δh [m]"]) if pd.notna(v)]
+        l_vanos = np.array([v for v, _ in filas_vanos], dtype=float)
+        h_vanos = np.array([d for _, d in filas_vanos], dtype=float)
+        etapas.set_inputs(l_vanos=l_vanos, h_vanos=h_vanos, E_cable=E_cable, A_cable=A_cable, w_final=w_final)
+
+        @etapas.stage("cadena", entradas=("l_vanos", "h_vanos", "w", "E_cable", "A_cable", "w_final"),
+                      depende=("catenaria",))
+        def etapa_cadena(l_vanos, h_vanos, w, E_cable, A_cable, w_final, catenaria):
+            L0_vanos = longitudes_sin_estirar(l_vanos, h_vanos, w, E_cable, A_cable, catenaria["H"])
+            cadena = resolver_cadena(l_vanos, h_vanos, L0_vanos, w_final, E_cable, A_cable)
+            return L0_vanos, cadena, cable_chain_profile(cadena, L0_vanos, w_final, E_cable, A_cable, h_vanos)
+
+        try:
+            validar_modulo_elastico(E_cable)
+            validar_area(A_cable)
+            for lv in l_vanos:
+                validar_longitud(lv, "vano")
+            if len(l_vanos) == 0:
+                raise ValueError("Define al menos un vano.")
+            L0_vanos, cadena, (x_cad, y_cad) = etapas.get("cadena")
+        except (ValueError, FloatingPointError) as e:
+            st.error(f"No se pudo resolver la cadena de vanos: {e}")
+        else:
+            # Flecha de cada vano respecto a su cuerda deformada
+            cuerda = y_cad[:, :1] + (x_cad - x_cad[:, :1]) * (h_vanos / cadena["l_def"])[:, None]
+            flechas = np.max(cuerda - y_cad, axis=1)
+            fig_cad = go.Figure()
+            for i in range(len(l_vanos)):
+                fig_cad.add_trace(go.Scatter(x=x_cad[i], y=y_cad[i], mode="lines", name=f"Vano {i + 1}"))
+            fig_cad.update_layout(title="Perfil de la cadena con peso final", xaxis_title="x [m]", yaxis_title="y [m]")
+            st.plotly_chart(fig_cad, use_container_width=True)
+            st.table(pd.DataFrame({
+                "Vano": np.arange(1, len(l_vanos) + 1),
+                "L0 [m]": L0_vanos,
+                "H [kN]": cadena["H"],
+                "T izq. [kN]": cadena["T_left"],
+                "T der. [kN]": cadena["T_right"],
+                "Flecha [m]": flechas,
+                "Desplaz. suspensión der. [m]": cadena["u"],
+            }))
+
+    # --- Exportar CSV ---
+    if st.button("Exportar resultados a CSV"):
+        df_export = pd.DataFrame({
+            "x [m]": x_vals,
+            "y_catenaria [m]": y_vals
+        })
+        if parab:
+            df_export["y_parabola [m]"] = y_parab_vals
+        df_export.to_csv("data/ejemplo_catenaria_resultados.csv", index=False)
+        st.success("Archivo exportado en data/ejemplo_catenaria_resultados.csv")
+
+    # --- Validaciones y advertencias ---
+    if L <= 0 or w <= 0:
+        st.warning("L y w deben ser mayores que cero.")
+    if abs(delta_h) > L:
+        st.warning("La diferencia de alturas es mayor que la separación horizontal, puede no haber solución física.")
+    if f_obj > 0 and (not (0 < float(f_max) <= f_obj + 1e-3)):
+        st.warning("No se pudo cumplir la flecha objetivo con los parámetros dados.")
+
+    st.markdown("---")
+    st.markdown("Ver ejemplos de catenaria en [data/ejemplos.csv](data/ejemplos.csv)")
+finally:
+    # También al salir con st.stop() o por una excepción: cProfile queda desactivado
+    # y la ejecución interrumpida llega al registro
+    perfil.stop()
+    perfil.write_log()
+
+# --- Tiempos de la ejecución ---
+with st.sidebar.expander("Tiempos de la ejecución"):
+    st.caption(f"Total: {1000 * perfil.total:.0f} ms")
+    st.dataframe(perfil.table(), hide_index=True)
+    if perfil.profile_text():
+        st.code(perfil.profile_text())
+
+# --- Caché de resultados ---
+st.sidebar.caption(RESULT_CACHE.summary())
+st.sidebar.caption("Etapas recalculadas: " + (", ".join(etapas.ejecutadas) or "ninguna"))
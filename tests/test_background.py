@@ -0,0 +1,67 @@
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from utils.background import BackgroundJob, JobManager
+
+
+def test_trabajo_devuelve_resultado_y_libera_la_ranura():
+    jobs = JobManager(max_jobs=1)
+    t = jobs.submit("s:a", "h1", divmod, 17, 5)
+    assert jobs.submit("s:a", "h1", divmod, 17, 5) is t  # misma huella en curso: se reutiliza
+    assert jobs.wait(t, intervalo=0.02) == (3, 2)
+    assert jobs.stats()["sin_recoger"] == 0 and "s:a" not in jobs._ranuras
+    with pytest.raises(ZeroDivisionError):
+        jobs.wait(jobs.submit("s:b", "h2", divmod, 1, 0), intervalo=0.02)
+    recordado = jobs.submit("s:b", "h2", divmod, 1, 0)  # el fallo se recuerda: no se recalcula
+    assert recordado.done() and recordado._proceso is not None and not recordado._proceso.is_alive()
+    with pytest.raises(ZeroDivisionError):
+        jobs.wait(recordado)
+
+
+def test_presupuesto_agotado_se_recuerda():
+    jobs = JobManager(max_jobs=1)
+    with pytest.raises(TimeoutError):
+        jobs.wait(jobs.submit("s:a", "h1", time.sleep, 30, timeout=0.3), intervalo=0.02)
+    inicio = time.monotonic()
+    with pytest.raises(TimeoutError):
+        jobs.wait(jobs.submit("s:a", "h1", time.sleep, 30, timeout=0.3), intervalo=0.02)
+    assert time.monotonic() - inicio < 0.2 and jobs.stats()["fallas"] == 1
+    otro = jobs.submit("s:a", "h1", time.sleep, 30, timeout=5.0)  # otro presupuesto: se recalcula
+    assert not otro.done()
+    otro.cancel()
+
+
+def test_trabajos_sin_recoger_se_descartan():
+    jobs = JobManager(max_jobs=1, retener=0.0)
+    t = jobs.submit("s:a", "h1", divmod, 7, 2)
+    while not t.poll():
+        time.sleep(0.02)
+    assert jobs.stats()["sin_recoger"] == 1
+    jobs.wait(jobs.submit("s:b", "h2", divmod, 9, 4), intervalo=0.02)
+    assert jobs.stats()["sin_recoger"] == 0 and not jobs._ranuras
+
+
+def test_presupuesto_agotado_termina_el_proceso():
+    t = BackgroundJob(time.sleep, (30,), timeout=0.3)
+    t.start()
+    while not t.poll():
+        time.sleep(0.02)
+    assert t.estado == "tiempo agotado"
+    assert not t._proceso.is_alive()
+    with pytest.raises(TimeoutError):
+        t.result()
+
+
+def test_trabajo_obsoleto_se_cancela():
+    jobs = JobManager(max_jobs=1)
+    viejo = jobs.submit("s:a", "h1", time.sleep, 30)
+    en_cola = jobs.submit("s:b", "h3", divmod, 7, 2)
+    assert en_cola.estado == "en cola"  # máximo un proceso simultáneo
+    nuevo = jobs.submit("s:a", "h2", divmod, 9, 4)
+    assert viejo.estado == "cancelado" and jobs.stats()["cancelados"] == 1
+    with pytest.raises(CancelledError):
+        viejo.result()
+    assert jobs.wait(en_cola, intervalo=0.02) == (3, 1)
+    assert jobs.wait(nuevo, intervalo=0.02) == (2, 1)
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from utils.batch_runner import iter_scenarios, run_batch
+from utils.scenarios import beam_scenario, run_scenario
+
+
+def test_iter_scenarios_csv_por_secciones():
+    escenarios = list(iter_scenarios("data/ejemplos.csv"))
+    assert [e["Tipo"] for e in escenarios].count("Cercha") == 2
+    assert len(escenarios) == 10
+    assert escenarios[0]["Cargas_distribuidas"] == "[(0,3,5,uniforme);(3,6,2*x+1,triangular)]"
+
+
+def test_escenarios_coinciden_con_estatica():
+    res = beam_scenario({"L": "8", "Cargas_puntuales": "[(12,3)]",
+                         "Cargas_distribuidas": "[(0,8,3,uniforme)]", "Peso_propio": "False"})
+    assert res["reacciones"]["RA"] == pytest.approx(12 * 5 / 8 + 12)
+    res = beam_scenario({"L": 6, "Cargas_distribuidas": "0 6 10 uniforme", "Apoyos": "empotrado-empotrado"})
+    assert abs(res["M_max"]) == pytest.approx(10 * 36 / 12)
+    cable = run_scenario({"Tipo": "Cable", "L": "20", "delta_h": "0", "w": "1.2", "f_obj": "2.5", "H": ""})
+    assert cable["f_max"] == pytest.approx(2.5)
+    with pytest.raises(ValueError):
+        run_scenario({"Tipo": "Losa"})
+
+
+def test_cargas_sobre_el_apoyo():
+    # Carga y momento en a = 0: la carga va directo a RA y el momento cambia ambas reacciones
+    res = beam_scenario({"L": 6, "Cargas_puntuales": "[(10,0),(6,3)]", "Momentos": "[(12,0)]"})
+    assert res["reacciones"]["RA"] == pytest.approx(10 + 3 + 12 / 6)
+    assert res["reacciones"]["RB"] == pytest.approx(3 - 12 / 6)
+
+
+def test_run_batch_escribe_resultados(tmp_path):
+    entrada = tmp_path / "escenarios.jsonl"
+    entrada.write_text("\n".join(json.dumps(e) for e in [
+        {"Tipo": "Cable", "L": 30, "delta_h": 2, "w": 1.0, "H": 20},
+        {"Tipo": "Cercha", "Nodos": [["A", 0, 0], ["B", 4, 0], ["C", 2, 3]],
+         "Barras": [["AB", "A", "B"], ["AC", "A", "C"], ["BC", "B", "C"]],
+         "Apoyos": [["A", "pasador"], ["B", "rodillo"]], "Cargas_nodales": [["C", 0, -10]]},
+        {"Tipo": "Viga", "L": -1},
+    ]))
+    salida = tmp_path / "resultados.jsonl"
+    stats = run_batch(str(entrada), str(salida), workers=0, chunk=2, informe=None)
+    filas = sorted((json.loads(l) for l in salida.read_text().splitlines()), key=lambda f: f["indice"])
+    assert (stats["total"], stats["errores"]) == (3, 1)
+    assert filas[0]["resultado"]["H"] == pytest.approx(20)
+    assert filas[1]["resultado"]["N"]["AB"] == pytest.approx(10 / 3)
+    assert not filas[2]["ok"] and filas[2]["error"]
@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+from utils.beam_solver import (simple_beam_diagrams, continuous_beam_diagrams, beam_deflection, deflection_batch,
+                               assemble_continuous_beam, solve_continuous_beam)
+
+
+def test_rigidez_coincide_con_viga_simple():
+    cargas = [((0, 6), 5.0, 'x'), ((3, 6), "2*x+1", 'x')]
+    puntuales, momentos = [(10.0, 2.0), (5.0, 4.0)], [(8.0, 3.0)]
+    simple = simple_beam_diagrams(6.0, cargas, puntuales, momentos)
+    viga = continuous_beam_diagrams([0, 6], ["simple", "simple"], cargas, puntuales, momentos)
+    assert viga["reacciones"][:, 0] == pytest.approx([simple["RA"], simple["RB"]])
+    x = np.linspace(0, 6, 61)
+    assert viga["M"](x) == pytest.approx(simple["M"](x), abs=1e-9)
+
+
+@pytest.mark.parametrize("apoyos, M_esperado", [
+    (["empotrado", "empotrado"], [-3.0, 1.5, -3.0]),   # -wL²/12, wL²/24
+    (["empotrado", "simple"], [-4.5, 2.25, 0.0]),      # -wL²/8, wL²/16
+])
+def test_vigas_hiperestaticas_carga_uniforme(apoyos, M_esperado):
+    viga = continuous_beam_diagrams([0, 6], apoyos, [((0, 6), 1.0, 'x')])
+    assert viga["M"](np.array([0.0, 3.0, 6.0])) == pytest.approx(M_esperado, abs=1e-9)
+    assert viga["reacciones"][:, 0].sum() == pytest.approx(6.0)
+
+
+def test_viga_continua_muchos_tramos_y_voladizo():
+    # Dos tramos iguales: reacción central 10wL/8 y M = -wL²/8 sobre el apoyo
+    viga = continuous_beam_diagrams([0, 5, 10], ["simple"] * 3, [((0, 10), 2.0, 'x')])
+    assert viga["reacciones"][:, 0] == pytest.approx([3.75, 12.5, 3.75])
+    assert viga["M"](5.0) == pytest.approx(-6.25)
+    # Tramos interiores de una viga larga: momento de empotramiento perfecto wL²/12
+    x = np.arange(201) * 4.0
+    viga = continuous_beam_diagrams(x, ["simple"] * 201, [((0, x[-1]), 1.0, 'x')])
+    assert viga["M"](400.0) == pytest.approx(-16 / 12, rel=1e-6)
+    # Voladizo con carga en la punta: flecha PL³/3EI
+    viga = continuous_beam_diagrams([0, 4], ["empotrado", "libre"], puntuales=[(10.0, 4.0)], EI=2.0)
+    assert viga["desplazamientos"][-1, 0] == pytest.approx(-10 * 4**3 / (3 * 2.0))
+    assert viga["M"](0.0) == pytest.approx(-40.0)
+    with pytest.raises(ValueError):
+        continuous_beam_diagrams([0, 5], ["simple", "libre"])
+
+
+def test_flechas_formas_cerradas():
+    L, w, EI = 6.0, 10.0, 2.0e4
+    viga = simple_beam_diagrams(L, [((0, L), w, 'x')])
+    d = beam_deflection(viga["M"], [0, L], ["simple", "simple"], EI)
+    assert d["v_max"] == pytest.approx(-5 * w * L**4 / (384 * EI))
+    assert d["x_v_max"] == pytest.approx(L / 2)
+    assert abs(d["theta_max"]) == pytest.approx(w * L**3 / (24 * EI))
+    # Lote por integración acumulada en malla fina
+    x = np.linspace(0, L, 2001)
+    lote = deflection_batch(x, np.stack([viga["M"](x), 2 * viga["M"](x)]), EI, [0, L], ["simple", "simple"])
+    assert lote["v_max"] == pytest.approx([d["v_max"], 2 * d["v_max"]], rel=1e-5)
+
+
+def test_flechas_con_inercia_variable_coinciden_con_rigidez():
+    # Empotrada-apoyada con EI distinto por segmentos: la rigidez y la doble integración concuerdan
+    segmentos = [(0, 3, 1.0e4), (3, 8, 2.0e4)]
+    viga = continuous_beam_diagrams([0, 8], ["empotrado", "simple"], [((0, 8), 5.0, 'x')], EI=segmentos)
+    assert list(viga["x_nodos"]) == [0, 3, 8]
+    d = beam_deflection(viga["M"], viga["x_nodos"], viga["apoyos"], segmentos)
+    assert d["residuo"] < 1e-12
+    assert d["v"](viga["x_nodos"]) == pytest.approx(viga["desplazamientos"][:, 0], abs=1e-12)
+    with pytest.raises(ValueError):
+        beam_deflection(viga["M"], [0, 8], ["empotrado", "simple"], [(0, 3, 1.0e4), (4, 8, 2.0e4)])
+
+
+def test_estructura_ensamblada_se_reutiliza_entre_cargas():
+    estructura = assemble_continuous_beam([0, 4, 10], ["empotrado", "simple", "simple"], [(0, 4, 2.0), (4, 10, 1.0)])
+    for P in (10.0, 25.0):
+        directa = continuous_beam_diagrams([0, 4, 10], ["empotrado", "simple", "simple"], [((0, 10), 3.0, 'x')],
+                                           [(P, 7.0)], EI=[(0, 4, 2.0), (4, 10, 1.0)])
+        reutilizada = solve_continuous_beam(estructura, [((0, 10), 3.0, 'x')], [(P, 7.0)])
+        assert reutilizada["reacciones"] == pytest.approx(directa["reacciones"])
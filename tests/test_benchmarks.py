@@ -0,0 +1,37 @@
+import pytest
+
+from utils.benchmarks import compare, howe_truss, pratt_truss, run_suite
+from utils.truss_solver import FactorizedTruss
+
+
+@pytest.mark.parametrize("generador, signo", [(pratt_truss, 1), (howe_truss, -1)])
+def test_cerchas_generadas_isostaticas(generador, signo):
+    p, P = 6, 10.0
+    nodos, barras, apoyos, cargas = generador(p, P=P)
+    assert len(barras) + 3 == 2 * len(nodos)
+    N, R = FactorizedTruss(nodos, barras, apoyos).solve(cargas)
+    assert sum(R.values()) == pytest.approx(P * (p - 1))
+    diagonales = [b for b, ni, nj in barras if nodos[ni][0] != nodos[nj][0] and nodos[ni][1] != nodos[nj][1]
+                  and b not in ("L0U1", f"U{p - 1}L{p}")]
+    assert len(diagonales) == p - 2
+    # Pratt: diagonales interiores traccionadas; Howe: comprimidas
+    assert all(signo * N[b] > 0 for b in diagonales)
+    with pytest.raises(ValueError):
+        generador(5)
+
+
+def test_compara_con_base():
+    base = {"cable/10": {"mediana_s": 0.010, "pico_kib": 100.0},
+            "cercha_pratt/8": {"mediana_s": 0.0005, "pico_kib": 10.0}}
+    actual = {"cable/10": {"mediana_s": 0.020, "pico_kib": 110.0},
+              "cercha_pratt/8": {"mediana_s": 0.0012, "pico_kib": 10.0},  # bajo el piso de ruido
+              "cable/100": {"mediana_s": 1.0, "pico_kib": 1.0}}  # sin base: se ignora
+    regresiones = compare(actual, base, umbral=0.5)
+    assert len(regresiones) == 1 and regresiones[0].startswith("cable/10: tiempo")
+    assert compare(actual, base, umbral=0.05, umbral_memoria=0.05)[-1].startswith("cable/10: memoria")
+
+
+def test_series_rapidas():
+    resultados = run_suite(["cercha_howe", "cable"], rapido=True, repeticiones=1, informe=None)
+    assert set(resultados) == {"cercha_howe/8", "cercha_howe/32", "cable/10", "cable/100"}
+    assert all(r["mediana_s"] > 0 and r["pico_kib"] > 0 for r in resultados.values())
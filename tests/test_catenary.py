@@ -0,0 +1,108 @@
+import pytest
+import numpy as np
+from utils.catenary import (
+    solve_catenary, catenary_profile, solve_catenary_batch, catenary_design_chart,
+    unstretched_lengths, solve_cable_chain, cable_chain_profile
+)
+
+
+def test_catenaria_simetrica_forma_cerrada():
+    L, w, H = 25.0, 1.5, 18.0
+    sol = solve_catenary(L, 0.0, w, H=H)
+    a = H / w
+    assert sol["x0"] == pytest.approx(L / 2)
+    assert sol["f_max"] == pytest.approx(a * (np.cosh(L / (2 * a)) - 1))
+    assert sol["T_left"] == pytest.approx(H * np.cosh(L / (2 * a)))
+    assert sol["S"] == pytest.approx(2 * a * np.sinh(L / (2 * a)))
+
+
+@pytest.mark.parametrize("L, delta_h, w, f_obj", [(15, -1, 0.8, 1.8), (18, 1, 1.1, 2.0), (100, 60, 1.0, 0.5)])
+def test_catenaria_apoyos_desnivelados(L, delta_h, w, f_obj):
+    sol = solve_catenary(L, delta_h, w, f_obj=f_obj)
+    assert catenary_profile(sol, [0, L]) == pytest.approx([0, delta_h], abs=1e-9)
+    assert sol["f_max"] == pytest.approx(f_obj, rel=1e-9)
+    # Flecha máxima respecto a la cuerda
+    x = np.linspace(0, L, 20001)
+    assert np.max(delta_h * x / L - catenary_profile(sol, x)) == pytest.approx(f_obj, rel=1e-6)
+    # La diferencia de tensiones en apoyos es w·Δh
+    assert sol["T_right"] - sol["T_left"] == pytest.approx(w * delta_h)
+
+
+def test_catenaria_sin_datos():
+    with pytest.raises(ValueError):
+        solve_catenary(20, 0, 1.0)
+
+
+def test_catenaria_lote_coincide_con_escalar():
+    L = np.array([20, 30, 15, 25, 18], dtype=float)
+    delta_h = np.array([0, 2, -1, 0, 1], dtype=float)
+    w = np.array([1.2, 1.0, 0.8, 1.5, 1.1])
+    f_obj = np.array([2.5, np.nan, 1.8, np.nan, 2.0])
+    H = np.array([np.nan, 20, np.nan, 18, np.nan])
+    res = solve_catenary_batch(L, delta_h, w, f_obj=f_obj, H=H)
+    for k in range(len(L)):
+        esc = solve_catenary(L[k], delta_h[k], w[k],
+                             f_obj=None if np.isnan(f_obj[k]) else f_obj[k],
+                             H=None if np.isnan(H[k]) else H[k])
+        for clave in ("H", "T_left", "T_right", "f_max"):
+            assert res[clave][k] == pytest.approx(esc[clave])
+
+
+def test_catenaria_lote_grande_y_abaco():
+    rng = np.random.default_rng(0)
+    n = 5000
+    L = rng.uniform(50, 500, n)
+    f_obj = rng.uniform(0.001, 0.3, n) * L
+    res = solve_catenary_batch(L, rng.uniform(-30, 30, n), rng.uniform(0.5, 3, n), f_obj=f_obj)
+    assert np.allclose(res["f_max"], f_obj, rtol=1e-9)
+    abaco = catenary_design_chart(np.linspace(10, 100, 10), np.linspace(5, 200, 50), 0.0, 1.2)
+    assert abaco["f_max"].shape == (10, 50)
+    # Más tensión, menos flecha
+    assert np.all(np.diff(abaco["f_max"], axis=1) < 0)
+
+
+def test_catenaria_elastica_rigida_coincide_con_inextensible():
+    sol = solve_catenary(100.0, 5.0, 1.0, H=50.0)
+    L0 = unstretched_lengths([100.0], [5.0], 1.0, 1e12, 1.0, H=50.0)
+    assert L0[0] == pytest.approx(sol["S"], rel=1e-9)
+    res = solve_cable_chain([100.0], [5.0], L0, 1.0, 1e12, 1.0)
+    assert res["H"][0] == pytest.approx(50.0, rel=1e-6)
+    assert res["T_right"][0] == pytest.approx(sol["T_right"], rel=1e-6)
+
+
+def test_cadena_de_vanos_equilibra_tension_horizontal():
+    l, h = np.array([300.0, 350.0, 280.0, 400.0]), np.array([0.0, 10.0, -5.0, 3.0])
+    E, A = 1.0e8, 4.0e-4
+    L0 = unstretched_lengths(l, h, 0.15, E, A, H=20.0)
+    # Con el peso de tendido se recupera el estado inicial sin desplazamientos
+    res = solve_cable_chain(l, h, L0, 0.15, E, A)
+    assert res["H"] == pytest.approx(np.full(4, 20.0), rel=1e-8)
+    assert res["u"] == pytest.approx(np.zeros(4), abs=1e-8)
+    # Con más peso las suspensiones se desplazan, H se iguala y los anclajes no se mueven
+    res = solve_cable_chain(l, h, L0, 0.30, E, A)
+    assert np.ptp(res["H"]) < 1e-9 * res["H"][0]
+    assert res["l_def"].sum() == pytest.approx(l.sum())
+    assert np.abs(res["u"][:-1]).max() > 0
+    x, y = cable_chain_profile(res, L0, 0.30, E, A, h)
+    assert x[-1, -1] == pytest.approx(l.sum()) and y[-1, -1] == pytest.approx(h.sum())
+    with pytest.raises(ValueError):
+        solve_cable_chain(l, h, L0, 0.30, -E, A)
+
+
+def test_cadena_de_vanos_datos_invalidos_y_limite_de_iteraciones(monkeypatch):
+    import utils.catenary as catenaria
+    l, h = np.array([20.0, 24.0, 18.0]), np.array([0.0, 1.0, 0.0])
+    E, A = 1.0e8, 4.0e-4
+    L0 = unstretched_lengths(l, h, 0.15, E, A, H=5.0)
+    # La última actualización permitida que converge no es un fallo
+    n = solve_cable_chain(l, h, L0, 0.30, E, A)["iteraciones"]
+    assert solve_cable_chain(l, h, L0, 0.30, E, A, maxiter=n)["iteraciones"] == n
+    # Filas vacías de la tabla de vanos (NaN)
+    with pytest.raises(ValueError, match="finitos"):
+        unstretched_lengths([20.0, 24.0, np.nan], [0.0, np.nan, 0.0], 0.15, E, A, H=5.0)
+    with pytest.raises(ValueError, match="finitos"):
+        solve_cable_chain(l, h, np.append(L0[:2], np.nan), 0.30, E, A)
+    # Sin un paso que mantenga H > 0 se informa en lugar de reutilizar un paso anterior
+    monkeypatch.setattr(catenaria, "spsolve", lambda J, b: np.full(len(b), -1e15))
+    with pytest.raises(ValueError, match="H > 0"):
+        solve_cable_chain(l, h, L0, 0.30, E, A)
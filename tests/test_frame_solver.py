@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+from utils.frame_solver import FrameModel, StiffnessSolver
+from utils.truss_solver import FactorizedTruss
+
+
+def test_rigidez_coincide_con_metodo_de_nudos():
+    nodos = {"A": (0, 0), "B": (4, 0), "C": (8, 0), "D": (4, 3)}
+    barras = [("AB", "A", "B"), ("BC", "B", "C"), ("AD", "A", "D"), ("DC", "D", "C"), ("BD", "B", "D")]
+    apoyos = {"A": "pasador", "C": "rodillo"}
+    cargas = {"B": (0, -10), "D": (2, 0)}
+    N1, R1 = FactorizedTruss(nodos, barras, apoyos).solve(cargas)
+    N2, R2 = StiffnessSolver(FrameModel(nodos, barras, apoyos, 2e8, 1e-3)).solve(cargas)
+    assert [N2[b] for b in N1] == pytest.approx(list(N1.values()))
+    assert [R2[r] for r in R1] == pytest.approx(list(R1.values()))
+
+
+def test_cercha_hiperestatica_de_tres_barras():
+    # Barras a 45°, 90° y 45°: N_central = P / (1 + 2cos³45°)
+    nodos = {"D": (0, 0), "S1": (-3, 3), "S2": (0, 3), "S3": (3, 3)}
+    barras = [("b1", "S1", "D"), ("b2", "S2", "D"), ("b3", "S3", "D")]
+    apoyos = {"S1": "pasador", "S2": "pasador", "S3": "pasador"}
+    res = StiffnessSolver(FrameModel(nodos, barras, apoyos, 1.0, 1.0)).analyze({"D": (0, -10)})
+    c = np.cos(np.pi / 4)
+    assert res["N"]["b2"] == pytest.approx(10 / (1 + 2 * c**3))
+    assert res["N"]["b1"] == pytest.approx(res["N"]["b2"] * c**2)
+    assert res["desplazamientos"]["D"][1] == pytest.approx(-res["N"]["b2"] * 3)
+    with pytest.raises(ValueError):
+        StiffnessSolver(FrameModel(nodos, barras[:1], apoyos, 1.0, 1.0))
+
+
+def test_portico_voladizo_y_equilibrio():
+    E, I = 2e8, 1e-4
+    m = FrameModel({"A": (0, 0), "B": (0, 5)}, [("c", "A", "B")], {"A": "empotrado"}, E, 0.01, I, tipo="portico")
+    res = StiffnessSolver(m).analyze({"B": (3, 0, 0)})
+    assert res["desplazamientos"]["B"][0] == pytest.approx(3 * 5**3 / (3 * E * I))
+    assert res["reacciones"]["Mz_A"] == pytest.approx(15.0)
+    nodos = {"A": (0, 0), "B": (0, 4), "C": (6, 4), "D": (6, 0)}
+    barras = [("c1", "A", "B"), ("v", "B", "C"), ("c2", "D", "C")]
+    m = FrameModel(nodos, barras, {"A": "empotrado", "D": "empotrado"}, E, 0.01, I, tipo="portico")
+    R = StiffnessSolver(m).analyze({"B": (10, 0, 0), "C": (0, -20, 5)})["reacciones"]
+    assert R["Rx_A"] + R["Rx_D"] == pytest.approx(-10)
+    assert R["Ry_A"] + R["Ry_D"] == pytest.approx(20)
+    # Momentos respecto a A: reacciones + cargas
+    assert R["Mz_A"] + R["Mz_D"] + 6 * R["Ry_D"] - 4 * 10 - 6 * 20 + 5 == pytest.approx(0, abs=1e-8)
+
+
+def test_malla_grande_con_rcm():
+    nx, ny = 60, 30
+    idn = np.arange(nx * ny).reshape(nx, ny)
+    ix, iy = np.meshgrid(np.arange(nx), np.arange(ny), indexing="ij")
+    xy = np.column_stack([ix.ravel(), iy.ravel()]).astype(float)
+    conn = np.vstack([np.column_stack([idn[:-1].ravel(), idn[1:].ravel()]),
+                      np.column_stack([idn[:, :-1].ravel(), idn[:, 1:].ravel()]),
+                      np.column_stack([idn[:-1, :-1].ravel(), idn[1:, 1:].ravel()])])
+    # Numeración aleatoria de nudos para que el reordenamiento tenga efecto
+    p = np.random.default_rng(0).permutation(nx * ny)
+    inv = np.empty_like(p)
+    inv[p] = np.arange(p.size)
+    restr = np.zeros((nx * ny, 2), dtype=bool)
+    restr[inv[idn[0]]] = True
+    m = FrameModel.from_arrays(xy[p], inv[conn], restr, 2e8, 1e-3)
+    s = StiffnessSolver(m)
+    assert s.ancho_banda < s.ancho_banda_original / 10
+    F = np.zeros(m.n_dofs)
+    F[2 * inv[idn[-1]] + 1] = -1.0
+    r = s.solve_vector(F)
+    assert r["R"][1::2].sum() == pytest.approx(ny)
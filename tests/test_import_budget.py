@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+from utils.import_budget import check_budget, import_time
+from utils.lazy import LazyModule, lazy_import
+
+
+def test_modulo_diferido():
+    import sys
+    import json
+    assert lazy_import("json") is json  # ya importado: se devuelve el módulo real
+    sys.modules.pop("colorsys", None)
+    colorsys = lazy_import("colorsys")
+    assert isinstance(colorsys, LazyModule) and "colorsys" not in sys.modules
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in sys.modules
+
+
+def test_validadores_sin_dependencias_pesadas():
+    t, cargados = import_time("utils.structural_helpers", repeticiones=1)
+    assert cargados == [] and t > 0
+
+
+def test_sin_dependencias_pesadas():
+    assert check_budget(tiempos=False) == []
+
+
+# Los tiempos dependen de la carga de la máquina: solo con SYMPY_CIVIL_IMPORT_BUDGET=1
+# (o con python -m utils.import_budget)
+@pytest.mark.skipif(not os.environ.get("SYMPY_CIVIL_IMPORT_BUDGET"),
+                    reason="presupuestos de tiempo solo con SYMPY_CIVIL_IMPORT_BUDGET=1")
+def test_presupuestos_de_importacion():
+    assert check_budget() == []
@@ -0,0 +1,27 @@
+import sympy as sp
+import numpy as np
+from utils.lambdify_cache import LambdifyCache
+
+
+def test_cache_aciertos_por_estructura():
+    x = sp.symbols('x')
+    cache = LambdifyCache(maxsize=4)
+    f1 = cache.lambdify(x, x**2 + 1)
+    f2 = cache.lambdify(x, sp.Integer(1) + x**2)  # misma estructura
+    assert f1 is f2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert np.allclose(f1(np.array([0.0, 2.0])), [1.0, 5.0])
+
+
+def test_cache_expulsion_lru():
+    x = sp.symbols('x')
+    cache = LambdifyCache(maxsize=2)
+    cache.lambdify(x, x + 1)
+    cache.lambdify(x, x + 2)
+    cache.lambdify(x, x + 1)  # x + 1 pasa a ser el más reciente
+    cache.lambdify(x, x + 3)  # expulsa x + 2
+    assert cache.stats()["size"] == 2
+    cache.lambdify(x, x + 1)
+    cache.lambdify(x, x + 2)
+    assert cache.stats() == {"hits": 2, "misses": 4, "size": 2, "maxsize": 2}
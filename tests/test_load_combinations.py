@@ -0,0 +1,49 @@
+import pytest
+import numpy as np
+from utils.beam_solver import simple_beam_diagrams
+from utils.load_combinations import parse_combination, combination_matrix, case_diagrams, combination_envelopes
+
+
+def test_viga_simple_reacciones_y_momento():
+    sol = simple_beam_diagrams(6.0, [((0, 6), 5.0, 'x')], [(10.0, 2.0)], [(8.0, 3.0)])
+    assert sol["RA"] + sol["RB"] == pytest.approx(40.0)
+    assert sol["RB"] == pytest.approx((10 * 2 + 5 * 6 * 3 - 8) / 6)
+    assert sol["M"](6.0) == pytest.approx(0.0, abs=1e-9)
+
+
+def test_interpretar_combinaciones():
+    assert parse_combination("1.2D + 1.6L - 0.5Lr") == {"D": 1.2, "L": 1.6, "Lr": -0.5}
+    assert parse_combination("D+W") == {"D": 1.0, "W": 1.0}
+    with pytest.raises(ValueError):
+        parse_combination("1.2D+ +?")
+    with pytest.raises(ValueError):
+        combination_matrix(["1.2D+1.6S"], ["D", "L"])
+
+
+def test_envolvente_igual_a_resolver_cada_combinacion():
+    L = 6.0
+    casos = {
+        "D": {"distribuidas": [((0, 6), 5.0, 'x')]},
+        "L": {"puntuales": [(10.0, 2.0)]},
+        "W": {"puntuales": [(-8.0, 3.0)], "momentos": [(4.0, 1.0)]},
+    }
+    combos = ["1.2D+1.6L", "0.9D+1.0W", "1.2D+1.0W+1.0L"]
+    x = np.linspace(0, L, 61)
+    nombres, V, M = case_diagrams(L, casos, x)
+    env = combination_envelopes(V, M, combination_matrix(combos, nombres), combos)
+    # Cada combinación resuelta directamente con las cargas factorizadas
+    directos = []
+    for texto in combos:
+        f = parse_combination(texto)
+        sol = simple_beam_diagrams(
+            L,
+            [(ab, f[c] * w, v) for c in f for ab, w, v in casos[c].get("distribuidas", [])],
+            [(f[c] * P, a) for c in f for P, a in casos[c].get("puntuales", [])],
+            [(f[c] * Mi, a) for c in f for Mi, a in casos[c].get("momentos", [])],
+        )
+        directos.append(sol["M"](x))
+    directos = np.array(directos)
+    assert env["M_comb"] == pytest.approx(directos)
+    assert env["M_max"] == pytest.approx(directos.max(axis=0))
+    # En los apoyos todas valen M = 0 y el empate es arbitrario
+    assert list(env["control_M_max"][1:-1]) == [combos[i] for i in directos[:, 1:-1].argmax(axis=0)]
@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+from utils.moving_loads import axle_train, influence_lines, moving_load_envelope, critical_axle_positions
+
+
+def test_lineas_de_influencia_carga_unitaria():
+    L = 8.0
+    x = np.linspace(0, L, 17)
+    V_der, V_izq, M = influence_lines(L, x, [3.0, 9.0])
+    assert M[0] == pytest.approx(np.where(x <= 3, x * 5 / 8, 3 * (L - x) / 8))
+    assert V_izq[0] - V_der[0] == pytest.approx(np.where(x == 3, 1.0, 0.0))
+    # Carga fuera de la viga
+    assert np.all(V_der[1] == 0) and np.all(M[1] == 0)
+
+
+def test_envolvente_carga_unica():
+    L, P = 20.0, 10.0
+    x = np.linspace(0, L, 81)
+    env = moving_load_envelope(L, [P], [0.0], x)
+    assert env["M_max"] == pytest.approx(P * x * (L - x) / L)
+    assert env["V_max"] == pytest.approx(P * (1 - x / L))
+    assert env["V_min"] == pytest.approx(-P * x / L)
+
+
+def test_envolvente_dos_ejes_momento_absoluto():
+    # Dos ejes iguales separados s: M_abs = P(L - s/2)²/(2L) bajo un eje
+    L, P, s = 20.0, 10.0, 4.0
+    env = moving_load_envelope(L, [P, P], [0.0, s], np.linspace(0, L, 401))
+    valor, x_c, ejes = critical_axle_positions(env, [0.0, s])
+    assert valor == pytest.approx(P * (L - s / 2) ** 2 / (2 * L))
+    assert np.min(np.abs(ejes - x_c)) == pytest.approx(0.0, abs=1e-9)
+    with pytest.raises(ValueError):
+        moving_load_envelope(L, [P], [-1.0], [0.0])
+
+
+def test_tren_ignora_filas_vacias():
+    # Una fila nueva de la tabla (NaN) no debe contaminar la envolvente
+    ejes = axle_train([35.0, 145.0, np.nan, 0.0, 145.0], [np.nan, 4.3, 2.0, 6.0, None])
+    assert ejes == [(35.0, 0.0), (145.0, 4.3), (145.0, 0.0)]
+    P, d = zip(*ejes)
+    env = moving_load_envelope(10.0, P, d, np.linspace(0, 10, 21))
+    assert np.all(np.isfinite(env["M_max"])) and np.isfinite(critical_axle_positions(env, d)[0])
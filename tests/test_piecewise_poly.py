@@ -0,0 +1,68 @@
+import pytest
+import sympy as sp
+import numpy as np
+from utils.piecewise_poly import PiecewisePolynomial
+from utils.structural_helpers import integrate_shear_moment
+
+
+def test_from_loads_superpone_e_integra():
+    x = sp.symbols('x')
+    w = PiecewisePolynomial.from_loads([((0, 3), 5.0, 'x'), ((3, 6), 2*x + 1, 'x'), ((0, 6), 1.0, 'x')], (0, 6))
+    esperado = sp.integrate(5, (x, 0, 3)) + sp.integrate(2*x + 1, (x, 3, 6)) + 6
+    assert w.integrate(0, 6) == pytest.approx(float(esperado))
+    assert w(np.array([1.0, 4.0, 7.0])) == pytest.approx([6.0, 10.0, 0.0])
+
+
+def test_antiderivada_continua_y_escalones():
+    V = PiecewisePolynomial.constant(0, 6, 10) - PiecewisePolynomial.constant(2, 6, 4)
+    M = V.antiderivative()
+    # Salto exacto en la carga puntual, M continuo
+    assert V.left_limit(2.0) == pytest.approx(10)
+    assert V(2.0) == pytest.approx(6)
+    assert M(2.0) == pytest.approx(20)
+    assert M(6.0) == pytest.approx(20 + 6 * 4)
+
+
+def test_integrate_shear_moment_polinomio_por_tramos():
+    w = PiecewisePolynomial.constant(0, 4, 2.0)
+    Vx, Mx = integrate_shear_moment(w)
+    assert Vx(4.0) == pytest.approx(-8)
+    assert Mx(4.0) == pytest.approx(-16)
+
+
+def test_raices_y_conversion_sympy():
+    x = sp.symbols('x')
+    p = PiecewisePolynomial.from_global(0, 4, [-2, 0, 1])
+    assert p.roots() == pytest.approx([np.sqrt(2)])
+    expr = p.to_sympy(x)
+    assert isinstance(expr, sp.Piecewise)
+    q = PiecewisePolynomial.from_sympy(expr, x, (0, 4))
+    xs = np.linspace(0, 4, 9)
+    assert q(xs) == pytest.approx(p(xs))
+
+
+def test_puntos_criticos_viga_carga_puntual():
+    # Viga simple L=6 con P=12 en a=2: V salta de +8 a -4, M máximo = 16 en x=2
+    L = 6.0
+    V = PiecewisePolynomial.constant(0, L, 8.0) - PiecewisePolynomial.constant(2, L, 12.0)
+    M = V.antiderivative()
+    assert V.zero_crossings() == pytest.approx([2.0])
+    assert M.abs_max() == pytest.approx((16.0, 2.0))
+    assert V.abs_max() == pytest.approx((8.0, 0.0))
+
+
+def test_puntos_criticos_carga_uniforme():
+    # w=2 en L=4: M máximo wL²/8 = 4 en el centro, hallado sin muestreo
+    L = 4.0
+    V = PiecewisePolynomial.constant(0, L, 4.0) - PiecewisePolynomial.constant(0, L, 2.0).antiderivative()
+    M = V.antiderivative()
+    assert V.zero_crossings() == pytest.approx([2.0])
+    assert M.abs_max() == pytest.approx((4.0, 2.0))
+
+
+def test_escalones_vectorizados():
+    pp = PiecewisePolynomial.steps([0.0, 2.0, 2.0, 5.0, 9.0], [3.0, -1.0, -0.5, 2.0, 7.0], (0, 6))
+    suma = PiecewisePolynomial.constant(0, 6, 3.0) - PiecewisePolynomial.constant(2, 6, 1.5) \
+        + PiecewisePolynomial.constant(5, 6, 2.0)
+    x = np.linspace(0, 6, 25)
+    assert pp(x) == pytest.approx(suma(x))
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from utils.profiling import Profiler, current_profiler, span, summarize_log, timed
+from utils.stage_graph import StageGraph
+from utils.structural_helpers import integrate_shear_moment, piecewise_load_to_expr
+
+
+@timed()
+def _suma(a, b):
+    with span("interno"):
+        return a + b
+
+
+def test_tramos_anidados_y_decorador():
+    assert _suma(1, 2) == 3  # sin perfil activo no se mide nada
+    with Profiler("prueba", cprofile=True) as perfil:
+        assert current_profiler() is perfil
+        _suma(1, 2)
+        _suma(3, 4)
+    assert current_profiler() is None
+    assert [(s["nombre"], s["nivel"]) for s in perfil.spans] == [
+        ("_suma", 0), ("interno", 1), ("_suma", 0), ("interno", 1)]
+    fila = next(f for f in perfil.table() if f["tramo"] == "_suma")
+    assert fila["llamadas"] == 2 and 0 <= fila["% ejecución"] <= 100
+    assert "_suma" in perfil.profile_text()
+
+
+def test_helpers_y_etapas_instrumentados():
+    g = StageGraph({})
+    g.set_inputs(cargas=[((0, 4), 2, 'x')])
+
+    @g.stage("diagramas", entradas=("cargas",))
+    def diagramas(cargas):
+        return integrate_shear_moment(piecewise_load_to_expr(cargas))
+
+    with Profiler("viga") as perfil:
+        g.get("diagramas")
+    nombres = [s["nombre"] for s in perfil.spans]
+    assert nombres[0] == "etapa:diagramas"
+    assert {"piecewise_load_to_expr", "integrate_shear_moment"} <= set(nombres)
+
+
+def test_registro_json_lines(tmp_path):
+    registro = tmp_path / "perfiles.jsonl"
+    for _ in range(3):
+        with Profiler("cable", sesion="s1") as perfil:
+            with span("etapa:catenaria"):
+                pass
+        perfil.write_log(str(registro), version=1)
+    lineas = [json.loads(l) for l in registro.read_text(encoding="utf-8").splitlines()]
+    assert len(lineas) == 3 and lineas[0]["sesion"] == "s1" and lineas[0]["version"] == 1
+    filas = {f["tramo"]: f for f in summarize_log(str(registro))}
+    assert filas["etapa:catenaria"]["llamadas"] == 3
+    assert filas["(ejecución)"]["pagina"] == "cable"
+
+
+def test_pagina_interrumpida_registra_y_libera_cprofile(tmp_path):
+    registro = tmp_path / "perfiles.jsonl"
+    perfil = Profiler("cercha", cprofile=True).start()
+    with pytest.raises(RuntimeError):
+        try:
+            with span("modelo"):
+                raise RuntimeError("st.stop()")
+        finally:
+            perfil.stop()
+            perfil.write_log(str(registro))
+    assert current_profiler() is None
+    assert [s["nombre"] for s in json.loads(registro.read_text())["spans"]] == ["modelo"]
+    # cProfile quedó desactivado: la siguiente ejecución puede volver a capturarlo
+    siguiente = Profiler("cercha", cprofile=True).start()
+    siguiente.stop()
+    assert siguiente.profile_text()
@@ -0,0 +1,40 @@
+import numpy as np
+import sympy as sp
+
+from utils.piecewise_poly import PiecewisePolynomial
+from utils.result_cache import ResultCache, memoize, model_key
+
+
+def test_model_key_normaliza_el_modelo():
+    x = sp.Symbol("x")
+    a = model_key("viga", {"L": 6, "cargas": [((0, 3), 2 * x + 1, "x")]}, np.array([1.0, 2.0]))
+    b = model_key("viga", {"cargas": [((0.0, 3.0), 1 + 2 * x, "x")], "L": 6.0}, np.array([1.0, 2.0]))
+    assert a == b
+    assert a != model_key("viga", {"L": 6, "cargas": [((0, 3), 2 * x + 2, "x")]}, np.array([1.0, 2.0]))
+    assert model_key(PiecewisePolynomial.constant(0, 1, 2.0)) != model_key(PiecewisePolynomial.constant(0, 1, 3.0))
+
+
+def test_lru_y_estadisticas():
+    cache = ResultCache(maxsize=2)
+    llamadas = []
+
+    @memoize("doble", cache)
+    def doble(v):
+        llamadas.append(v)
+        return 2 * v
+
+    assert [doble(1), doble(1.0), doble(2), doble(3), doble(1)] == [2, 2, 4, 6, 2]
+    assert llamadas == [1, 2, 3, 1]
+    s = cache.stats()
+    assert (s["hits"], s["misses"], s["size"]) == (1, 4, 2)
+
+
+def test_nivel_en_disco_sobrevive_al_reinicio(tmp_path):
+    clave = model_key("cable", 20.0, 1.2)
+    ResultCache(directorio=str(tmp_path)).put(clave, {"H": 24.5})
+    nueva = ResultCache(directorio=str(tmp_path))
+    assert nueva.get(clave) == {"H": 24.5}
+    assert nueva.stats()["disk_hits"] == 1 and nueva.get(clave) == {"H": 24.5}
+    assert nueva.stats()["hits"] == 1
+    nueva.clear(disco=True)
+    assert nueva.get(clave) is None
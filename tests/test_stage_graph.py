@@ -0,0 +1,54 @@
+import pytest
+
+from utils.stage_graph import StageGraph
+
+
+def _grafo(estado, llamadas):
+    g = StageGraph(estado)
+
+    @g.stage("modelo", entradas=("nodos",))
+    def modelo(nodos):
+        llamadas.append("modelo")
+        return sum(nodos)
+
+    @g.stage("solucion", entradas=("cargas",), depende=("modelo",))
+    def solucion(cargas, modelo):
+        llamadas.append("solucion")
+        return modelo * cargas
+
+    @g.stage("grafica", entradas=("estilo",), depende=("solucion",))
+    def grafica(estilo, solucion):
+        llamadas.append("grafica")
+        return f"{estilo}:{solucion}"
+    return g
+
+
+def test_solo_recalcula_aguas_abajo():
+    estado, llamadas = {}, []
+    g = _grafo(estado, llamadas)
+    g.set_inputs(nodos=[1, 2], cargas=2.0, estilo="a")
+    assert g.get("grafica") == "a:6.0"
+    # Nueva ejecución de la página con otra carga: el modelo se reutiliza
+    g = _grafo(estado, llamadas)
+    g.set_inputs(nodos=[1, 2], cargas=3.0, estilo="a")
+    assert g.get("grafica") == "a:9.0"
+    # Solo cambia una opción de salida: la solución no se recalcula
+    g = _grafo(estado, llamadas)
+    g.set_inputs(nodos=[1.0, 2.0], cargas=3, estilo="b")
+    assert g.get("grafica") == "b:9.0"
+    assert llamadas == ["modelo", "solucion", "grafica", "solucion", "grafica", "grafica"]
+    assert g.ejecutadas == ["grafica"] and "solucion" in g.reutilizadas
+
+
+def test_dependencias_e_invalidacion():
+    estado, llamadas = {}, []
+    g = _grafo(estado, llamadas)
+    assert g.downstream(["cargas"]) == ["solucion", "grafica"]
+    with pytest.raises(ValueError):
+        g.get("modelo")
+    with pytest.raises(ValueError):
+        g.stage("otra", depende=("inexistente",))
+    g.set_inputs(nodos=[1], cargas=1, estilo="a")
+    g.get("grafica")
+    g.invalidate(["modelo"])
+    assert estado == {}
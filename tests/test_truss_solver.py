@@ -0,0 +1,98 @@
+import pytest
+import numpy as np
+from utils.truss_solver import solve_truss, FactorizedTruss, TrussModel, assemble_truss_matrix, truss_stability
+
+NODOS = {'A': (0, 0), 'B': (4, 0), 'C': (2, 3)}
+BARRAS = [('AB', 'A', 'B'), ('AC', 'A', 'C'), ('BC', 'B', 'C')]
+APOYOS = {'A': 'pasador', 'B': 'rodillo'}
+
+
+def test_solve_truss_triangulo():
+    N, R = solve_truss(NODOS, BARRAS, APOYOS, {'C': (0, -10)})
+    # Cordón superior en compresión, tirante inferior en tensión
+    assert N['AC'] == pytest.approx(-5 * np.sqrt(13) / 3)
+    assert N['BC'] == pytest.approx(-5 * np.sqrt(13) / 3)
+    assert N['AB'] == pytest.approx(10 / 3)
+    assert R['Ry_A'] == pytest.approx(5)
+    assert R['Ry_B'] == pytest.approx(5)
+    assert R['Rx_A'] == 0
+
+
+def test_solve_truss_equilibrio_global():
+    nodos = {'A': (0, 0), 'B': (3, 0), 'C': (6, 0), 'D': (1.5, 2), 'E': (4.5, 2)}
+    barras = [('AB', 'A', 'B'), ('BC', 'B', 'C'), ('AD', 'A', 'D'), ('BE', 'B', 'E'),
+              ('DE', 'D', 'E'), ('EC', 'E', 'C'), ('DB', 'D', 'B')]
+    N, R = solve_truss(nodos, barras, {'A': 'pasador', 'C': 'rodillo'},
+                       {'D': (0, -8), 'E': (0, -8)})
+    assert R['Ry_A'] + R['Ry_C'] == pytest.approx(16)
+    assert all(np.isfinite(list(N.values())))
+
+
+def test_solve_truss_mecanismo():
+    # Cuadrado sin diagonal: mismo número de ecuaciones e incógnitas pero singular
+    nodos = {'A': (0, 0), 'B': (1, 0), 'C': (1, 1), 'D': (0, 1)}
+    barras = [('AB', 'A', 'B'), ('BC', 'B', 'C'), ('CD', 'C', 'D'), ('DA', 'D', 'A'), ('AB2', 'A', 'B')]
+    with pytest.raises(ValueError):
+        solve_truss(nodos, barras, {'A': 'pasador', 'B': 'rodillo'}, {'C': (1, 0)})
+
+
+def test_solve_truss_no_isostatico():
+    with pytest.raises(ValueError):
+        solve_truss(NODOS, BARRAS[:2], APOYOS, {'C': (0, -10)})
+
+
+def test_factorized_truss_casos():
+    cercha = FactorizedTruss(NODOS, BARRAS, APOYOS)
+    casos = {'D': {'C': (0, -10)}, 'L': {'C': (0, -4)}, 'W': {'C': (3, 0)}}
+    N, R, N_max = cercha.solve_cases(casos)
+    assert N.shape == (3, 3)
+    assert R.shape == (3, 3)
+    # Cada columna coincide con la resolución individual
+    for k, cargas in enumerate(casos.values()):
+        N_k, _ = solve_truss(NODOS, BARRAS, APOYOS, cargas)
+        assert np.allclose(N[:, k], [N_k[b] for b, _, _ in BARRAS])
+    assert np.allclose(N_max, np.abs(N).max(axis=0))
+    # Linealidad: D + L = 1.4·D
+    assert np.allclose(N[:, 0] + N[:, 1], 1.4 * N[:, 0])
+
+
+def test_truss_model_incidencia_y_cosenos():
+    modelo = TrussModel(NODOS, BARRAS, APOYOS)
+    assert sorted(modelo.bars_at(2)) == [1, 2]
+    assert sorted(modelo.bars_at(0)) == [0, 1]
+    assert np.allclose(modelo.lengths, [4, np.sqrt(13), np.sqrt(13)])
+    assert np.allclose(np.hypot(*modelo.cosines.T), 1)
+    A, incognitas = assemble_truss_matrix(NODOS, BARRAS, APOYOS)
+    assert A.shape == (6, 6)
+    assert incognitas == ['AB', 'AC', 'BC', 'Rx_A', 'Ry_A', 'Ry_B']
+
+
+def test_truss_model_grande_desde_arreglos():
+    # Cercha simple en zigzag: cada nodo nuevo se une a los dos anteriores
+    m = 5001
+    k = np.arange(m)
+    xy = np.column_stack((0.5 * k, np.where(k % 2, 1.0, 0.0)))
+    conn = np.concatenate((np.column_stack((k[:-1], k[1:])), np.column_stack((k[:-2], k[2:]))))
+    modelo = TrussModel.from_arrays(xy, conn, [0, 0, m - 1], [0, 1, 1])
+    assert modelo.n_bars == 2 * m - 3
+    assert np.all(np.diff(modelo.incidence_ptr) <= 4)
+    cercha = FactorizedTruss.from_model(modelo)
+    N, R, _ = cercha.solve_cases({'P': {f"n{m // 2}": (0, -1)}})
+    assert R[1, 0] + R[2, 0] == pytest.approx(1)
+
+
+def test_truss_stability_isostatica():
+    reporte = truss_stability(TrussModel(NODOS, BARRAS, APOYOS))
+    assert reporte["isostatica"]
+    assert reporte["mecanismos"] == []
+
+
+def test_truss_stability_mecanismo_y_redundancia():
+    # Cuadrado sin diagonal con barra AB duplicada
+    nodos = {'A': (0, 0), 'B': (1, 0), 'C': (1, 1), 'D': (0, 1)}
+    barras = [('AB', 'A', 'B'), ('BC', 'B', 'C'), ('CD', 'C', 'D'), ('DA', 'D', 'A'), ('AB2', 'A', 'B')]
+    reporte = truss_stability(TrussModel(nodos, barras, {'A': 'pasador', 'B': 'rodillo'}))
+    assert not reporte["estable"]
+    assert reporte["rango"] == 7
+    assert reporte["mecanismos"] == [['C', 'D']]
+    assert reporte["redundantes"] == [['AB', 'AB2']]
@@ -0,0 +1,341 @@
+import multiprocessing as mp
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from concurrent.futures import CancelledError
+from typing import Any, Callable, Dict, Optional
+
+# Conexión con el proceso padre dentro de un trabajo en segundo plano (None fuera de ellos)
+_CANAL = None
+# Streamlit ejecuta cada página como __main__: los procesos hijos no deben volver a ejecutarla
+_MAIN_NEUTRO = types.ModuleType("__main__")
+_ARRANQUE = threading.Lock()
+# Tiempo máximo para que un proceso hijo empiece a calcular [s]
+ARRANQUE_MAX = 60.0
+
+
+def report_progress(fraccion: float, texto: str):
+    """
+    Informa el avance del trabajo en curso; fuera de un trabajo no hace nada. Se pasa como
+    función de progreso a los cálculos que la aceptan (p. ej. solve_truss_symbolic).
+    Args:
+        fraccion: Avance estimado entre 0 y 1.
+        texto: Descripción de la etapa actual.
+    """
+    if _CANAL is not None:
+        try:
+            _CANAL.send(("progreso", (fraccion, texto)))
+        except (OSError, ValueError):
+            pass
+
+
+def default_context():
+    """
+    Contexto de multiprocessing para los trabajos: forkserver (procesos bifurcados desde un
+    servidor limpio, sin los hilos del servidor web, con SymPy ya importado) donde exista y,
+    si no, spawn.
+    Returns:
+        Contexto de multiprocessing.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(["numpy", "sympy", "utils.structural_helpers", "utils.truss_solver"])
+        return ctx
+    return mp.get_context("spawn")
+
+
+def _worker(canal, func, args, kwargs):
+    global _CANAL
+    _CANAL = canal
+    try:
+        canal.send(("inicio", None))
+        canal.send(("resultado", func(*args, **kwargs)))
+    except BaseException as e:  # la excepción se relanza en el proceso padre
+        try:
+            canal.send(("error", e))
+        except Exception:
+            canal.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+    finally:
+        canal.close()
+
+
+class BackgroundJob:
+    """
+    Cálculo en un proceso propio: se puede consultar sin bloquear, informa su estado,
+    se cancela terminando el proceso y respeta un presupuesto de tiempo, que se cuenta desde
+    que el proceso empieza a calcular (sin el arranque del proceso).
+    La función debe poder importarse desde un módulo (p. ej. utils.*), no definirse en una página.
+    """
+
+    def __init__(self, func: Callable, args=(), kwargs=None, timeout: Optional[float] = None,
+                 huella: str = "", contexto=None):
+        """
+        Args:
+            func: Función a ejecutar.
+            args: Argumentos posicionales (deben poder serializarse con pickle).
+            kwargs: Argumentos con nombre.
+            timeout: Presupuesto en segundos desde el inicio (None = sin límite).
+            huella: Identificador del contenido del trabajo (para detectar trabajos obsoletos).
+            contexto: Contexto de multiprocessing (por defecto, default_context()).
+        """
+        self.func, self.args, self.kwargs = func, tuple(args), dict(kwargs or {})
+        self.timeout = timeout
+        self.huella = huella
+        self.estado = "en cola"
+        self.mensaje = ""
+        self.avance: Optional[float] = None
+        self.transitorio = False  # fallo del proceso (no del cálculo): no se recuerda
+        self.lanzado: Optional[float] = None
+        self.inicio: Optional[float] = None
+        self.fin: Optional[float] = None
+        self._ctx = contexto or default_context()
+        self._proceso = None
+        self._canal = None
+        self._resultado: Any = None
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Lanza el proceso (si el trabajo sigue en cola)."""
+        with self._lock:
+            if self.estado != "en cola":
+                return
+            self._canal, hijo = self._ctx.Pipe(duplex=False)
+            self._proceso = self._ctx.Process(target=_worker, args=(hijo, self.func, self.args, self.kwargs),
+                                              daemon=True)
+            with _ARRANQUE:
+                principal = sys.modules.get("__main__")
+                sys.modules["__main__"] = _MAIN_NEUTRO
+                try:
+                    self._proceso.start()
+                finally:
+                    sys.modules["__main__"] = principal
+            hijo.close()
+            self.lanzado = time.monotonic()
+            self.estado = "iniciando"
+
+    @property
+    def elapsed(self) -> float:
+        """Segundos de cálculo (0 mientras está en cola o iniciando)."""
+        if self.inicio is None:
+            return 0.0
+        return (self.fin or time.monotonic()) - self.inicio
+
+    @property
+    def progress(self) -> float:
+        """Avance informado por el cálculo o, si no informa, fracción del presupuesto consumida (0 a 1)."""
+        if self.done():
+            return 1.0
+        if self.avance is not None:
+            return min(max(self.avance, 0.0), 1.0)
+        return min(self.elapsed / self.timeout, 1.0) if self.timeout else 0.0
+
+    def done(self) -> bool:
+        return self.estado in ("terminado", "error", "cancelado", "tiempo agotado")
+
+    def _finish(self, estado: str):
+        self.estado = estado
+        self.fin = time.monotonic()
+        if self._proceso is not None:
+            if self._proceso.is_alive():
+                self._proceso.terminate()
+            self._proceso.join(timeout=1)
+        if self._canal is not None:
+            self._canal.close()
+
+    def poll(self) -> bool:
+        """
+        Lee los mensajes del proceso sin bloquear y aplica el presupuesto de tiempo.
+        Returns:
+            True si el trabajo terminó (con resultado, error, cancelación o tiempo agotado).
+        """
+        with self._lock:
+            if self.estado not in ("iniciando", "ejecutando"):
+                return self.done()
+            try:
+                while self._canal.poll():
+                    tipo, valor = self._canal.recv()
+                    if tipo == "inicio":
+                        self.inicio = time.monotonic()
+                        self.estado = "ejecutando"
+                    elif tipo == "progreso":
+                        self.avance, self.mensaje = valor
+                    else:
+                        if tipo == "resultado":
+                            self._resultado = valor
+                        else:
+                            self._error = valor
+                        self._finish("terminado" if tipo == "resultado" else "error")
+                        return True
+            except (EOFError, OSError):
+                self._error = RuntimeError("El proceso de cálculo terminó sin devolver resultado.")
+                self.transitorio = True
+                self._finish("error")
+                return True
+            if self.estado == "iniciando" and time.monotonic() - self.lanzado > ARRANQUE_MAX:
+                self._error = RuntimeError("El proceso de cálculo no arrancó a tiempo.")
+                self.transitorio = True
+                self._finish("error")
+                return True
+            if self.timeout is not None and self.elapsed > self.timeout:
+                self._finish("tiempo agotado")
+                return True
+            return False
+
+    def cancel(self):
+        """Cancela el trabajo; si está en ejecución, termina su proceso."""
+        with self._lock:
+            if not self.done():
+                self._finish("cancelado")
+
+    def result(self):
+        """
+        Resultado de un trabajo terminado.
+        Returns:
+            Valor devuelto por la función.
+        Raises:
+            TimeoutError: Si se agotó el presupuesto.
+            CancelledError: Si el trabajo se canceló.
+            Exception: La excepción lanzada por la función.
+        """
+        if self.estado == "tiempo agotado":
+            raise TimeoutError(f"{getattr(self.func, '__name__', 'cálculo')} excedió el presupuesto de {self.timeout} s.")
+        if self.estado == "cancelado":
+            raise CancelledError()
+        if self.estado == "error":
+            raise self._error
+        if self.estado != "terminado":
+            raise RuntimeError("El trabajo no ha terminado.")
+        return self._resultado
+
+
+class JobManager:
+    """
+    Trabajos en segundo plano por ranura (p. ej. sesión y página) con un máximo de procesos
+    simultáneos. Al enviar un trabajo con otra huella a una ranura ocupada, el trabajo anterior
+    se cancela, de modo que los cálculos abandonados no retienen procesos. Las ranuras se
+    liberan al recoger el resultado y los trabajos terminados que nadie recoge se descartan
+    tras `retener` segundos. Los cálculos que agotaron su presupuesto o fallaron se recuerdan
+    por huella y presupuesto: volver a enviarlos devuelve el mismo fallo sin recalcular.
+    """
+
+    def __init__(self, max_jobs: int = 2, contexto=None, retener: float = 600.0, max_fallas: int = 256):
+        """
+        Args:
+            max_jobs: Número máximo de procesos de cálculo simultáneos.
+            contexto: Contexto de multiprocessing (por defecto, default_context()).
+            retener: Segundos que se conserva un trabajo terminado que nadie recogió.
+            max_fallas: Número máximo de fallos recordados.
+        """
+        self.max_jobs = max_jobs
+        self.retener = retener
+        self.max_fallas = max_fallas
+        self._ctx = contexto or default_context()
+        self._ranuras: Dict[str, BackgroundJob] = {}
+        self._fallas: "OrderedDict[tuple, BackgroundJob]" = OrderedDict()
+        self._cola = []
+        self._lock = threading.Lock()
+        self.cancelados = 0
+
+    def submit(self, ranura: str, huella: str, func: Callable, *args,
+               timeout: Optional[float] = None, **kwargs) -> BackgroundJob:
+        """
+        Envía un trabajo o reutiliza el de la ranura si tiene la misma huella.
+        Args:
+            ranura: Identificador del consumidor (un trabajo vivo por ranura).
+            huella: Identificador del contenido del cálculo.
+            func: Función importable a ejecutar.
+            *args: Argumentos de func.
+            timeout: Presupuesto en segundos.
+            **kwargs: Argumentos con nombre de func.
+        Returns:
+            El trabajo (en cola o en ejecución), o el trabajo fallido recordado para la misma
+            huella y presupuesto.
+        """
+        with self._lock:
+            self._evict()
+            previo = self._ranuras.get(ranura)
+            if previo is not None and previo.huella == huella and previo.estado not in ("cancelado", "tiempo agotado"):
+                return previo
+            if previo is not None:
+                del self._ranuras[ranura]
+                if not previo.done():
+                    previo.cancel()
+                    self.cancelados += 1
+            falla = self._fallas.get((huella, timeout))
+            if falla is not None:
+                self._fallas.move_to_end((huella, timeout))
+                return falla
+            trabajo = BackgroundJob(func, args, kwargs, timeout, huella, self._ctx)
+            self._ranuras[ranura] = trabajo
+            self._cola.append(trabajo)
+        self._dispatch()
+        return trabajo
+
+    def _collect(self, trabajo: BackgroundJob):
+        # Con el candado tomado: recuerda los fallos definitivos y libera la ranura del trabajo
+        if trabajo.estado == "tiempo agotado" or (trabajo.estado == "error" and not trabajo.transitorio):
+            self._fallas[(trabajo.huella, trabajo.timeout)] = trabajo
+            while len(self._fallas) > self.max_fallas:
+                self._fallas.popitem(last=False)
+        for ranura in [r for r, t in self._ranuras.items() if t is trabajo]:
+            del self._ranuras[ranura]
+
+    def _evict(self):
+        # Con el candado tomado: descarta los trabajos terminados que nadie recogió a tiempo
+        limite = time.monotonic() - self.retener
+        for t in [t for t in self._ranuras.values() if t.done() and (t.fin or 0.0) < limite]:
+            self._collect(t)
+
+    def _dispatch(self):
+        with self._lock:
+            self._cola = [t for t in self._cola if t.estado == "en cola"]
+            activos = 0
+            for t in list(self._ranuras.values()):
+                if t.estado in ("iniciando", "ejecutando") and not t.poll():
+                    activos += 1
+                elif t.estado in ("tiempo agotado", "error"):
+                    self._collect(t)
+            while self._cola and activos < self.max_jobs:
+                self._cola.pop(0).start()
+                activos += 1
+
+    def wait(self, trabajo: BackgroundJob, callback: Optional[Callable[[BackgroundJob], None]] = None,
+             intervalo: float = 0.1):
+        """
+        Espera un trabajo consultándolo periódicamente (la espera puede interrumpirse sin
+        perder el trabajo) y devuelve su resultado; al terminar, libera su ranura.
+        Args:
+            trabajo: Trabajo enviado con submit.
+            callback: Función llamada en cada consulta (p. ej. para actualizar una barra de progreso).
+            intervalo: Segundos entre consultas.
+        Returns:
+            Resultado del trabajo (ver BackgroundJob.result).
+        """
+        while not trabajo.poll():
+            if trabajo.estado == "en cola":
+                self._dispatch()
+            if callback is not None:
+                callback(trabajo)
+            time.sleep(intervalo)
+        with self._lock:
+            self._collect(trabajo)
+        self._dispatch()
+        return trabajo.result()
+
+    def stats(self) -> Dict[str, int]:
+        """Trabajos en ejecución, en cola, terminados sin recoger, cancelados por obsoletos y fallos recordados."""
+        with self._lock:
+            estados = [t.estado for t in self._ranuras.values()]
+            fallas = len(self._fallas)
+        return {"ejecutando": estados.count("ejecutando") + estados.count("iniciando"),
+                "en_cola": estados.count("en cola"),
+                "sin_recoger": estados.count("terminado"),
+                "cancelados": self.cancelados,
+                "fallas": fallas}
+
+
+# Administrador compartido por las páginas
+JOBS = JobManager()
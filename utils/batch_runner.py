@@ -0,0 +1,158 @@
+"""
+Ejecución por lotes, sin interfaz, de escenarios de vigas, cerchas y cables.
+
+Uso:
+    python -m utils.batch_runner data/ejemplos.csv -o data/resultados.jsonl --workers 4
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils.scenarios import run_scenario
+
+CAMPOS_CSV = ["indice", "tipo", "ok", "error", "tiempo_s", "resultado"]
+
+
+def iter_scenarios(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lee escenarios de forma incremental, sin cargar el archivo completo.
+    Formatos: CSV por secciones como data/ejemplos.csv (líneas '#' de comentario y una línea
+    de encabezado que empieza por Tipo en cada sección), JSON lines (.jsonl) o lista JSON (.json).
+    Args:
+        path: Ruta del archivo de escenarios.
+    Returns:
+        Iterador de diccionarios con Tipo y los campos de cada escenario.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if ext == ".jsonl":
+            for linea in f:
+                if linea.strip():
+                    yield json.loads(linea)
+        elif ext == ".json":
+            yield from json.load(f)
+        else:
+            encabezado = None
+            for fila in csv.reader(f, skipinitialspace=True):
+                if not fila or not "".join(fila).strip() or fila[0].lstrip().startswith("#"):
+                    continue
+                fila = [c.strip() for c in fila]
+                if fila[0] == "Tipo":
+                    encabezado = fila
+                elif encabezado is not None:
+                    yield dict(zip(encabezado, fila))
+
+
+def _run_chunk(chunk: Sequence[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Resuelve un bloque de escenarios en un proceso de trabajo; los errores quedan en el resultado."""
+    salida = []
+    for indice, escenario in chunk:
+        t0 = time.perf_counter()
+        try:
+            resultado, error = run_scenario(escenario), ""
+        except Exception as e:  # un escenario inválido no detiene el lote
+            resultado, error = None, f"{type(e).__name__}: {e}"
+        salida.append({"indice": indice, "tipo": escenario.get("Tipo"), "ok": not error, "error": error,
+                       "tiempo_s": time.perf_counter() - t0, "resultado": resultado})
+    return salida
+
+
+class _Writer:
+    """Escritura incremental de resultados en .jsonl o .csv (resultado como JSON)."""
+
+    def __init__(self, path: Optional[str]):
+        self.f = open(path, "w", encoding="utf-8", newline="") if path else sys.stdout
+        self.csv = csv.DictWriter(self.f, CAMPOS_CSV) if path and path.lower().endswith(".csv") else None
+        if self.csv:
+            self.csv.writeheader()
+
+    def write(self, fila: Dict[str, Any]):
+        if self.csv:
+            self.csv.writerow({**fila, "resultado": json.dumps(fila["resultado"], ensure_ascii=False)})
+        else:
+            self.f.write(json.dumps(fila, ensure_ascii=False) + "\n")
+        self.f.flush()
+
+    def close(self):
+        if self.f is not sys.stdout:
+            self.f.close()
+
+
+def run_batch(entrada: str, salida: Optional[str] = None, workers: Optional[int] = None,
+              chunk: int = 16, informe=sys.stderr) -> Dict[str, float]:
+    """
+    Ejecuta todos los escenarios de un archivo y escribe cada resultado apenas está listo.
+    Los escenarios se envían por bloques a un ProcessPoolExecutor con un número acotado de
+    bloques en vuelo, de modo que la memoria no crece con el tamaño del archivo.
+    Args:
+        entrada: Archivo de escenarios (ver iter_scenarios).
+        salida: Archivo de resultados .jsonl o .csv (None: salida estándar en JSON lines).
+        workers: Número de procesos (None: núcleos disponibles; 0: en serie, sin procesos).
+        chunk: Escenarios por bloque enviado a cada proceso.
+        informe: Flujo donde se informa el rendimiento (None para no informar).
+    Returns:
+        Diccionario con total, ok, errores, tiempo_s y escenarios_por_s.
+    """
+    if chunk < 1:
+        raise ValueError("El tamaño de bloque debe ser mayor que cero.")
+    escenarios = enumerate(iter_scenarios(entrada))
+    bloques = iter(lambda: list(islice(escenarios, chunk)), [])
+    writer = _Writer(salida)
+    total = errores = 0
+    t0 = time.perf_counter()
+
+    def registrar(filas):
+        nonlocal total, errores
+        for fila in filas:
+            writer.write(fila)
+            total += 1
+            errores += not fila["ok"]
+
+    try:
+        if workers == 0:
+            for bloque in bloques:
+                registrar(_run_chunk(bloque))
+        else:
+            workers = workers or os.cpu_count() or 1
+            max_vuelo = 2 * workers
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pendientes = set()
+                for bloque in bloques:
+                    if len(pendientes) >= max_vuelo:
+                        hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                        for fut in hechos:
+                            registrar(fut.result())
+                    pendientes.add(pool.submit(_run_chunk, bloque))
+                for fut in pendientes:
+                    registrar(fut.result())
+    finally:
+        writer.close()
+    dt = time.perf_counter() - t0
+    stats = {"total": total, "ok": total - errores, "errores": errores, "tiempo_s": dt,
+             "escenarios_por_s": total / dt if dt > 0 else 0.0}
+    if informe is not None:
+        print(f"{total} escenarios ({errores} con error) en {dt:.2f} s: "
+              f"{stats['escenarios_por_s']:.1f} escenarios/s", file=informe)
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resuelve por lotes escenarios de vigas, cerchas y cables.")
+    parser.add_argument("entrada", help="Archivo de escenarios (.csv por secciones, .jsonl o .json)")
+    parser.add_argument("-o", "--salida", help="Archivo de resultados (.jsonl o .csv); por defecto, salida estándar")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Procesos de trabajo (por defecto, núcleos disponibles; 0 = en serie)")
+    parser.add_argument("--chunk", type=int, default=16, help="Escenarios por bloque (por defecto 16)")
+    args = parser.parse_args(argv)
+    stats = run_batch(args.entrada, args.salida, args.workers, args.chunk)
+    return 1 if stats["errores"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+import numpy as np
+from typing import Any, Dict, List, Sequence, Tuple
+from utils.lazy import lazy_import
+from utils.piecewise_poly import PiecewisePolynomial
+from utils.structural_helpers import integrate_shear_moment, validar_longitud
+from utils.profiling import timed
+
+# SymPy solo para cargas con expresión; SciPy solo para vigas continuas y flechas
+sp = lazy_import("sympy")
+sla = lazy_import("scipy.linalg")
+si = lazy_import("scipy.integrate")
+
+
+# Peso propio de la sección por defecto: γ = 25 kN/m³, sección 0.3 x 0.5 m² [kN/m]
+PESO_PROPIO = 25 * 0.3 * 0.5
+
+
+@timed()
+def parse_distributed_loads(texto: str) -> Tuple[List[Tuple[Tuple[float, float], Any, str]], List[str]]:
+    """
+    Interpreta cargas distribuidas por tramos separadas por ';'.
+    Acepta el formato de la página ("0 3 5 uniforme") y el de data/ejemplos.csv
+    ("(0,3,5,uniforme)").
+    Args:
+        texto: Definición de los tramos: a b expresión tipo.
+    Returns:
+        Tuple (cargas, no_reconocidos): cargas en el formato ((a, b), expr, 'x') y los tipos
+        de carga que no se reconocieron.
+    """
+    cargas, no_reconocidos = [], []
+    for linea in texto.strip().strip("[]").split(';'):
+        partes = linea.strip().strip("()").replace(",", " ").split()
+        if len(partes) < 4:
+            continue
+        a, b = float(partes[0]), float(partes[1])
+        expr = partes[2]
+        tipo = partes[3].lower()
+        if tipo == "uniforme":
+            expr_pw = float(expr)
+        elif tipo == "triangular":
+            expr_pw = sp.sympify(expr)
+        else:
+            no_reconocidos.append(tipo)
+            continue
+        cargas.append(((a, b), expr_pw, 'x'))
+    return cargas, no_reconocidos
+
+
+def simple_beam_diagrams(L: float,
+                         distribuidas: Sequence[Tuple[Tuple[float, float], Any, str]] = (),
+                         puntuales: Sequence[Tuple[float, float]] = (),
+                         momentos: Sequence[Tuple[float, float]] = ()) -> Dict[str, Any]:
+    """
+    Reacciones y diagramas V(x), M(x) de una viga simplemente apoyada, sin resolución simbólica.
+    Sigue el convenio de la página de la viga: cargas positivas hacia abajo y
+    M(x) = ... - Σ M_i H(x - a_i).
+    Args:
+        L: Luz de la viga [m].
+        distribuidas: Cargas por tramos en el formato de piecewise_load_to_expr ((a, b), expr, var).
+        puntuales: Lista de (P [kN], a [m]).
+        momentos: Lista de (M [kN·m], a [m]).
+    Returns:
+        Diccionario con RA, RB (float), w, V y M (PiecewisePolynomial).
+    Raises:
+        ValueError: Si la luz no es válida.
+    """
+    validar_longitud(L, "longitud de viga")
+    w = PiecewisePolynomial.from_loads(list(distribuidas), (0, L))
+    sum_w = w.integrate(0, L)
+    mom_w = (w * PiecewisePolynomial.from_global(0, L, [0, 1])).integrate(0, L)
+    RB = (sum(P * a for P, a in puntuales) + mom_w - sum(M for M, _ in momentos)) / L
+    RA = sum(P for P, _ in puntuales) + sum_w - RB
+    V = PiecewisePolynomial.constant(0, L, RA)
+    for P, a in puntuales:
+        V = V - PiecewisePolynomial.constant(a, L, P)
+    Vw, _ = integrate_shear_moment(w)
+    V = V + Vw
+    M = V.antiderivative()
+    for Mi, a in momentos:
+        M = M - PiecewisePolynomial.constant(a, L, Mi)
+    return {"RA": float(RA), "RB": float(RB), "w": w, "V": V, "M": M}
+
+
+# Grados de libertad restringidos por tipo de apoyo: (desplazamiento vertical, giro)
+TIPOS_APOYO = {"libre": (False, False), "simple": (True, False), "empotrado": (True, True)}
+
+
+def rigidity_segments(EI, x_nodos: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normaliza la rigidez a flexión a tramos constantes.
+    Args:
+        EI: Escalar, un valor por tramo entre nudos, o lista de segmentos (a, b, EI) que cubren
+            la viga sin huecos ni solapes.
+        x_nodos: Nudos de la viga (el primero y el último definen el dominio).
+    Returns:
+        Tuple (cortes, valores): EI constante = valores[i] en [cortes[i], cortes[i+1]].
+    Raises:
+        ValueError: Si algún EI no es positivo o los segmentos no cubren la viga.
+    """
+    x = np.asarray(x_nodos, dtype=float).ravel()
+    datos = np.asarray(EI, dtype=float)
+    if datos.ndim == 2:
+        datos = datos[np.argsort(datos[:, 0])]
+        cortes = np.append(datos[:, 0], datos[-1, 1])
+        tol = 1e-9 * max(1.0, abs(x[-1] - x[0]))
+        if (abs(cortes[0] - x[0]) > tol or abs(cortes[-1] - x[-1]) > tol
+                or np.any(np.abs(datos[1:, 0] - datos[:-1, 1]) > tol)):
+            raise ValueError("Los segmentos de EI deben cubrir toda la viga sin huecos ni solapes.")
+        cortes[0], cortes[-1] = x[0], x[-1]
+        valores = datos[:, 2]
+    elif datos.ndim == 0:
+        cortes, valores = x[[0, -1]], datos.reshape(1)
+    else:
+        if datos.size != x.size - 1:
+            raise ValueError("Debe darse un valor de EI por tramo.")
+        cortes, valores = x, datos
+    if np.any(valores <= 0) or np.any(np.diff(cortes) <= 0):
+        raise ValueError("La rigidez a flexión EI debe ser positiva.")
+    return cortes, valores
+
+
+def _hermite(xi: np.ndarray, l: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Funciones de forma de Hermite y sus derivadas en x para un elemento de longitud l."""
+    N = np.stack((1 - 3 * xi**2 + 2 * xi**3, l * (xi - 2 * xi**2 + xi**3),
+                  3 * xi**2 - 2 * xi**3, l * (-xi**2 + xi**3)), axis=-1)
+    dN = np.stack(((-6 * xi + 6 * xi**2) / l, 1 - 4 * xi + 3 * xi**2,
+                   (6 * xi - 6 * xi**2) / l, -2 * xi + 3 * xi**2), axis=-1)
+    return N, dN
+
+
+def assemble_continuous_beam(x_nodos: Sequence[float], apoyos: Sequence[str], EI=1.0) -> Dict[str, Any]:
+    """
+    Ensambla la matriz de rigidez en banda de una viga continua (elementos de Euler-Bernoulli).
+    Solo depende de la geometría, los apoyos y EI, así que se reutiliza al cambiar las cargas.
+    Args:
+        x_nodos: Posiciones crecientes de los nudos [m].
+        apoyos: Tipo de apoyo en cada nudo: "libre", "simple" o "empotrado".
+        EI: Rigidez a flexión: escalar, n-1 valores por tramo o segmentos (a, b, EI).
+    Returns:
+        Diccionario con x_nodos y apoyos (incluidos los nudos libres añadidos donde cambia EI),
+        restricciones, longitudes l, matrices de elemento k (ne × 4 × 4), grados de libertad D
+        por elemento, libres y la matriz en banda ab (7 × libres).
+    Raises:
+        ValueError: Si los nudos, los apoyos o EI no son válidos o la viga es inestable.
+    """
+    x = np.asarray(x_nodos, dtype=float).ravel()
+    n = len(x)
+    if n < 2 or np.any(np.diff(x) <= 0):
+        raise ValueError("Se requieren al menos dos nudos en posiciones crecientes.")
+    if len(apoyos) != n:
+        raise ValueError("Debe indicarse un tipo de apoyo por nudo.")
+    try:
+        restr = np.array([TIPOS_APOYO[a] for a in apoyos], dtype=bool)
+    except KeyError as e:
+        raise ValueError(f"Tipo de apoyo no reconocido: {e.args[0]}")
+    if not (restr[:, 0].sum() >= 2 or np.any(restr[:, 0] & restr[:, 1])):
+        raise ValueError("La viga es inestable: se requieren dos apoyos o un empotramiento.")
+    # Los cambios de EI dentro de un tramo se modelan con nudos libres adicionales
+    cortes_EI, valores_EI = rigidity_segments(EI, x)
+    extra = np.setdiff1d(cortes_EI[1:-1], x)
+    if extra.size:
+        orden = np.argsort(np.concatenate((x, extra)), kind="stable")
+        x = np.concatenate((x, extra))[orden]
+        restr = np.concatenate((restr, np.zeros((extra.size, 2), dtype=bool)))[orden]
+        apoyos = list(np.concatenate((np.asarray(apoyos, dtype=object), ["libre"] * extra.size))[orden])
+        n = len(x)
+    l = np.diff(x)
+    EI = valores_EI[np.searchsorted(cortes_EI, (x[:-1] + x[1:]) / 2, side="right") - 1]
+    ne = n - 1
+    D = 2 * np.arange(ne)[:, None] + np.arange(4)
+
+    # Matriz de rigidez de cada elemento (ne × 4 × 4)
+    c = (EI / l**3)[:, None, None]
+    k = c * np.stack([
+        np.stack([12 + 0 * l, 6 * l, -12 + 0 * l, 6 * l], -1),
+        np.stack([6 * l, 4 * l**2, -6 * l, 2 * l**2], -1),
+        np.stack([-12 + 0 * l, -6 * l, 12 + 0 * l, -6 * l], -1),
+        np.stack([6 * l, 2 * l**2, -6 * l, 4 * l**2], -1),
+    ], axis=1)
+
+    # Ensamblaje en banda solo de los grados de libertad libres
+    libres = ~restr.ravel()
+    mapa = np.cumsum(libres) - 1
+    n_libres = int(libres.sum())
+    ab = np.zeros((7, n_libres))
+    if n_libres:
+        I = np.broadcast_to(D[:, :, None], k.shape)
+        J = np.broadcast_to(D[:, None, :], k.shape)
+        usar = libres[I] & libres[J]
+        np.add.at(ab, (3 + mapa[I[usar]] - mapa[J[usar]], mapa[J[usar]]), k[usar])
+    return {"x_nodos": x, "apoyos": list(apoyos), "restricciones": restr, "l": l, "k": k, "D": D,
+            "libres": libres, "ab": ab}
+
+
+def solve_continuous_beam(estructura: Dict[str, Any],
+                          distribuidas: Sequence[Tuple[Tuple[float, float], Any, str]] = (),
+                          puntuales: Sequence[Tuple[float, float]] = (),
+                          momentos: Sequence[Tuple[float, float]] = ()) -> Dict[str, Any]:
+    """
+    Resuelve un caso de carga sobre una viga ya ensamblada (assemble_continuous_beam).
+    Args:
+        estructura: Resultado de assemble_continuous_beam.
+        distribuidas: Cargas por tramos ((a, b), expr, var), positivas hacia abajo.
+        puntuales: Lista de (P [kN], a [m]), positivas hacia abajo.
+        momentos: Lista de (M [kN·m], a [m]), antihorarios positivos.
+    Returns:
+        Diccionario con x_nodos, apoyos, reacciones (n × 2: fuerza hacia arriba y momento
+        antihorario), desplazamientos (n × 2: v, θ), w, V y M.
+    Raises:
+        ValueError: Si la matriz de rigidez es singular.
+    """
+    x, l, k, D = estructura["x_nodos"], estructura["l"], estructura["k"], estructura["D"]
+    restr, libres = estructura["restricciones"], estructura["libres"]
+    n, ne = len(x), len(x) - 1
+    dominio = (x[0], x[-1])
+
+    # Fuerzas nodales equivalentes (hacia arriba y antihorarias positivas)
+    f = np.zeros(2 * n)
+    w = PiecewisePolynomial.from_loads(list(distribuidas), dominio)
+    cortes = np.union1d(w.breaks, x)
+    cortes = cortes[(cortes >= x[0]) & (cortes <= x[-1])]
+    if len(cortes) > 1:
+        g, pg = np.polynomial.legendre.leggauss(w.degree // 2 + 3)
+        medio, semi = (cortes[:-1] + cortes[1:]) / 2, np.diff(cortes) / 2
+        e = np.clip(np.searchsorted(x, medio, side="right") - 1, 0, ne - 1)
+        xq = medio[:, None] + semi[:, None] * g
+        N, _ = _hermite((xq - x[e, None]) / l[e, None], l[e, None])
+        aporte = np.einsum("sq,sqi->si", (-w(xq)) * semi[:, None] * pg, N)
+        np.add.at(f, D[e], aporte)
+    for cargas, derivada in ((puntuales, False), (momentos, True)):
+        if not len(cargas):
+            continue
+        valor, a = np.asarray(cargas, dtype=float).T
+        dentro = (a >= x[0]) & (a <= x[-1])
+        valor, a = valor[dentro], a[dentro]
+        e = np.clip(np.searchsorted(x, a, side="right") - 1, 0, ne - 1)
+        N, dN = _hermite((a - x[e]) / l[e], l[e])
+        np.add.at(f, D[e], valor[:, None] * dN if derivada else -valor[:, None] * N)
+
+    u = np.zeros(2 * n)
+    if libres.any():
+        try:
+            u[libres] = sla.solve_banded((3, 3), estructura["ab"], f[libres])
+        except np.linalg.LinAlgError:
+            raise ValueError("La matriz de rigidez es singular: revisa los apoyos.")
+
+    # Reacciones R = K·u - f en los grados de libertad restringidos
+    Ku = np.zeros(2 * n)
+    np.add.at(Ku, D, np.einsum("eij,ej->ei", k, u[D]))
+    reacciones = np.where(restr.ravel(), Ku - f, 0.0).reshape(n, 2)
+
+    # Diagramas por estática: escalones de reacciones y cargas más la integral de w
+    P_pos = [a for _, a in puntuales]
+    V = PiecewisePolynomial.steps(np.concatenate((x, P_pos)),
+                                  np.concatenate((reacciones[:, 0], [-P for P, _ in puntuales])), dominio)
+    Vw, _ = integrate_shear_moment(w)
+    V = V + Vw
+    M = V.antiderivative() - PiecewisePolynomial.steps(
+        np.concatenate((x, [a for _, a in momentos])),
+        np.concatenate((reacciones[:, 1], [Mi for Mi, _ in momentos])), dominio)
+    return {"x_nodos": x, "apoyos": list(estructura["apoyos"]), "reacciones": reacciones,
+            "desplazamientos": u.reshape(n, 2), "w": w, "V": V, "M": M}
+
+
+def continuous_beam_diagrams(x_nodos: Sequence[float], apoyos: Sequence[str],
+                             distribuidas: Sequence[Tuple[Tuple[float, float], Any, str]] = (),
+                             puntuales: Sequence[Tuple[float, float]] = (),
+                             momentos: Sequence[Tuple[float, float]] = (),
+                             EI=1.0) -> Dict[str, Any]:
+    """
+    Viga continua o hiperestática por el método de rigidez (elementos de Euler-Bernoulli).
+    Los nudos son los apoyos (y extremos libres); las cargas dentro de cada tramo se llevan a
+    fuerzas nodales equivalentes exactas. Con los grados de libertad intercalados (v, θ) por nudo
+    la matriz es de banda (semiancho 3) y se resuelve con scipy.linalg.solve_banded en tiempo
+    lineal en el número de tramos. Con las reacciones, V(x) y M(x) salen por estática exacta
+    con el mismo convenio que la viga simple.
+    Args:
+        x_nodos: Posiciones crecientes de los nudos [m].
+        apoyos: Tipo de apoyo en cada nudo: "libre", "simple" o "empotrado".
+        distribuidas: Cargas por tramos ((a, b), expr, var), positivas hacia abajo.
+        puntuales: Lista de (P [kN], a [m]), positivas hacia abajo.
+        momentos: Lista de (M [kN·m], a [m]), antihorarios positivos.
+        EI: Rigidez a flexión: escalar, n-1 valores por tramo o segmentos (a, b, EI).
+    Returns:
+        Diccionario con x_nodos y apoyos (incluidos los nudos libres añadidos donde cambia EI),
+        reacciones (n × 2: fuerza hacia arriba y momento antihorario), desplazamientos
+        (n × 2: v, θ, en unidades de 1/EI si EI = 1), w, V y M.
+    Raises:
+        ValueError: Si los nudos, los apoyos o EI no son válidos o la viga es inestable.
+    """
+    return solve_continuous_beam(assemble_continuous_beam(x_nodos, apoyos, EI), distribuidas, puntuales, momentos)
+
+
+def _support_conditions(x0: float, x_apoyos, apoyos: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Condiciones de borde para v(x) = v_p(x) + C1·(x - x0) + C2.
+    Returns:
+        Tuple (A, posiciones, es_giro): fila [x_i - x0, 1] si v(x_i) = 0 y [1, 0] si θ(x_i) = 0.
+    """
+    filas, posiciones, es_giro = [], [], []
+    for xi, tipo in zip(np.asarray(x_apoyos, dtype=float), apoyos):
+        if tipo not in TIPOS_APOYO:
+            raise ValueError(f"Tipo de apoyo no reconocido: {tipo}")
+        v_fijo, giro_fijo = TIPOS_APOYO[tipo]
+        if v_fijo:
+            filas.append([xi - x0, 1.0]); posiciones.append(xi); es_giro.append(False)
+        if giro_fijo:
+            filas.append([1.0, 0.0]); posiciones.append(xi); es_giro.append(True)
+    A = np.array(filas).reshape(-1, 2)
+    if np.linalg.matrix_rank(A) < 2:
+        raise ValueError("La viga es inestable: se requieren dos apoyos o un empotramiento.")
+    return A, np.array(posiciones), np.array(es_giro, dtype=bool)
+
+
+def beam_deflection(M: PiecewisePolynomial, x_apoyos: Sequence[float], apoyos: Sequence[str],
+                    EI=1.0) -> Dict[str, Any]:
+    """
+    Giros y flechas exactos integrando dos veces M/EI como polinomios por tramos.
+    Las constantes de integración salen de las condiciones de apoyo (v = 0 en apoyos simples
+    y empotramientos, θ = 0 en empotramientos) por mínimos cuadrados; con un M(x) estáticamente
+    correcto el sistema es compatible y el residuo es nulo.
+    Args:
+        M: Diagrama de momento (PiecewisePolynomial) en el dominio de la viga.
+        x_apoyos: Posiciones de los apoyos [m].
+        apoyos: Tipo de cada apoyo ("simple", "empotrado" o "libre").
+        EI: Rigidez a flexión [kN·m²]: escalar, un valor por tramo entre x_apoyos o segmentos (a, b, EI).
+    Returns:
+        Diccionario con theta y v (PiecewisePolynomial), v_max y x_v_max (flecha de mayor valor
+        absoluto, con signo; positiva hacia arriba), theta_max, x_theta_max y residuo de las condiciones.
+    Raises:
+        ValueError: Si EI no es válido o los apoyos no impiden el movimiento de sólido rígido.
+    """
+    x0, x1 = M.dominio
+    x_apoyos = np.asarray(x_apoyos, dtype=float)
+    cortes, valores = rigidity_segments(EI, np.unique(np.concatenate(([x0, x1], x_apoyos))))
+    inv_EI = PiecewisePolynomial.steps(cortes[:-1], np.diff(np.concatenate(([0.0], 1 / valores))), (x0, x1))
+    theta_p = (M * inv_EI).antiderivative()
+    v_p = theta_p.antiderivative()
+    A, posiciones, es_giro = _support_conditions(x0, x_apoyos, apoyos)
+    b = -np.where(es_giro, theta_p(posiciones), v_p(posiciones))
+    (C1, C2), *_ = np.linalg.lstsq(A, b, rcond=None)
+    theta = theta_p + C1
+    v = v_p + PiecewisePolynomial.from_global(x0, x1, [C2 - C1 * x0, C1])
+    v_max, x_v_max = v.abs_max()
+    theta_max, x_theta_max = theta.abs_max()
+    return {"theta": theta, "v": v, "v_max": v_max, "x_v_max": x_v_max,
+            "theta_max": theta_max, "x_theta_max": x_theta_max,
+            "residuo": float(np.abs(A @ [C1, C2] - b).max(initial=0.0))}
+
+
+def deflection_batch(x_vals, M, EI, x_apoyos: Sequence[float], apoyos: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Flechas de un lote de vigas con la misma malla y los mismos apoyos, por integración
+    acumulada (trapecios) de M/EI sobre una malla fina, vectorizada sobre el lote.
+    Args:
+        x_vals: Malla creciente (m puntos) que incluye los apoyos.
+        M: Momentos en la malla, forma (..., m).
+        EI: Rigidez a flexión, escalar o con forma compatible con M (varía por estación o por viga).
+        x_apoyos: Posiciones de los apoyos [m].
+        apoyos: Tipo de cada apoyo.
+    Returns:
+        Diccionario con theta y v de forma (..., m) y v_max, x_v_max por viga.
+    Raises:
+        ValueError: Si EI no es positivo o los apoyos no son suficientes.
+    """
+    x = np.asarray(x_vals, dtype=float)
+    M = np.asarray(M, dtype=float)
+    EI = np.asarray(EI, dtype=float)
+    if np.any(EI <= 0):
+        raise ValueError("La rigidez a flexión EI debe ser positiva.")
+    theta_p = si.cumulative_trapezoid(M / EI, x, axis=-1, initial=0.0)
+    v_p = si.cumulative_trapezoid(theta_p, x, axis=-1, initial=0.0)
+    A, posiciones, es_giro = _support_conditions(x[0], x_apoyos, apoyos)
+    # Interpolación lineal en los apoyos, común a todo el lote
+    j = np.clip(np.searchsorted(x, posiciones) - 1, 0, x.size - 2)
+    t = (posiciones - x[j]) / (x[j + 1] - x[j])
+    interp = lambda f: f[..., j] * (1 - t) + f[..., j + 1] * t
+    b = -np.where(es_giro, interp(theta_p), interp(v_p))
+    C = b @ np.linalg.pinv(A).T
+    theta = theta_p + C[..., :1]
+    v = v_p + C[..., :1] * (x - x[0]) + C[..., 1:]
+    k = np.abs(v).argmax(axis=-1)
+    return {"theta": theta, "v": v,
+            "v_max": np.take_along_axis(v, k[..., None], axis=-1)[..., 0], "x_v_max": x[k]}
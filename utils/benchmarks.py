@@ -0,0 +1,290 @@
+"""
+Benchmarks con series de escalado de los helpers y de los motores de vigas, cerchas y cables.
+
+Uso:
+    python -m utils.benchmarks                      # compara con la base guardada
+    python -m utils.benchmarks --guardar            # guarda una nueva base
+    python -m utils.benchmarks --series cercha_pratt,cable --umbral 0.3
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+BASE_POR_DEFECTO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "data", "benchmarks_base.json")
+# Diferencias menores que esto [s] no cuentan como regresión (ruido del temporizador)
+PISO_TIEMPO = 1e-3
+
+
+def pratt_truss(paneles: int, luz: float = 24.0, altura: float = 3.0, P: float = 10.0):
+    """
+    Cercha Pratt isostática: cordones paralelos, montantes y diagonales que bajan hacia el
+    centro de la luz (traccionadas con carga de gravedad), apoyos pasador y rodillo.
+    Args:
+        paneles: Número de paneles (par, al menos 2).
+        luz: Luz total [m].
+        altura: Altura de la cercha [m].
+        P: Carga vertical hacia abajo en cada nudo interior del cordón inferior [kN].
+    Returns:
+        Tuple (nodos, barras, apoyos, cargas) con el formato de FactorizedTruss.
+    Raises:
+        ValueError: Si el número de paneles no es par o es menor que 2.
+    """
+    return _parallel_chord_truss(paneles, luz, altura, P, pratt=True)
+
+
+def howe_truss(paneles: int, luz: float = 24.0, altura: float = 3.0, P: float = 10.0):
+    """
+    Cercha Howe isostática: como la Pratt, con las diagonales que suben hacia el centro
+    (comprimidas con carga de gravedad).
+    Args:
+        paneles: Número de paneles (par, al menos 2).
+        luz: Luz total [m].
+        altura: Altura de la cercha [m].
+        P: Carga vertical hacia abajo en cada nudo interior del cordón inferior [kN].
+    Returns:
+        Tuple (nodos, barras, apoyos, cargas) con el formato de FactorizedTruss.
+    Raises:
+        ValueError: Si el número de paneles no es par o es menor que 2.
+    """
+    return _parallel_chord_truss(paneles, luz, altura, P, pratt=False)
+
+
+def _parallel_chord_truss(p: int, luz: float, altura: float, P: float, pratt: bool):
+    if p < 2 or p % 2:
+        raise ValueError("El número de paneles debe ser par y al menos 2.")
+    dx = luz / p
+    nodos = {f"L{i}": (i * dx, 0.0) for i in range(p + 1)}
+    nodos.update({f"U{i}": (i * dx, altura) for i in range(1, p)})
+    barras = [(f"L{i}L{i + 1}", f"L{i}", f"L{i + 1}") for i in range(p)]
+    barras += [(f"U{i}U{i + 1}", f"U{i}", f"U{i + 1}") for i in range(1, p - 1)]
+    barras += [(f"U{i}L{i}", f"U{i}", f"L{i}") for i in range(1, p)]
+    barras += [("L0U1", "L0", "U1"), (f"U{p - 1}L{p}", f"U{p - 1}", f"L{p}")]
+    for i in range(1, p - 1):  # paneles interiores entre los montantes i e i+1
+        izquierda = i + 1 <= p // 2
+        if pratt == izquierda:
+            ni, nj = f"U{i}", f"L{i + 1}"
+        else:
+            ni, nj = f"L{i}", f"U{i + 1}"
+        barras.append((ni + nj, ni, nj))
+    apoyos = {"L0": "pasador", f"L{p}": "rodillo"}
+    cargas = {f"L{i}": (0.0, -P) for i in range(1, p)}
+    return nodos, barras, apoyos, cargas
+
+
+def load_segments(n: int, L: float = 12.0) -> List[Tuple[Tuple[float, float], Any, str]]:
+    """
+    Carga distribuida de n tramos contiguos que alternan uniformes y lineales.
+    Args:
+        n: Número de tramos.
+        L: Longitud de la viga [m].
+    Returns:
+        Definición ((a, b), expr, 'x') para piecewise_load_to_expr.
+    """
+    from utils.structural_helpers import symbols_safe
+    x = symbols_safe('x')
+    bordes = np.linspace(0.0, L, n + 1)
+    return [((float(a), float(b)), 2 + k % 3 if k % 2 == 0 else 1 + x / L, 'x')
+            for k, (a, b) in enumerate(zip(bordes[:-1], bordes[1:]))]
+
+
+def measure(func: Callable[[], Any], repeticiones: int = 5, memoria: bool = True) -> Dict[str, float]:
+    """
+    Mide una función sin argumentos: una ejecución de calentamiento, la mediana y el mínimo
+    de varias repeticiones y, en una ejecución aparte con tracemalloc, el pico de memoria.
+    Args:
+        func: Función a medir.
+        repeticiones: Número de ejecuciones cronometradas.
+        memoria: Si es True, mide el pico de memoria asignada por Python.
+    Returns:
+        Diccionario con mediana_s, min_s y pico_kib (0 si no se mide).
+    """
+    func()
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        func()
+        tiempos.append(time.perf_counter() - t0)
+    pico = 0.0
+    if memoria:
+        tracemalloc.start()
+        try:
+            func()
+            pico = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+    return {"mediana_s": statistics.median(tiempos), "min_s": min(tiempos), "pico_kib": pico}
+
+
+def _serie_cargas(n: int):
+    from utils.structural_helpers import integrate_shear_moment, piecewise_load_to_expr, symbols_safe
+    definicion, x = load_segments(n), symbols_safe('x')
+    return lambda: integrate_shear_moment(piecewise_load_to_expr(definicion), x)
+
+
+def _serie_cargas_exactas(n: int):
+    from utils.piecewise_poly import PiecewisePolynomial
+    from utils.structural_helpers import integrate_shear_moment
+    definicion = load_segments(n)
+    return lambda: integrate_shear_moment(PiecewisePolynomial.from_loads(definicion, (0.0, 12.0)))
+
+
+def _serie_cercha(generador):
+    def serie(n: int):
+        from utils.truss_solver import FactorizedTruss
+        nodos, barras, apoyos, cargas = generador(n)
+        return lambda: FactorizedTruss(nodos, barras, apoyos).solve(cargas)
+    return serie
+
+
+def _serie_cable(n: int):
+    from utils.catenary import solve_cable_chain, unstretched_lengths
+    l = np.full(n, 100.0)
+    h = 5.0 * np.sin(np.arange(n))
+    E, A, w = 1.0e8, 2.0e-4, 0.15
+    L0 = unstretched_lengths(l, h, w, E, A, H=20.0)
+    return lambda: solve_cable_chain(l, h, L0, w, E, A)
+
+
+def _serie_grafica(n: int):
+    # Diagrama de momentos como los de la página de la viga (PiecewisePolynomial de n tramos)
+    from utils.piecewise_poly import PiecewisePolynomial
+    from utils.structural_helpers import integrate_shear_moment, plot_piecewise, symbols_safe
+    _, M = integrate_shear_moment(PiecewisePolynomial.from_loads(load_segments(n), (0.0, 12.0)))
+    return lambda: plot_piecewise(M, symbols_safe('x'), (0.0, 12.0))
+
+
+# Serie -> (preparación por tamaño, tamaños, tamaños en modo rápido)
+SERIES: Dict[str, Tuple[Callable[[int], Callable[[], Any]], Sequence[int], Sequence[int]]] = {
+    "cargas": (_serie_cargas, (2, 4, 8, 16), (2, 4)),
+    "cargas_exactas": (_serie_cargas_exactas, (4, 16, 64, 256), (4, 16)),
+    "cercha_pratt": (_serie_cercha(pratt_truss), (8, 32, 128, 512), (8, 32)),
+    "cercha_howe": (_serie_cercha(howe_truss), (8, 32, 128, 512), (8, 32)),
+    "cable": (_serie_cable, (10, 100, 1000, 10000), (10, 100)),
+    "grafica": (_serie_grafica, (4, 16, 64, 256), (4, 16)),
+}
+
+
+def environment() -> Dict[str, str]:
+    """Versiones y plataforma con las que se midió (las bases solo son comparables en el mismo entorno)."""
+    import scipy
+    import sympy
+    return {"python": platform.python_version(), "numpy": np.__version__, "scipy": scipy.__version__,
+            "sympy": sympy.__version__, "plataforma": platform.platform(), "procesador": platform.machine()}
+
+
+def run_suite(series: Optional[Sequence[str]] = None, rapido: bool = False, repeticiones: int = 5,
+              memoria: bool = True, informe=sys.stdout) -> Dict[str, Dict[str, float]]:
+    """
+    Ejecuta las series de escalado.
+    Args:
+        series: Nombres de SERIES a ejecutar (None: todas).
+        rapido: Si es True, usa solo los tamaños pequeños.
+        repeticiones: Ejecuciones cronometradas por tamaño.
+        memoria: Si es True, mide el pico de memoria.
+        informe: Flujo donde se escribe cada medición (None para no informar).
+    Returns:
+        Diccionario "serie/tamaño" -> medición (ver measure).
+    Raises:
+        ValueError: Si una serie no existe.
+    """
+    nombres = list(SERIES) if series is None else list(series)
+    for s in nombres:
+        if s not in SERIES:
+            raise ValueError(f"Serie de benchmark desconocida: {s}")
+    resultados = {}
+    for s in nombres:
+        preparar, tamanos, tamanos_rapidos = SERIES[s]
+        for n in (tamanos_rapidos if rapido else tamanos):
+            r = measure(preparar(n), repeticiones, memoria)
+            resultados[f"{s}/{n}"] = r
+            if informe is not None:
+                print(f"{s + '/' + str(n):<22} {1000 * r['mediana_s']:>10.2f} ms {r['pico_kib']:>10.0f} KiB",
+                      file=informe)
+    return resultados
+
+
+def compare(actual: Dict[str, Dict[str, float]], base: Dict[str, Dict[str, float]],
+            umbral: float = 0.5, umbral_memoria: Optional[float] = None) -> List[str]:
+    """
+    Compara mediciones con una base guardada.
+    Args:
+        actual: Resultados de run_suite.
+        base: Resultados de referencia (las claves que no estén en ambas se ignoran).
+        umbral: Aumento relativo de tiempo tolerado (0.5 = 50 %).
+        umbral_memoria: Aumento relativo del pico de memoria tolerado (por defecto, umbral).
+    Returns:
+        Descripción de cada regresión (lista vacía si no hay).
+    """
+    umbral_memoria = umbral if umbral_memoria is None else umbral_memoria
+    regresiones = []
+    for clave in sorted(set(actual) & set(base)):
+        a, b = actual[clave], base[clave]
+        if a["mediana_s"] > b["mediana_s"] * (1 + umbral) and a["mediana_s"] - b["mediana_s"] > PISO_TIEMPO:
+            regresiones.append(f"{clave}: tiempo {1000 * b['mediana_s']:.2f} → {1000 * a['mediana_s']:.2f} ms "
+                               f"(+{100 * (a['mediana_s'] / b['mediana_s'] - 1):.0f} %)")
+        if b.get("pico_kib") and a.get("pico_kib") and a["pico_kib"] > b["pico_kib"] * (1 + umbral_memoria):
+            regresiones.append(f"{clave}: memoria {b['pico_kib']:.0f} → {a['pico_kib']:.0f} KiB "
+                               f"(+{100 * (a['pico_kib'] / b['pico_kib'] - 1):.0f} %)")
+    return regresiones
+
+
+def save_baseline(resultados: Dict[str, Dict[str, float]], path: str = BASE_POR_DEFECTO):
+    """Guarda los resultados como base, junto con el entorno de medición."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"entorno": environment(), "resultados": resultados}, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str = BASE_POR_DEFECTO) -> Dict[str, Any]:
+    """
+    Lee una base guardada.
+    Returns:
+        Diccionario con entorno y resultados.
+    Raises:
+        FileNotFoundError: Si no existe la base.
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de escalado de helpers, vigas, cerchas y cables.")
+    parser.add_argument("--series", help=f"Series separadas por comas (por defecto todas: {', '.join(SERIES)})")
+    parser.add_argument("--rapido", action="store_true", help="Solo los tamaños pequeños")
+    parser.add_argument("-r", "--repeticiones", type=int, default=5, help="Ejecuciones por tamaño (por defecto 5)")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir el pico de memoria")
+    parser.add_argument("--base", default=BASE_POR_DEFECTO, help="Archivo de la base (JSON)")
+    parser.add_argument("--guardar", action="store_true", help="Guarda los resultados como nueva base")
+    parser.add_argument("--umbral", type=float, default=0.5,
+                        help="Aumento relativo tolerado de tiempo y memoria (por defecto 0.5 = 50 %%)")
+    args = parser.parse_args(argv)
+    series = args.series.split(",") if args.series else None
+    resultados = run_suite(series, args.rapido, args.repeticiones, not args.sin_memoria)
+    if args.guardar:
+        save_baseline(resultados, args.base)
+        print(f"Base guardada en {args.base}")
+        return 0
+    try:
+        base = load_baseline(args.base)
+    except FileNotFoundError:
+        print(f"No hay base en {args.base}; ejecuta con --guardar.", file=sys.stderr)
+        return 2
+    if base.get("entorno") != environment():
+        print("Aviso: la base se midió en otro entorno; los tiempos pueden no ser comparables.", file=sys.stderr)
+    regresiones = compare(resultados, base["resultados"], args.umbral)
+    for r in regresiones:
+        print(f"REGRESIÓN {r}", file=sys.stderr)
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
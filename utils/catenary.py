@@ -0,0 +1,384 @@
+import numpy as np
+import scipy.sparse as sps
+from scipy.sparse.linalg import spsolve
+from typing import Dict, Optional
+from utils.structural_helpers import validar_modulo_elastico, validar_area
+
+
+def catenary_x0(a, L, delta_h):
+    """
+    Abscisa del punto bajo x0 en forma cerrada para apoyos (0, 0) y (L, Δh).
+    De a·[cosh((L-x0)/a) - cosh(x0/a)] = Δh se obtiene
+    x0 = L/2 - a·asinh(Δh / (2a·sinh(L/2a))).
+    Args:
+        a: Parámetro de la catenaria a = H/w.
+        L: Separación horizontal.
+        delta_h: Diferencia de altura (positiva si el apoyo derecho es más alto).
+    Returns:
+        x0 (puede quedar fuera de [0, L] en cables muy inclinados).
+    """
+    return L / 2 - a * np.arcsinh(delta_h / (2 * a * np.sinh(L / (2 * a))))
+
+
+def catenary_sag(a, L, delta_h):
+    """
+    Flecha: máxima distancia vertical entre la cuerda y el cable.
+    Se alcanza donde la pendiente del cable iguala a la de la cuerda,
+    x_f = x0 + a·asinh(Δh/L).
+    Args:
+        a: Parámetro de la catenaria.
+        L: Separación horizontal.
+        delta_h: Diferencia de altura.
+    Returns:
+        Tuple (flecha, x_f).
+    """
+    x0 = catenary_x0(a, L, delta_h)
+    x_f = x0 + a * np.arcsinh(delta_h / L)
+    # y(x_f) - y(0) como producto de senos hiperbólicos (sin cancelación para a grande)
+    y_f = 2 * a * np.sinh((x_f - 2 * x0) / (2 * a)) * np.sinh(x_f / (2 * a))
+    return delta_h * x_f / L - y_f, x_f
+
+
+def _solve_a_for_sag(L, delta_h, f_obj, rtol=1e-12, maxiter=60):
+    """
+    Newton salvaguardado y vectorizado en s = ln(a) para la flecha objetivo.
+    La flecha decrece monótonamente con a; cada elemento mantiene su intervalo
+    [s_lo, s_hi] que encierra la raíz y se bisecta cuando el paso de Newton sale
+    de él. Todos los elementos iteran juntos; los que convergen salen del conjunto activo.
+    Args:
+        L, delta_h, f_obj: Arreglos 1D del mismo tamaño.
+    Returns:
+        Arreglo de a.
+    """
+    def g(s, i):
+        # NaN (desbordamiento con a muy pequeño) se trata como flecha enorme
+        v = np.log(catenary_sag(np.exp(s), L[i], delta_h[i])[0]) - np.log(f_obj[i])
+        return np.where(np.isnan(v), np.inf, v)
+
+    todos = np.arange(len(L))
+    # Estimación inicial parabólica: H ≈ wL²/(8f)
+    s = np.log(L**2 / (8 * f_obj))
+    s_lo, s_hi = s - 1.0, s + 1.0
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for _ in range(200):
+            malos = ~(g(s_lo, todos) > 0)
+            if not malos.any():
+                break
+            s_lo[malos] -= 1.0
+        for _ in range(200):
+            malos = ~(g(s_hi, todos) < 0)
+            if not malos.any():
+                break
+            s_hi[malos] += 1.0
+        activo = np.ones(len(L), dtype=bool)
+        h = 1e-6
+        for _ in range(maxiter):
+            i = np.flatnonzero(activo)
+            if not len(i):
+                break
+            gs = g(s[i], i)
+            positivo = gs > 0
+            s_lo[i[positivo]] = s[i[positivo]]
+            s_hi[i[~positivo]] = s[i[~positivo]]
+            dg = (g(s[i] + h, i) - g(s[i] - h, i)) / (2 * h)
+            s_new = s[i] - gs / dg
+            fuera = ~((s_new > s_lo[i]) & (s_new < s_hi[i]))
+            s_new[fuera] = ((s_lo[i] + s_hi[i]) / 2)[fuera]
+            listo = (np.abs(gs) < rtol) | (np.abs(s_new - s[i]) < rtol)
+            s[i] = np.where(np.abs(gs) < rtol, s[i], s_new)
+            activo[i[listo]] = False
+    return np.exp(s)
+
+
+def solve_catenary_batch(L, delta_h, w, f_obj=None, H=None) -> Dict[str, np.ndarray]:
+    """
+    Resuelve muchos vanos a la vez (arreglos con difusión de NumPy).
+    En cada elemento se usa H si es positivo; si no, la flecha objetivo f_obj.
+    Los elementos sin H ni f_obj válidos quedan en NaN.
+    Args:
+        L: Separaciones horizontales [m].
+        delta_h: Diferencias de altura [m].
+        w: Pesos por unidad de longitud [kN/m].
+        f_obj: Flechas objetivo [m] (opcional).
+        H: Tensiones horizontales [kN] (opcional).
+    Returns:
+        Diccionario de arreglos con la forma difundida: a, x0, C, H, T_left, T_right, f_max, x_f, S.
+    """
+    nan = np.nan
+    L, delta_h, w, f_obj, H = (np.asarray(v, dtype=float) for v in np.broadcast_arrays(
+        L, delta_h, w, nan if f_obj is None else f_obj, nan if H is None else H))
+    forma = L.shape
+    L, delta_h, w, f_obj, H = (v.ravel() for v in (L, delta_h, w, f_obj, H))
+    validos = (L > 0) & (w > 0)
+    usa_H = validos & (H > 0)
+    usa_f = validos & ~usa_H & (f_obj > 0)
+    a = np.full(L.shape, nan)
+    a[usa_H] = H[usa_H] / w[usa_H]
+    if usa_f.any():
+        a[usa_f] = _solve_a_for_sag(L[usa_f], delta_h[usa_f], f_obj[usa_f])
+    with np.errstate(invalid="ignore"):
+        x0 = catenary_x0(a, L, delta_h)
+        f_max, x_f = catenary_sag(a, L, delta_h)
+        H_val = a * w
+        res = {
+            "a": a,
+            "x0": x0,
+            "C": -a * np.cosh(x0 / a),
+            "H": H_val,
+            "T_left": H_val * np.cosh(x0 / a),
+            "T_right": H_val * np.cosh((L - x0) / a),
+            "f_max": f_max,
+            "x_f": x_f,
+            "S": a * (np.sinh((L - x0) / a) + np.sinh(x0 / a)),
+        }
+    return {k: v.reshape(forma) for k, v in res.items()}
+
+
+def catenary_design_chart(L, H, delta_h=0.0, w=1.0) -> Dict[str, np.ndarray]:
+    """
+    Ábaco H–flecha sobre una malla de vanos × tensiones, en forma cerrada (sin iterar).
+    Args:
+        L: Vanos [m] (1D).
+        H: Tensiones horizontales [kN] (1D).
+        delta_h: Diferencia de altura [m] (escalar o difundible a len(L) × len(H)).
+        w: Peso por unidad de longitud [kN/m] (escalar o difundible).
+    Returns:
+        Diccionario de matrices len(L) × len(H) (ver solve_catenary_batch).
+    """
+    L = np.asarray(L, dtype=float).reshape(-1, 1)
+    H = np.asarray(H, dtype=float).reshape(1, -1)
+    return solve_catenary_batch(L, delta_h, w, H=H)
+
+
+def solve_catenary(L: float, delta_h: float, w: float,
+                   f_obj: Optional[float] = None, H: Optional[float] = None) -> Dict[str, float]:
+    """
+    Resuelve la catenaria inextensible entre (0, 0) y (L, Δh) con NumPy.
+    Con H dado, a = H/w; con f_obj dado, a se obtiene por Newton salvaguardado.
+    Args:
+        L: Separación horizontal [m].
+        delta_h: Diferencia de altura [m].
+        w: Peso por unidad de longitud [kN/m].
+        f_obj: Flecha objetivo [m] (opcional).
+        H: Tensión horizontal [kN] (opcional, tiene prioridad sobre f_obj).
+    Returns:
+        Diccionario con a, x0, C, H, T_left, T_right, f_max, x_f y S (longitud del cable).
+    Raises:
+        ValueError: Si no se da H ni f_obj, o los datos no son positivos.
+    """
+    if L <= 0 or w <= 0:
+        raise ValueError("L y w deben ser mayores que cero.")
+    if not ((H is not None and H > 0) or (f_obj is not None and f_obj > 0)):
+        raise ValueError("Se requiere la tensión horizontal H o la flecha objetivo f_obj.")
+    res = solve_catenary_batch(L, delta_h, w, f_obj=f_obj, H=H)
+    if not np.isfinite(res["a"]):
+        raise ValueError("No se encontró solución para los parámetros dados.")
+    return {k: float(v) for k, v in res.items()}
+
+
+def catenary_profile(sol: Dict[str, float], x_vals) -> np.ndarray:
+    """
+    Ordenadas del cable y(x) = a·cosh((x - x0)/a) + C.
+    Args:
+        sol: Resultado de solve_catenary.
+        x_vals: Abscisas.
+    Returns:
+        Arreglo de ordenadas.
+    """
+    a, x0 = sol["a"], sol["x0"]
+    return a * np.cosh((np.asarray(x_vals, dtype=float) - x0) / a) + sol["C"]
+
+
+# --- Catenaria elástica (Irvine) y cadenas de vanos ---
+
+def elastic_catenary_xy(s, H, V, w, EA):
+    """
+    Coordenadas de la catenaria elástica en la coordenada lagrangiana s (longitud sin estirar).
+    V es la componente vertical de la tensión en el apoyo izquierdo (s = 0), positiva hacia arriba
+    a lo largo del cable; la componente vertical en s es V + w·s.
+    Args:
+        s: Longitud sin estirar medida desde el apoyo izquierdo.
+        H: Tensión horizontal.
+        V: Componente vertical en s = 0.
+        w: Peso por unidad de longitud sin estirar.
+        EA: Rigidez axial.
+    Returns:
+        Tuple (x(s), y(s)) relativas al apoyo izquierdo.
+    """
+    A, B = V / H, (V + w * s) / H
+    x = H * s / EA + H / w * (np.arcsinh(B) - np.arcsinh(A))
+    y = (V * s + w * s**2 / 2) / EA + H / w * (np.hypot(1, B) - np.hypot(1, A))
+    return x, y
+
+
+def _validar_vanos(l, h, L0=None):
+    """Rechaza longitudes o desniveles no finitos (p. ej. NaN de una fila vacía de la tabla)."""
+    for valores, nombre in ((l, "separaciones"), (h, "desniveles"), (L0, "longitudes sin estirar")):
+        if valores is not None and not np.all(np.isfinite(valores)):
+            raise ValueError(f"Las {nombre} de los vanos deben ser números finitos.")
+
+
+def _elastic_span_jacobian(L0, H, V, w, EA):
+    """Derivadas parciales de (x(L0), y(L0)) respecto a H, V y L0."""
+    A, B = V / H, (V + w * L0) / H
+    rA, rB = np.hypot(1, A), np.hypot(1, B)
+    dx_dH = L0 / EA + (np.arcsinh(B) - np.arcsinh(A) - B / rB + A / rA) / w
+    dx_dV = (1 / rB - 1 / rA) / w
+    dy_dH = dx_dV
+    dy_dV = L0 / EA + (B / rB - A / rA) / w
+    dx_dL0 = H / EA + 1 / rB
+    dy_dL0 = (V + w * L0) / EA + B / rB
+    return dx_dH, dx_dV, dy_dH, dy_dV, dx_dL0, dy_dL0
+
+
+def unstretched_lengths(l, h, w, E: float, A: float, H, tol: float = 1e-10, maxiter: int = 50) -> np.ndarray:
+    """
+    Longitudes sin estirar de cada vano para una tensión horizontal de tendido H.
+    Parte de la catenaria inextensible y corrige el alargamiento con Newton 2×2 vectorizado.
+    Args:
+        l: Separaciones horizontales de los vanos [m].
+        h: Diferencias de altura de los vanos [m].
+        w: Peso por unidad de longitud [kN/m].
+        E: Módulo elástico [kPa, coherente con las fuerzas].
+        A: Área de la sección [m²].
+        H: Tensión horizontal de tendido [kN] (escalar o por vano).
+    Returns:
+        Arreglo de longitudes sin estirar L0.
+    Raises:
+        ValueError: Si algún vano tiene longitud o desnivel no finito.
+    """
+    validar_modulo_elastico(E)
+    validar_area(A)
+    EA = E * A
+    l, h, w, H = (np.asarray(v, dtype=float) for v in np.broadcast_arrays(l, h, w, H))
+    _validar_vanos(l, h)
+    inex = solve_catenary_batch(l, h, w, H=H)
+    L0 = inex["S"] / (1 + H / EA)
+    V = -H * np.sinh(inex["x0"] / inex["a"])
+    for _ in range(maxiter):
+        x, y = elastic_catenary_xy(L0, H, V, w, EA)
+        rx, ry = x - l, y - h
+        if max(np.abs(rx).max(initial=0), np.abs(ry).max(initial=0)) < tol * max(1.0, l.max(initial=1.0)):
+            break
+        _, dx_dV, _, dy_dV, dx_dL0, dy_dL0 = _elastic_span_jacobian(L0, H, V, w, EA)
+        det = dx_dV * dy_dL0 - dx_dL0 * dy_dV
+        V = V - (dy_dL0 * rx - dx_dL0 * ry) / det
+        L0 = L0 - (-dy_dV * rx + dx_dV * ry) / det
+    return L0
+
+
+def solve_cable_chain(l, h, L0, w, E: float, A: float, tol: float = 1e-9, maxiter: int = 50) -> Dict[str, np.ndarray]:
+    """
+    Cadena de N vanos elásticos entre dos anclajes, con puntos de suspensión que pueden
+    desplazarse horizontalmente (poleas sin fricción): la tensión horizontal se equilibra
+    en cada suspensión. Todos los vanos se resuelven juntos con Newton y jacobiano disperso
+    (banda 3×3 por vano), de modo que el costo crece linealmente con N.
+    Incógnitas intercaladas por vano: [H_i, V_i, u_i], con u_i el desplazamiento horizontal
+    del apoyo derecho del vano i (u = 0 en los anclajes).
+    Ecuaciones: x_i(L0_i) = l_i + u_i - u_{i-1}, y_i(L0_i) = h_i y H_i = H_{i+1}.
+    Args:
+        l: Separaciones horizontales de los vanos [m].
+        h: Diferencias de altura de los vanos [m].
+        L0: Longitudes sin estirar [m] (ver unstretched_lengths).
+        w: Peso por unidad de longitud sin estirar [kN/m] (escalar o por vano).
+        E: Módulo elástico.
+        A: Área de la sección.
+    Returns:
+        Diccionario de arreglos por vano: H, V_left, T_left, T_right, u (desplazamiento del
+        apoyo derecho), l_def (vano deformado), S (longitud estirada) e iteraciones.
+    Raises:
+        ValueError: Si algún dato de los vanos no es finito, si no hay un paso de Newton con
+            H > 0 o si Newton no converge.
+    """
+    validar_modulo_elastico(E)
+    validar_area(A)
+    EA = E * A
+    l, h, L0, w = (np.asarray(v, dtype=float).ravel() for v in np.broadcast_arrays(l, h, L0, w))
+    _validar_vanos(l, h, L0)
+    n = len(l)
+    # Estimación inicial: parábola con la holgura de cada vano y H común
+    cuerda = np.hypot(l, h)
+    holgura = np.maximum(L0 - cuerda, 1e-6 * cuerda)
+    H = np.full(n, np.median(w * l**2 / (8 * np.sqrt(3 * l * holgura / 8))))
+    V = -w * L0 / 2 + H * h / l
+    u = np.zeros(n - 1)
+    H_idx, V_idx, u_idx = 3 * np.arange(n), 3 * np.arange(n) + 1, 3 * np.arange(n - 1) + 2
+    n_inc = 3 * n - 1
+
+    def residuo(H, V, u):
+        x, y = elastic_catenary_xy(L0, H, V, w, EA)
+        r = np.empty(n_inc)
+        r[H_idx] = x - (l + np.append(u, 0.0) - np.insert(u, 0, 0.0))
+        r[V_idx] = y - h
+        r[u_idx] = H[:-1] - H[1:]
+        return r
+
+    r = residuo(H, V, u)
+    it = 0
+    # El residuo se verifica después de cada actualización (también la última permitida)
+    while np.abs(r).max() >= tol * max(1.0, l.max()):
+        if it == maxiter:
+            raise ValueError("La cadena de vanos elásticos no convergió.")
+        dx_dH, dx_dV, dy_dH, dy_dV, _, _ = _elastic_span_jacobian(L0, H, V, w, EA)
+        filas, cols, vals = [], [], []
+        # Cierre horizontal y vertical de cada vano
+        filas += [H_idx, H_idx, V_idx, V_idx]
+        cols += [H_idx, V_idx, H_idx, V_idx]
+        vals += [dx_dH, dx_dV, dy_dH, dy_dV]
+        # -u_i en el vano i y +u_{i-1} en el vano i
+        filas += [H_idx[:-1], H_idx[1:]]
+        cols += [u_idx, u_idx]
+        vals += [-np.ones(n - 1), np.ones(n - 1)]
+        # Equilibrio horizontal en cada suspensión
+        filas += [u_idx, u_idx]
+        cols += [H_idx[:-1], H_idx[1:]]
+        vals += [np.ones(n - 1), -np.ones(n - 1)]
+        J = sps.csc_matrix((np.concatenate(vals), (np.concatenate(filas), np.concatenate(cols))),
+                           shape=(n_inc, n_inc))
+        paso = spsolve(J, -r)
+        # Amortiguamiento: H positivo y residuo decreciente
+        t = 1.0
+        for _ in range(30):
+            H_n, V_n = H + t * paso[H_idx], V + t * paso[V_idx]
+            u_n = u + t * paso[u_idx]
+            if np.all(H_n > 0):
+                r_n = residuo(H_n, V_n, u_n)
+                if np.linalg.norm(r_n) < np.linalg.norm(r) or t < 1e-3:
+                    break
+            t /= 2
+        else:
+            raise ValueError("La cadena de vanos elásticos no convergió: ningún paso mantiene H > 0.")
+        H, V, u, r = H_n, V_n, u_n, r_n
+        it += 1
+    W = w * L0
+    u_der, u_izq = np.append(u, 0.0), np.insert(u, 0, 0.0)
+    return {
+        "H": H,
+        "V_left": V,
+        "T_left": np.hypot(H, V),
+        "T_right": np.hypot(H, V + W),
+        "u": u_der,
+        "l_def": l + u_der - u_izq,
+        "S": L0 + (np.hypot(H, V + W) * (V + W) - np.hypot(H, V) * V
+                   + H**2 * (np.arcsinh((V + W) / H) - np.arcsinh(V / H))) / (2 * w * EA),
+        "iteraciones": it,
+    }
+
+
+def cable_chain_profile(res: Dict[str, np.ndarray], L0, w, E: float, A: float, h, num: int = 50):
+    """
+    Perfiles de todos los vanos de una cadena, en coordenadas globales.
+    Args:
+        res: Resultado de solve_cable_chain.
+        L0, w, h: Los mismos datos usados en solve_cable_chain.
+        E, A: Módulo elástico y área.
+        num: Puntos por vano.
+    Returns:
+        Tuple (x, y) de forma (N, num).
+    """
+    L0, w, h = (np.asarray(v, dtype=float).ravel() for v in np.broadcast_arrays(L0, w, h))
+    s = L0[:, None] * np.linspace(0, 1, num)
+    x, y = elastic_catenary_xy(s, res["H"][:, None], res["V_left"][:, None], w[:, None], E * A)
+    x0 = np.concatenate(([0.0], np.cumsum(res["l_def"])[:-1]))
+    y0 = np.concatenate(([0.0], np.cumsum(h)[:-1]))
+    return x + x0[:, None], y + y0[:, None]
@@ -0,0 +1,322 @@
+import numpy as np
+import scipy.sparse as sps
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from scipy.sparse.linalg import splu
+from typing import Any, Dict, List, Optional, Tuple
+from utils.structural_helpers import validar_modulo_elastico, validar_area
+from utils.truss_solver import TrussModel
+
+# Grados de libertad restringidos por tipo de apoyo: (ux, uy, giro)
+APOYOS_RIGIDEZ = {
+    "pasador": (True, True, False),
+    "rodillo": (False, True, False),
+    "empotrado": (True, True, True),
+}
+
+
+def bandwidth(K) -> int:
+    """
+    Semiancho de banda de una matriz dispersa.
+    Args:
+        K: Matriz dispersa.
+    Returns:
+        max |i - j| sobre los términos no nulos.
+    """
+    K = K.tocoo()
+    return int(np.abs(K.row - K.col).max(initial=0))
+
+
+class FrameModel:
+    """
+    Modelo plano para el método de rigidez directa con elementos de cercha (E·A, 2 grados de
+    libertad por nudo) o de pórtico (E·A y E·I, 3 grados de libertad por nudo, nudos rígidos).
+    Las matrices de elemento se calculan en una sola pasada vectorizada y la matriz global
+    se ensambla en formato disperso.
+    """
+
+    def __init__(self, nodos: Dict[str, Tuple[float, float]],
+                 barras: List[Tuple[str, str, str]],
+                 apoyos: Dict[str, str],
+                 E, A, I=None, tipo: str = "cercha"):
+        """
+        Args:
+            nodos: Diccionario nodo -> (x, y).
+            barras: Lista de tuplas (barra, nodo_i, nodo_j).
+            apoyos: Diccionario nodo -> tipo ("pasador", "rodillo" o "empotrado").
+            E: Módulo elástico (escalar o uno por barra).
+            A: Área de la sección (escalar o uno por barra).
+            I: Inercia (escalar o una por barra); obligatoria para pórticos.
+            tipo: "cercha" o "portico".
+        Raises:
+            ValueError: Si los datos no son válidos.
+        """
+        names = list(nodos)
+        idx = {n: k for k, n in enumerate(names)}
+        for b, ni, nj in barras:
+            if ni not in idx or nj not in idx:
+                raise ValueError(f"La barra {b} referencia un nodo inexistente: {ni}-{nj}")
+        for n in apoyos:
+            if n not in idx:
+                raise ValueError(f"Apoyo en nodo inexistente: {n}")
+        ndof = 3 if tipo == "portico" else 2
+        restr = np.zeros((len(names), ndof), dtype=bool)
+        for n, t in apoyos.items():
+            t = str(t).lower()
+            if t not in APOYOS_RIGIDEZ:
+                raise ValueError(f"Tipo de apoyo no reconocido en nodo {n}: {t}")
+            restr[idx[n]] = APOYOS_RIGIDEZ[t][:ndof]
+        self._setup(np.array([nodos[n] for n in names], dtype=float).reshape(-1, 2),
+                    np.array([(idx[ni], idx[nj]) for _, ni, nj in barras], dtype=np.int64).reshape(-1, 2),
+                    restr, E, A, I, tipo)
+        self.node_names = names
+        self.bar_names = [b for b, _, _ in barras]
+
+    @classmethod
+    def from_arrays(cls, xy, conn, restr, E, A, I=None, tipo: str = "cercha") -> "FrameModel":
+        """
+        Construye el modelo directamente desde arreglos (modelos generados o grandes).
+        Args:
+            xy: Coordenadas de nodos (n×2).
+            conn: Conectividad de barras (b×2) con índices de nodo.
+            restr: Grados de libertad restringidos (n×2 para cercha, n×3 para pórtico).
+            E, A, I: Propiedades (escalares o una por barra).
+            tipo: "cercha" o "portico".
+        Returns:
+            FrameModel con nombres generados (n0, n1, ..., b0, b1, ...).
+        """
+        self = cls.__new__(cls)
+        self._setup(np.asarray(xy, dtype=float).reshape(-1, 2), np.asarray(conn, dtype=np.int64).reshape(-1, 2),
+                    np.asarray(restr, dtype=bool), E, A, I, tipo)
+        self.node_names = [f"n{k}" for k in range(len(self.xy))]
+        self.bar_names = [f"b{k}" for k in range(len(self.conn))]
+        return self
+
+    def _setup(self, xy, conn, restr, E, A, I, tipo):
+        if tipo not in ("cercha", "portico"):
+            raise ValueError(f"Tipo de modelo no reconocido: {tipo}")
+        self.tipo = tipo
+        self.ndof = 3 if tipo == "portico" else 2
+        # Geometría (longitudes, cosenos y validación) compartida con el modelo de nudos
+        geometria = TrussModel.from_arrays(xy, conn, [], [])
+        self.xy, self.conn = geometria.xy, geometria.conn
+        self.lengths, self.cosines = geometria.lengths, geometria.cosines
+        if restr.shape != (len(xy), self.ndof):
+            raise ValueError("La matriz de restricciones no coincide con el número de nudos.")
+        self.restr = restr
+        nb = len(conn)
+        self.E = np.broadcast_to(np.asarray(E, dtype=float), (nb,)).copy()
+        self.A = np.broadcast_to(np.asarray(A, dtype=float), (nb,)).copy()
+        if nb and self.E.min() <= 0:
+            validar_modulo_elastico(self.E.min())
+        if nb and self.A.min() <= 0:
+            validar_area(self.A.min())
+        if tipo == "portico":
+            if I is None:
+                raise ValueError("Los elementos de pórtico requieren la inercia I.")
+            self.I = np.broadcast_to(np.asarray(I, dtype=float), (nb,)).copy()
+            if nb and self.I.min() <= 0:
+                validar_area(self.I.min(), "inercia")
+        else:
+            self.I = None
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.xy)
+
+    @property
+    def n_bars(self) -> int:
+        return len(self.conn)
+
+    @property
+    def n_dofs(self) -> int:
+        return self.ndof * self.n_nodes
+
+    @property
+    def reaction_names(self) -> List[str]:
+        nombres = ("Rx", "Ry", "Mz")
+        return [f"{nombres[d]}_{self.node_names[n]}" for n, d in zip(*np.nonzero(self.restr))]
+
+    def dof_map(self) -> np.ndarray:
+        """Grados de libertad globales de cada barra (b × 2·ndof)."""
+        base = self.ndof * self.conn
+        return (base[:, :, None] + np.arange(self.ndof)).reshape(len(self.conn), -1)
+
+    def _transformation(self) -> np.ndarray:
+        """Matrices de rotación global -> local de cada barra (b × 6 × 6), solo pórticos."""
+        c, s = self.cosines[:, 0], self.cosines[:, 1]
+        R = np.zeros((self.n_bars, 3, 3))
+        R[:, 0, 0], R[:, 0, 1], R[:, 1, 0], R[:, 1, 1], R[:, 2, 2] = c, s, -s, c, 1.0
+        T = np.zeros((self.n_bars, 6, 6))
+        T[:, :3, :3], T[:, 3:, 3:] = R, R
+        return T
+
+    def _local_stiffness(self) -> np.ndarray:
+        """Matrices locales de pórtico (b × 6 × 6)."""
+        L, EA, EI = self.lengths, self.E * self.A, self.E * self.I
+        k = np.zeros((self.n_bars, 6, 6))
+        a = EA / L
+        k[:, 0, 0] = k[:, 3, 3] = a
+        k[:, 0, 3] = k[:, 3, 0] = -a
+        b12, b6, b4, b2 = 12 * EI / L**3, 6 * EI / L**2, 4 * EI / L, 2 * EI / L
+        k[:, 1, 1] = k[:, 4, 4] = b12
+        k[:, 1, 4] = k[:, 4, 1] = -b12
+        k[:, 1, 2] = k[:, 2, 1] = k[:, 1, 5] = k[:, 5, 1] = b6
+        k[:, 2, 4] = k[:, 4, 2] = k[:, 4, 5] = k[:, 5, 4] = -b6
+        k[:, 2, 2] = k[:, 5, 5] = b4
+        k[:, 2, 5] = k[:, 5, 2] = b2
+        return k
+
+    def element_stiffness(self) -> np.ndarray:
+        """
+        Matrices de rigidez de elemento en coordenadas globales.
+        Returns:
+            Arreglo (b × 2·ndof × 2·ndof).
+        """
+        if self.tipo == "cercha":
+            e = self.cosines
+            kee = (self.E * self.A / self.lengths)[:, None, None] * (e[:, :, None] * e[:, None, :])
+            return np.concatenate((np.concatenate((kee, -kee), 2), np.concatenate((-kee, kee), 2)), 1)
+        T = self._transformation()
+        return np.einsum("bji,bjk,bkl->bil", T, self._local_stiffness(), T)
+
+    def stiffness_matrix(self):
+        """
+        Ensambla la matriz de rigidez global sin bucles de Python.
+        Returns:
+            Matriz dispersa CSR (grados de libertad × grados de libertad).
+        """
+        D = self.dof_map()
+        k = self.element_stiffness()
+        filas = np.broadcast_to(D[:, :, None], k.shape).ravel()
+        cols = np.broadcast_to(D[:, None, :], k.shape).ravel()
+        return sps.coo_matrix((k.ravel(), (filas, cols)), shape=(self.n_dofs, self.n_dofs)).tocsr()
+
+    def load_vector(self, cargas: Dict[str, Tuple[float, ...]]) -> np.ndarray:
+        """
+        Vector de cargas nodales (Fx, Fy y, en pórticos, Mz antihorario).
+        Args:
+            cargas: Diccionario nodo -> (Fx, Fy) o (Fx, Fy, Mz).
+        Returns:
+            Vector de tamaño grados de libertad.
+        """
+        idx = {n: k for k, n in enumerate(self.node_names)}
+        F = np.zeros(self.n_dofs)
+        for n, valores in cargas.items():
+            if n not in idx:
+                raise ValueError(f"Carga en nodo inexistente: {n}")
+            valores = tuple(valores)[:self.ndof]
+            F[self.ndof * idx[n]:self.ndof * idx[n] + len(valores)] += valores
+        return F
+
+
+class StiffnessSolver:
+    """
+    Método de rigidez directa con la matriz de grados de libertad libres reordenada por
+    Reverse Cuthill–McKee (reduce el ancho de banda y el relleno) y factorizada una sola vez
+    con LU disperso. Cada caso de carga es solo un término independiente.
+    Ofrece la misma interfaz que FactorizedTruss (solve, solve_cases) más los desplazamientos.
+    """
+
+    def __init__(self, model: FrameModel, reorden: Optional[str] = "rcm"):
+        """
+        Args:
+            model: Modelo de cercha o pórtico.
+            reorden: "rcm" para Reverse Cuthill–McKee o None para el orden original.
+        Raises:
+            ValueError: Si la estructura es inestable (matriz de rigidez singular).
+        """
+        self.model = model
+        self.barras = model.bar_names
+        self.reacciones = model.reaction_names
+        self.K = model.stiffness_matrix()
+        self.libres = np.flatnonzero(~model.restr.ravel())
+        self.restringidos = np.flatnonzero(model.restr.ravel())
+        K_ff = self.K[self.libres][:, self.libres].tocsr()
+        self.ancho_banda_original = bandwidth(K_ff)
+        if reorden == "rcm" and K_ff.shape[0]:
+            self.permutacion = reverse_cuthill_mckee(K_ff, symmetric_mode=True)
+            K_ff = K_ff[self.permutacion][:, self.permutacion]
+        else:
+            self.permutacion = np.arange(K_ff.shape[0])
+        self.ancho_banda = bandwidth(K_ff)
+        if not K_ff.shape[0]:
+            self.lu = None
+            return
+        try:
+            # Matriz simétrica definida positiva ya reordenada: sin pivoteo ni permutación adicional
+            self.lu = splu(K_ff.tocsc(), permc_spec="NATURAL", diag_pivot_thresh=0.0,
+                           options={"SymmetricMode": True})
+        except RuntimeError:
+            raise ValueError("Matriz de rigidez singular: la estructura es un mecanismo o está mal apoyada.")
+        if np.any(self.lu.U.diagonal() <= 1e-12 * np.abs(self.lu.U.diagonal()).max()):
+            raise ValueError("Matriz de rigidez singular: la estructura es un mecanismo o está mal apoyada.")
+
+    def solve_vector(self, F: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Resuelve K·u = F para uno o varios vectores de carga.
+        Args:
+            F: Cargas nodales (grados de libertad) o (grados de libertad × casos).
+        Returns:
+            Diccionario con u (desplazamientos), N (axiales por barra, tensión positiva),
+            R (reacciones en el orden de reaction_names) y, en pórticos, extremos
+            (b × 6 [× casos]: N_i, V_i, M_i, N_j, V_j, M_j en ejes locales).
+        """
+        F = np.asarray(F, dtype=float)
+        u = np.zeros_like(F)
+        if self.lu is not None:
+            Ff = F[self.libres][self.permutacion]
+            uf = np.empty_like(Ff)
+            uf[self.permutacion] = self.lu.solve(Ff)
+            u[self.libres] = uf
+        m = self.model
+        ue = u[m.dof_map()]
+        res = {"u": u, "R": (self.K @ u - F)[self.restringidos]}
+        if m.tipo == "cercha":
+            du = ue[:, 2:] - ue[:, :2]
+            res["N"] = (m.E * m.A / m.lengths)[(slice(None),) + (None,) * (F.ndim - 1)] \
+                * np.einsum("bd,bd...->b...", m.cosines, du)
+        else:
+            fl = np.einsum("bij,bjk,bk...->bi...", m._local_stiffness(), m._transformation(), ue)
+            res["extremos"] = fl
+            res["N"] = -fl[:, 0]
+        return res
+
+    def analyze(self, cargas: Dict[str, Tuple[float, ...]]) -> Dict[str, Any]:
+        """
+        Resuelve un caso de carga con resultados por nombre.
+        Args:
+            cargas: Diccionario nodo -> (Fx, Fy) o (Fx, Fy, Mz).
+        Returns:
+            Diccionario con desplazamientos (nodo -> tupla), N (barra -> axial),
+            reacciones (nombre -> valor) y, en pórticos, extremos (barra -> 6 fuerzas locales).
+        """
+        r = self.solve_vector(self.model.load_vector(cargas))
+        m = self.model
+        res = {
+            "desplazamientos": dict(zip(m.node_names, map(tuple, r["u"].reshape(-1, m.ndof)))),
+            "N": dict(zip(m.bar_names, r["N"])),
+            "reacciones": dict(zip(self.reacciones, r["R"])),
+        }
+        if "extremos" in r:
+            res["extremos"] = dict(zip(m.bar_names, map(tuple, r["extremos"])))
+        return res
+
+    def solve(self, cargas: Dict[str, Tuple[float, ...]]):
+        """
+        Resuelve un caso de carga (misma interfaz que FactorizedTruss.solve).
+        Returns:
+            Tuple (N, R): fuerzas axiales por barra y reacciones por nombre.
+        """
+        res = self.analyze(cargas)
+        return res["N"], res["reacciones"]
+
+    def solve_cases(self, casos: Dict[str, Dict[str, Tuple[float, ...]]]):
+        """
+        Resuelve varios casos de carga contra la misma factorización.
+        Returns:
+            Tuple (N, R, N_max): N barras × casos, R reacciones × casos y N_max el máximo |N| por caso.
+        """
+        F = np.column_stack([self.model.load_vector(c) for c in casos.values()]) \
+            if casos else np.zeros((self.model.n_dofs, 0))
+        r = self.solve_vector(F)
+        return r["N"], r["R"], np.abs(r["N"]).max(axis=0, initial=0.0)
@@ -0,0 +1,100 @@
+"""
+Presupuesto de tiempo de importación de los módulos de utils.
+
+Mide cada módulo en un intérprete nuevo con `python -X importtime` (sin el arranque del
+intérprete) y verifica que no cargue dependencias pesadas que no necesita: así el
+arranque en frío de la app y de los procesos de trabajo (lotes, segundo plano) no crece
+sin que se note.
+
+Uso:
+    python -m utils.import_budget
+"""
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PESADOS = ("sympy", "numpy", "scipy", "plotly")
+
+# Módulo -> (presupuesto [s], dependencias pesadas que no debe importar)
+PRESUPUESTOS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "utils.structural_helpers": (0.3, PESADOS),  # validadores de las páginas
+    "utils.profiling": (0.2, PESADOS),
+    "utils.background": (0.2, PESADOS),  # proceso padre de los trabajos en segundo plano
+    "utils.piecewise_poly": (0.3, PESADOS),
+    "utils.catenary": (2.0, ("sympy", "plotly")),  # página del cable
+    "utils.truss_solver": (2.0, ("sympy", "plotly")),  # página de la cercha y trabajos simbólicos
+    "utils.batch_runner": (3.0, ("sympy", "plotly")),  # arranque de cada proceso de lotes
+}
+
+
+def import_time(modulo: str, repeticiones: int = 2) -> Tuple[float, List[str]]:
+    """
+    Tiempo de importación acumulado de un módulo en un intérprete nuevo.
+    Args:
+        modulo: Nombre del módulo.
+        repeticiones: Intérpretes lanzados; se toma el mínimo (el primero puede compilar .pyc).
+    Returns:
+        Tuple (segundos, dependencias pesadas cargadas).
+    Raises:
+        RuntimeError: Si el módulo no se puede importar.
+    """
+    codigo = (f"import sys, json; import {modulo}; "
+              f"print(json.dumps([m for m in {list(PESADOS)!r} if m in sys.modules]))")
+    mejor, cargados = float("inf"), []
+    for _ in range(repeticiones):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ,
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"No se pudo importar {modulo}: {proc.stderr.strip().splitlines()[-1:]}")
+        for linea in proc.stderr.splitlines():
+            # import time: self [us] | cumulative | nombre
+            partes = linea.split("|")
+            if len(partes) == 3 and partes[2].strip() == modulo:
+                mejor = min(mejor, int(partes[1]) / 1e6)
+        cargados = json.loads(proc.stdout.strip().splitlines()[-1])
+    return mejor, cargados
+
+
+def check_budget(presupuestos: Optional[Dict[str, Tuple[float, Sequence[str]]]] = None,
+                 informe=None, tiempos: bool = True) -> List[str]:
+    """
+    Verifica los presupuestos de importación.
+    Args:
+        presupuestos: Módulo -> (segundos, dependencias prohibidas) (por defecto PRESUPUESTOS).
+        informe: Flujo donde se escribe cada medición (None para no informar).
+        tiempos: Si es False solo se verifican las dependencias pesadas, no el tiempo
+            (que depende de la carga de la máquina).
+    Returns:
+        Descripción de cada incumplimiento (lista vacía si no hay).
+    """
+    fallas = []
+    for modulo, (limite, prohibidos) in (presupuestos or PRESUPUESTOS).items():
+        t, cargados = import_time(modulo, repeticiones=2 if tiempos else 1)
+        sobrantes = [m for m in cargados if m in prohibidos]
+        if informe is not None:
+            print(f"{modulo:<28} {1000 * t:>8.1f} ms / {1000 * limite:>6.0f} ms  "
+                  f"{', '.join(cargados) or '-'}", file=informe)
+        if tiempos and t > limite:
+            fallas.append(f"{modulo}: {1000 * t:.0f} ms excede el presupuesto de {1000 * limite:.0f} ms")
+        if sobrantes:
+            fallas.append(f"{modulo}: importa {', '.join(sobrantes)} al cargarse")
+    return fallas
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Verifica el presupuesto de tiempo de importación.")
+    parser.add_argument("modulos", nargs="*", help="Módulos a medir (por defecto, los de PRESUPUESTOS)")
+    args = parser.parse_args(argv)
+    presupuestos = {m: PRESUPUESTOS.get(m, (float("inf"), ())) for m in args.modulos} or None
+    fallas = check_budget(presupuestos, informe=sys.stdout)
+    for f in fallas:
+        print(f"FALLA {f}", file=sys.stderr)
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
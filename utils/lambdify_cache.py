@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Sequence, Callable
+from utils.lazy import lazy_import
+from utils.profiling import span
+
+sp = lazy_import("sympy")
+
+
+class LambdifyCache:
+    """
+    Caché LRU de funciones numéricas compiladas con sympy.lambdify.
+    La clave es la estructura de la expresión (las expresiones de SymPy son inmutables
+    y se comparan por estructura), los argumentos y los módulos, así que una misma
+    expresión nunca se compila dos veces dentro del proceso mientras siga en caché.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Args:
+            maxsize: Número máximo de funciones compiladas retenidas.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Any, Callable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lambdify(self, args, expr, modules: Sequence[str] = ("numpy",)) -> Callable:
+        """
+        Equivalente a sympy.lambdify con caché.
+        Args:
+            args: Símbolo o secuencia de símbolos.
+            expr: Expresión de SymPy.
+            modules: Módulos de evaluación.
+        Returns:
+            Función numérica compilada.
+        """
+        args_key = tuple(args) if isinstance(args, (list, tuple)) else args
+        clave = (args_key, sp.sympify(expr), tuple(modules))
+        with self._lock:
+            f = self._data.get(clave)
+            if f is not None:
+                self._data.move_to_end(clave)
+                self.hits += 1
+                return f
+            self.misses += 1
+        with span("lambdify"):
+            f = sp.lambdify(args, expr, modules=list(modules))
+        with self._lock:
+            self._data[clave] = f
+            self._data.move_to_end(clave)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return f
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de aciertos, fallos y tamaño actual."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+# Caché compartida por los helpers y las páginas
+LAMBDIFY_CACHE = LambdifyCache()
+
+
+def cached_lambdify(args, expr, modules: Sequence[str] = ("numpy",)) -> Callable:
+    """
+    sympy.lambdify a través de la caché compartida del proceso.
+    Args:
+        args: Símbolo o secuencia de símbolos.
+        expr: Expresión de SymPy.
+        modules: Módulos de evaluación.
+    Returns:
+        Función numérica compilada.
+    """
+    return LAMBDIFY_CACHE.lambdify(args, expr, modules)
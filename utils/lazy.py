@@ -0,0 +1,60 @@
+import importlib
+import sys
+import types
+from typing import Optional
+
+
+class LazyModule(types.ModuleType):
+    """
+    Módulo que se importa en el primer acceso a uno de sus atributos. Permite declarar
+    dependencias pesadas (SymPy, NumPy, Plotly, SciPy) al inicio de un módulo sin pagar su
+    importación hasta que se usa la funcionalidad que las necesita.
+    """
+
+    def __init__(self, nombre: str):
+        """
+        Args:
+            nombre: Nombre completo del módulo (p. ej. "plotly.graph_objs").
+        """
+        super().__init__(nombre)
+        self.__dict__["_modulo"] = None
+
+    def _load(self) -> types.ModuleType:
+        if self._modulo is None:
+            modulo = importlib.import_module(self.__name__)
+            # Los accesos siguientes ya no pasan por __getattr__
+            self.__dict__.update(modulo.__dict__)
+            self.__dict__["_modulo"] = modulo
+        return self._modulo
+
+    def __getattr__(self, atributo: str):
+        return getattr(self._load(), atributo)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        estado = "cargado" if self._modulo is not None else "sin cargar"
+        return f"<módulo diferido {self.__name__!r} ({estado})>"
+
+
+def lazy_import(nombre: str) -> types.ModuleType:
+    """
+    Módulo diferido; si ya está importado devuelve el módulo real.
+    Args:
+        nombre: Nombre completo del módulo.
+    Returns:
+        El módulo o un LazyModule que lo importa en el primer uso.
+    """
+    return sys.modules.get(nombre) or LazyModule(nombre)
+
+
+def loaded(nombre: str) -> Optional[types.ModuleType]:
+    """
+    Módulo si ya fue importado, sin importarlo.
+    Args:
+        nombre: Nombre completo del módulo.
+    Returns:
+        El módulo o None.
+    """
+    return sys.modules.get(nombre)
@@ -0,0 +1,111 @@
+import re
+import numpy as np
+from functools import partial
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+from utils.beam_solver import simple_beam_diagrams
+
+# Combinaciones LRFD habituales (ASCE 7): D muerta, L viva, Lr cubierta, S nieve, W viento, E sismo
+COMBINACIONES_LRFD = [
+    "1.4D",
+    "1.2D+1.6L+0.5Lr",
+    "1.2D+1.6Lr+1.0L",
+    "1.2D+1.0W+1.0L+0.5Lr",
+    "1.2D+1.0E+1.0L+0.2S",
+    "0.9D+1.0W",
+    "0.9D+1.0E",
+]
+
+
+def parse_combination(texto: str) -> Dict[str, float]:
+    """
+    Interpreta una combinación del tipo "1.2D + 1.6L - 0.5W".
+    Args:
+        texto: Suma de términos factor·caso (factor opcional, 1 por defecto).
+    Returns:
+        Diccionario {caso: factor}.
+    Raises:
+        ValueError: Si el texto no tiene el formato esperado.
+    """
+    limpio = texto.replace(" ", "").replace("*", "")
+    terminos = re.findall(r"([+-]?)(\d*\.?\d*)([A-Za-z]\w*)", limpio)
+    if not terminos or "".join("".join(t) for t in terminos) != limpio:
+        raise ValueError(f"Combinación no reconocida: {texto}")
+    factores: Dict[str, float] = {}
+    for signo, numero, caso in terminos:
+        f = float(numero) if numero else 1.0
+        factores[caso] = factores.get(caso, 0.0) + (-f if signo == "-" else f)
+    return factores
+
+
+def combination_matrix(combinaciones, casos: Sequence[str]) -> np.ndarray:
+    """
+    Matriz de factores (combinaciones × casos).
+    Args:
+        combinaciones: Lista de textos o {nombre: texto o diccionario {caso: factor}}.
+        casos: Nombres de los casos básicos, en el orden de los diagramas.
+    Returns:
+        Arreglo de forma (n_combinaciones, n_casos); los casos ausentes valen 0.
+    Raises:
+        ValueError: Si una combinación usa un caso no definido.
+    """
+    indice = {c: j for j, c in enumerate(casos)}
+    F = np.zeros((len(combinaciones), len(casos)))
+    filas = combinaciones.values() if isinstance(combinaciones, Mapping) else combinaciones
+    for i, combo in enumerate(filas):
+        factores = parse_combination(combo) if isinstance(combo, str) else combo
+        for caso, f in factores.items():
+            if caso not in indice:
+                raise ValueError(f"La combinación usa el caso '{caso}', que no está definido.")
+            F[i, indice[caso]] += f
+    return F
+
+
+def case_diagrams(L: float, casos: Mapping[str, Mapping[str, Sequence]], x_vals,
+                  resolver: Optional[Callable[..., Dict]] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Diagramas V y M de cada caso básico evaluados en una malla común.
+    Cada caso se resuelve una sola vez; las combinaciones se obtienen después por superposición.
+    Args:
+        L: Luz de la viga [m].
+        casos: {nombre: {"distribuidas": [...], "puntuales": [...], "momentos": [...]}}.
+        x_vals: Malla de estaciones [m].
+        resolver: Función (distribuidas, puntuales, momentos) -> {"V", "M"}; por defecto la
+                  viga simplemente apoyada de luz L (por ejemplo, functools.partial de
+                  continuous_beam_diagrams para vigas continuas).
+    Returns:
+        Tuple (nombres, V, M) con V y M de forma (n_casos, n_estaciones).
+    """
+    if resolver is None:
+        resolver = partial(simple_beam_diagrams, L)
+    nombres = list(casos)
+    x = np.asarray(x_vals, dtype=float)
+    V, M = np.zeros((len(nombres), x.size)), np.zeros((len(nombres), x.size))
+    for j, nombre in enumerate(nombres):
+        c = casos[nombre]
+        sol = resolver(c.get("distribuidas", ()), c.get("puntuales", ()), c.get("momentos", ()))
+        V[j], M[j] = sol["V"](x), sol["M"](x)
+    return nombres, V, M
+
+
+def combination_envelopes(V: np.ndarray, M: np.ndarray, F: np.ndarray,
+                          nombres_combinaciones: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Envolventes de todas las combinaciones con un solo producto matricial.
+    Args:
+        V, M: Diagramas de los casos básicos (n_casos × n_estaciones).
+        F: Matriz de factores (n_combinaciones × n_casos).
+        nombres_combinaciones: Nombres de las filas de F.
+    Returns:
+        Diccionario con V_comb y M_comb (n_combinaciones × n_estaciones), las envolventes
+        V_max, V_min, M_max, M_min y la combinación que controla cada una en cada estación
+        (control_V_max, ...).
+    """
+    nombres = np.asarray(list(nombres_combinaciones), dtype=object)
+    V_comb, M_comb = F @ V, F @ M
+    columnas = np.arange(V.shape[1])
+    res = {"V_comb": V_comb, "M_comb": M_comb}
+    for clave, valores in (("V", V_comb), ("M", M_comb)):
+        for sufijo, idx in (("max", valores.argmax(axis=0)), ("min", valores.argmin(axis=0))):
+            res[f"{clave}_{sufijo}"] = valores[idx, columnas]
+            res[f"control_{clave}_{sufijo}"] = nombres[idx]
+    return res
@@ -0,0 +1,140 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def axle_train(cargas: Sequence, separaciones: Sequence) -> List[Tuple[float, float]]:
+    """
+    Ejes del tren a partir de las columnas de la tabla editable: se descartan las filas sin
+    carga (vacías o nulas) y una separación vacía se toma como 0 (eje delantero).
+    Args:
+        cargas: Cargas de los ejes [kN]; None o NaN en las filas vacías.
+        separaciones: Distancias al eje delantero [m]; None o NaN si no se indicaron.
+    Returns:
+        Lista de pares (carga, separación).
+    """
+    ejes = []
+    for P, d in zip(cargas, separaciones):
+        P = np.nan if P is None else float(P)
+        d = np.nan if d is None else float(d)
+        if np.isnan(P) or P == 0:
+            continue
+        ejes.append((P, 0.0 if np.isnan(d) else d))
+    return ejes
+
+
+def influence_lines(L: float, x_vals, a_vals) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Líneas de influencia de la viga simplemente apoyada para una carga unitaria hacia abajo.
+    Usa la misma lógica que la página de la viga: R_A = (L - a)/L, V(x) = R_A - H(x - a)
+    y M(x) = R_A·x - (x - a)·H(x - a). Las cargas fuera de [0, L] no aportan.
+    Args:
+        L: Luz de la viga [m].
+        x_vals: Estaciones donde se evalúan V y M (m estaciones).
+        a_vals: Posiciones de la carga unitaria, de cualquier forma.
+    Returns:
+        Tuple (V_der, V_izq, M) con forma a_vals.shape + (m,). V_der es el cortante a la
+        derecha de la estación (carga en x incluida) y V_izq a la izquierda.
+    """
+    x = np.asarray(x_vals, dtype=float)
+    a = np.asarray(a_vals, dtype=float)[..., None]
+    sobre_viga = (a >= 0) & (a <= L)
+    RA = np.where(sobre_viga, (L - a) / L, 0.0)
+    V_der = RA - (sobre_viga & (a <= x))
+    V_izq = RA - (sobre_viga & (a < x))
+    M = RA * x - np.where(sobre_viga & (a <= x), x - a, 0.0)
+    return V_der, V_izq, M
+
+
+def default_positions(L: float, x_vals, separaciones, num: int = 201) -> np.ndarray:
+    """
+    Posiciones del eje delantero a recorrer: una malla uniforme desde la entrada hasta la
+    salida del tren, más todas las posiciones en que algún eje cae sobre una estación.
+    Como la respuesta es lineal por tramos en la posición del tren, los extremos en cada
+    estación se alcanzan en ese conjunto.
+    Args:
+        L: Luz de la viga [m].
+        x_vals: Estaciones [m].
+        separaciones: Distancias de cada eje al eje delantero [m].
+        num: Puntos de la malla uniforme.
+    Returns:
+        Arreglo ordenado de posiciones únicas.
+    """
+    d = np.asarray(separaciones, dtype=float)
+    fin = L + d.max(initial=0.0)
+    criticas = (np.asarray(x_vals, dtype=float)[:, None] + d[None, :]).ravel()
+    todas = np.concatenate((np.linspace(0.0, fin, num), criticas, [0.0, L, fin]))
+    return np.unique(todas[(todas >= 0) & (todas <= fin)])
+
+
+def moving_load_envelope(L: float, cargas: Sequence[float], separaciones: Sequence[float], x_vals,
+                         posiciones=None, ambos_sentidos: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Envolventes de cortante y momento para un tren de ejes que recorre la viga.
+    Todas las posiciones × estaciones se evalúan en una sola operación vectorizada
+    (sumando las líneas de influencia de cada eje).
+    Args:
+        L: Luz de la viga [m].
+        cargas: Cargas de los ejes [kN], positivas hacia abajo.
+        separaciones: Distancia de cada eje al eje delantero [m] (no negativas).
+        x_vals: Estaciones [m].
+        posiciones: Posiciones del eje delantero [m]; por defecto default_positions.
+        ambos_sentidos: Si también se recorre el tren invertido (sentido contrario).
+    Returns:
+        Diccionario con x, V_max, V_min, M_max, M_min por estación, la posición del eje
+        delantero que controla cada una (pos_V_max, ...) y el sentido (sentido_V_max, ...,
+        +1 directo, -1 invertido), más "posiciones" evaluadas.
+    Raises:
+        ValueError: Si el tren está vacío o las separaciones son negativas.
+    """
+    P = np.asarray(cargas, dtype=float).ravel()
+    d = np.asarray(separaciones, dtype=float).ravel()
+    if P.size == 0 or P.size != d.size:
+        raise ValueError("El tren de ejes debe tener una carga por cada separación.")
+    if np.any(d < 0):
+        raise ValueError("Las separaciones de los ejes deben ser no negativas.")
+    x = np.asarray(x_vals, dtype=float)
+    xi = default_positions(L, x, d) if posiciones is None else np.asarray(posiciones, dtype=float)
+    trenes = [(1, d)]
+    if ambos_sentidos and d.max() > 0:
+        trenes.append((-1, d.max() - d))
+    V_der, V_izq, M, sentido, pos = [], [], [], [], []
+    for s, dk in trenes:
+        # Posiciones de los ejes: (posiciones, ejes); se suman las líneas de influencia por eje
+        iv_d, iv_i, im = influence_lines(L, x, xi[:, None] - dk[None, :])
+        V_der.append(np.einsum("k,pkm->pm", P, iv_d))
+        V_izq.append(np.einsum("k,pkm->pm", P, iv_i))
+        M.append(np.einsum("k,pkm->pm", P, im))
+        sentido.append(np.full(xi.size, s))
+        pos.append(xi)
+    V = np.concatenate(V_der + V_izq)
+    M = np.concatenate(M)
+    sentido_V, pos_V = np.concatenate(sentido * 2), np.concatenate(pos * 2)
+    sentido_M, pos_M = np.concatenate(sentido), np.concatenate(pos)
+    columnas = np.arange(x.size)
+    res = {"x": x, "posiciones": xi}
+    for nombre, valores, pos_c, sent_c in (("V", V, pos_V, sentido_V), ("M", M, pos_M, sentido_M)):
+        for sufijo, idx in (("max", valores.argmax(axis=0)), ("min", valores.argmin(axis=0))):
+            res[f"{nombre}_{sufijo}"] = valores[idx, columnas]
+            res[f"pos_{nombre}_{sufijo}"] = pos_c[idx]
+            res[f"sentido_{nombre}_{sufijo}"] = sent_c[idx]
+    return res
+
+
+def critical_axle_positions(env: Dict[str, np.ndarray], separaciones: Sequence[float], clave: str = "M_max",
+                            estacion: Optional[int] = None) -> Tuple[float, float, np.ndarray]:
+    """
+    Posición crítica del tren para una envolvente.
+    Args:
+        env: Resultado de moving_load_envelope.
+        separaciones: Las mismas separaciones usadas en la envolvente.
+        clave: "V_max", "V_min", "M_max" o "M_min".
+        estacion: Índice de la estación; por defecto la de mayor valor absoluto.
+    Returns:
+        Tuple (valor, x de la estación, posiciones de cada eje sobre la viga).
+    """
+    valores = env[clave]
+    j = int(np.abs(valores).argmax()) if estacion is None else estacion
+    d = np.asarray(separaciones, dtype=float)
+    if env[f"sentido_{clave}"][j] < 0:
+        d = d.max() - d
+    return float(valores[j]), float(env["x"][j]), env[f"pos_{clave}"][j] - d
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+from math import comb
+from typing import List, Tuple, Any, Optional
+from utils.lazy import lazy_import
+
+# NumPy y SymPy se importan en el primer uso
+np = lazy_import("numpy")
+sp = lazy_import("sympy")
+P = lazy_import("numpy.polynomial.polynomial")
+
+
+class PiecewisePolynomial:
+    """
+    Función polinómica por tramos: puntos de quiebre (m+1) y coeficientes (m × grado+1).
+    Cada tramo i se escribe en la coordenada local t = x - breaks[i] con coeficientes
+    en potencias crecientes (convención de numpy.polynomial). Fuera de [breaks[0], breaks[-1]]
+    la función vale cero, y en cada quiebre toma el valor del tramo de la derecha,
+    así que los saltos (cargas puntuales) se representan sin aproximación.
+    """
+
+    def __init__(self, breaks, coefs):
+        """
+        Args:
+            breaks: Puntos de quiebre crecientes (m+1).
+            coefs: Coeficientes locales (m × grado+1), potencias crecientes.
+        """
+        self.breaks = np.asarray(breaks, dtype=float).ravel()
+        coefs = np.asarray(coefs, dtype=float)
+        m = max(len(self.breaks) - 1, 0)
+        self.coefs = coefs.reshape(m, -1) if coefs.size else np.zeros((m, 1))
+        if np.any(np.diff(self.breaks) <= 0):
+            raise ValueError("Los puntos de quiebre deben ser estrictamente crecientes.")
+
+    # --- Constructores ---
+
+    @classmethod
+    def zero(cls) -> "PiecewisePolynomial":
+        return cls([], np.zeros((0, 1)))
+
+    @classmethod
+    def from_global(cls, a: float, b: float, coefs_global) -> "PiecewisePolynomial":
+        """
+        Polinomio en x (coeficientes globales, potencias crecientes) definido en [a, b].
+        Args:
+            a, b: Intervalo.
+            coefs_global: Coeficientes en x.
+        Returns:
+            PiecewisePolynomial de un tramo (vacío si b <= a).
+        """
+        if b <= a:
+            return cls.zero()
+        local = np.polynomial.Polynomial(coefs_global)(np.polynomial.Polynomial([a, 1.0])).coef
+        return cls([a, b], [local])
+
+    @classmethod
+    def constant(cls, a: float, b: float, valor: float) -> "PiecewisePolynomial":
+        """Función constante en [a, b] (un escalón si b es el extremo del dominio)."""
+        return cls.from_global(a, b, [valor])
+
+    @classmethod
+    def steps(cls, posiciones, valores, dominio: Tuple[float, float]) -> "PiecewisePolynomial":
+        """
+        Suma de escalones Σ v_i H(x - a_i) en [xmin, xmax], construida de una sola vez.
+        Args:
+            posiciones: Posiciones a_i de los saltos (las que quedan fuera de [xmin, xmax) se ignoran).
+            valores: Magnitudes v_i de los saltos.
+            dominio: (xmin, xmax).
+        Returns:
+            PiecewisePolynomial constante por tramos en todo el dominio.
+        """
+        a, b = float(dominio[0]), float(dominio[1])
+        pos = np.asarray(posiciones, dtype=float).ravel()
+        val = np.broadcast_to(np.asarray(valores, dtype=float), pos.shape)
+        dentro = (pos >= a) & (pos < b)
+        pos, val = pos[dentro], val[dentro]
+        breaks = np.unique(np.concatenate(([a, b], pos)))
+        saltos = np.zeros(len(breaks))
+        np.add.at(saltos, np.searchsorted(breaks, pos), val)
+        return cls(breaks, np.cumsum(saltos)[:-1, None])
+
+    @classmethod
+    def from_sympy(cls, expr, x, dominio: Optional[Tuple[float, float]] = None) -> "PiecewisePolynomial":
+        """
+        Convierte una expresión de SymPy (polinomio, Piecewise o Heaviside) a tramos polinómicos.
+        Args:
+            expr: Expresión en x, polinómica en cada tramo.
+            x: Variable simbólica.
+            dominio: (xmin, xmax); obligatorio si alguna condición no está acotada.
+        Returns:
+            PiecewisePolynomial equivalente en el dominio.
+        """
+        expr = sp.piecewise_fold(sp.sympify(expr).rewrite(sp.Piecewise))
+        puntos = set()
+        if dominio is not None:
+            puntos.update(float(d) for d in dominio)
+        if isinstance(expr, sp.Piecewise):
+            for _, cond in expr.args:
+                for rel in cond.atoms(sp.core.relational.Relational):
+                    for lado in (rel.lhs, rel.rhs):
+                        if lado.is_number:
+                            puntos.add(float(lado))
+        puntos = sorted(puntos)
+        if dominio is not None:
+            puntos = [p for p in puntos if dominio[0] <= p <= dominio[1]]
+        if len(puntos) < 2:
+            raise ValueError("Se requiere un dominio acotado para convertir la expresión.")
+        resultado = cls.zero()
+        tramos = []
+        for a, b in zip(puntos[:-1], puntos[1:]):
+            medio = (a + b) / 2
+            pieza = expr
+            if isinstance(expr, sp.Piecewise):
+                pieza = next((e for e, c in expr.args if bool(c.subs(x, medio))), sp.S.Zero)
+            coefs = [float(c) for c in reversed(sp.Poly(pieza, x).all_coeffs())]
+            tramos.append(cls.from_global(a, b, coefs))
+        for t in tramos:
+            resultado = resultado + t
+        return resultado
+
+    @classmethod
+    def from_loads(cls, definicion: List[Tuple[Tuple[float, float], Any, str]],
+                   dominio: Optional[Tuple[float, float]] = None) -> "PiecewisePolynomial":
+        """
+        Construye la carga distribuida total a partir del formato de piecewise_load_to_expr.
+        Los tramos que se solapan se superponen (suman).
+        Args:
+            definicion: Lista de tuplas ((a, b), expr, var).
+            dominio: (0, L) de la viga; si se da, la carga se recorta y cubre todo el dominio
+                     (necesario para que las antiderivadas sigan definidas donde w = 0).
+        Returns:
+            PiecewisePolynomial de la carga total.
+        """
+        total = cls.zero() if dominio is None else cls.constant(dominio[0], dominio[1], 0.0)
+        for (a, b), expr, var in definicion:
+            total = total + cls.from_sympy(expr, sp.Symbol(var), (a, b))
+        return total if dominio is None else total.restrict(*dominio)
+
+    # --- Evaluación ---
+
+    @property
+    def degree(self) -> int:
+        return self.coefs.shape[1] - 1
+
+    @property
+    def dominio(self) -> Tuple[float, float]:
+        return (self.breaks[0], self.breaks[-1]) if len(self.breaks) else (0.0, 0.0)
+
+    def _index(self, x: np.ndarray) -> np.ndarray:
+        return np.clip(np.searchsorted(self.breaks, x, side="right") - 1, 0, len(self.coefs) - 1)
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        if not len(self.coefs):
+            return np.zeros_like(x)
+        i = self._index(x)
+        t = x - self.breaks[i]
+        y = np.zeros_like(t)
+        for k in range(self.degree, -1, -1):
+            y = y * t + self.coefs[i, k]
+        return np.where((x >= self.breaks[0]) & (x <= self.breaks[-1]), y, 0.0)
+
+    def left_limit(self, x):
+        """Valor por la izquierda en x (útil en los saltos)."""
+        x = np.asarray(x, dtype=float)
+        if not len(self.coefs):
+            return np.zeros_like(x)
+        i = np.clip(np.searchsorted(self.breaks, x, side="left") - 1, 0, len(self.coefs) - 1)
+        t = x - self.breaks[i]
+        y = np.zeros_like(t)
+        for k in range(self.degree, -1, -1):
+            y = y * t + self.coefs[i, k]
+        return np.where((x > self.breaks[0]) & (x <= self.breaks[-1]), y, 0.0)
+
+    # --- Cálculo exacto ---
+
+    def derivative(self) -> "PiecewisePolynomial":
+        if self.degree == 0:
+            return PiecewisePolynomial(self.breaks, np.zeros((len(self.coefs), 1)))
+        return PiecewisePolynomial(self.breaks, self.coefs[:, 1:] * np.arange(1, self.degree + 1))
+
+    def antiderivative(self, c0: float = 0.0) -> "PiecewisePolynomial":
+        """
+        Antiderivada exacta y continua, con valor c0 en breaks[0].
+        Args:
+            c0: Valor inicial.
+        Returns:
+            PiecewisePolynomial de grado + 1.
+        """
+        m = len(self.coefs)
+        nuevos = np.zeros((m, self.degree + 2))
+        nuevos[:, 1:] = self.coefs / np.arange(1, self.degree + 2)
+        if m:
+            h = np.diff(self.breaks)
+            finales = (nuevos * h[:, None] ** np.arange(self.degree + 2)).sum(axis=1)
+            nuevos[:, 0] = c0 + np.concatenate(([0.0], np.cumsum(finales)[:-1]))
+        return PiecewisePolynomial(self.breaks, nuevos)
+
+    def integrate(self, a: float, b: float) -> float:
+        """Integral definida exacta en [a, b] (cero fuera del dominio)."""
+        if not len(self.coefs):
+            return 0.0
+        F = self.antiderivative()
+        lo, hi = self.dominio
+        return float(F(np.clip(b, lo, hi)) - F(np.clip(a, lo, hi)))
+
+    def roots(self, tol: float = 1e-9) -> np.ndarray:
+        """
+        Raíces reales exactas tramo por tramo (polinomio de cada intervalo).
+        Los tramos idénticamente nulos se omiten.
+        Returns:
+            Arreglo ordenado de raíces dentro del dominio.
+        """
+        raices = []
+        escala = max(1.0, float(np.abs(self.coefs).max(initial=0.0)))
+        for i, c in enumerate(self.coefs):
+            c = np.trim_zeros(np.where(np.abs(c) > tol * escala, c, 0.0), "b")
+            if len(c) < 2:
+                continue
+            h = self.breaks[i + 1] - self.breaks[i]
+            for r in P.polyroots(c):
+                if abs(r.imag) <= 1e-9 * max(1.0, h) and -tol * h <= r.real <= h * (1 + tol):
+                    raices.append(self.breaks[i] + min(max(r.real, 0.0), h))
+        return np.unique(np.round(raices, 12)) if raices else np.zeros(0)
+
+    def zero_crossings(self) -> np.ndarray:
+        """
+        Posiciones donde la función se anula o cambia de signo: raíces de cada tramo
+        y quiebres donde el salto cruza el cero (p. ej. V bajo una carga puntual).
+        Returns:
+            Arreglo ordenado de posiciones.
+        """
+        b = self.breaks[1:-1]
+        saltos = b[self.left_limit(b) * self(b) < 0]
+        return np.unique(np.concatenate((self.roots(), saltos)))
+
+    def critical_points(self) -> np.ndarray:
+        """
+        Candidatos a extremo: extremos del dominio, quiebres y raíces de la derivada en cada tramo.
+        Returns:
+            Arreglo ordenado de posiciones.
+        """
+        return np.unique(np.concatenate((self.breaks, self.derivative().roots())))
+
+    def abs_max(self) -> Tuple[float, float]:
+        """
+        Máximo exacto de |f| evaluando los puntos críticos por ambos lados de cada quiebre.
+        Returns:
+            Tuple (valor con signo, posición).
+        """
+        if not len(self.coefs):
+            return 0.0, 0.0
+        xs = self.critical_points()
+        valores = np.concatenate((self(xs), self.left_limit(xs)))
+        k = int(np.argmax(np.abs(valores)))
+        return float(valores[k]), float(np.concatenate((xs, xs))[k])
+
+    # --- Aritmética ---
+
+    def _on_breaks(self, breaks: np.ndarray) -> np.ndarray:
+        """Coeficientes reexpresados sobre puntos de quiebre más finos (desplazamiento de Taylor)."""
+        m_new = len(breaks) - 1
+        out = np.zeros((m_new, self.degree + 1))
+        if not len(self.coefs) or m_new <= 0:
+            return out
+        medios = (breaks[:-1] + breaks[1:]) / 2
+        dentro = (medios > self.breaks[0]) & (medios < self.breaks[-1])
+        i = self._index(medios)
+        d = breaks[:-1] - self.breaks[i]
+        c = self.coefs[i]
+        for k in range(self.degree + 1):
+            for j in range(k + 1):
+                out[:, j] += c[:, k] * comb(k, j) * d ** (k - j)
+        out[~dentro] = 0.0
+        return out
+
+    def _align(self, other: "PiecewisePolynomial"):
+        breaks = np.union1d(self.breaks, other.breaks)
+        return breaks, self._on_breaks(breaks), other._on_breaks(breaks)
+
+    @staticmethod
+    def _pad(a: np.ndarray, n: int) -> np.ndarray:
+        return np.pad(a, ((0, 0), (0, n - a.shape[1])))
+
+    def __add__(self, other):
+        if not isinstance(other, PiecewisePolynomial):
+            c = self.coefs.copy()
+            c[:, 0] += float(other)
+            return PiecewisePolynomial(self.breaks, c)
+        breaks, a, b = self._align(other)
+        n = max(a.shape[1], b.shape[1])
+        return PiecewisePolynomial(breaks, self._pad(a, n) + self._pad(b, n))
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return PiecewisePolynomial(self.breaks, -self.coefs)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        if not isinstance(other, PiecewisePolynomial):
+            return PiecewisePolynomial(self.breaks, self.coefs * float(other))
+        breaks, a, b = self._align(other)
+        out = np.zeros((len(breaks) - 1, a.shape[1] + b.shape[1] - 1))
+        for k in range(a.shape[1]):
+            out[:, k:k + b.shape[1]] += a[:, k:k + 1] * b
+        return PiecewisePolynomial(breaks, out)
+
+    __rmul__ = __mul__
+
+    def restrict(self, a: float, b: float) -> "PiecewisePolynomial":
+        """Recorta la función al intervalo [a, b]."""
+        return self * PiecewisePolynomial.constant(a, b, 1.0)
+
+    # --- Conversión a SymPy ---
+
+    def to_sympy(self, x=None):
+        """
+        Convierte a un Piecewise de SymPy con polinomios en x global (para LaTeX).
+        Args:
+            x: Variable simbólica (por defecto Symbol('x')).
+        Returns:
+            Expresión Piecewise.
+        """
+        x = sp.Symbol('x') if x is None else x
+        piezas = []
+        m = len(self.coefs)
+        for i, c in enumerate(self.coefs):
+            a, b = self.breaks[i], self.breaks[i + 1]
+            poli = sp.expand(sum(sp.Float(ck) * (x - sp.Float(a)) ** k for k, ck in enumerate(c) if ck != 0))
+            cond = (x >= a) & ((x <= b) if i == m - 1 else (x < b))
+            piezas.append((poli, cond))
+        piezas.append((sp.S.Zero, True))
+        return sp.Piecewise(*piezas)
+
+    def __repr__(self):
+        return f"PiecewisePolynomial(tramos={len(self.coefs)}, grado={self.degree}, dominio={self.dominio})"
@@ -0,0 +1,246 @@
+"""
+Medición de tiempos por etapa de cálculo y perfil opcional con cProfile.
+
+Uso en una página:
+    perfil = Profiler("viga", cprofile=activar).start()
+    try:
+        with span("graficas"):
+            ...
+    finally:  # también con st.stop(), que interrumpe la página con una excepción
+        perfil.stop()
+        perfil.write_log()  # JSON lines en SYMPY_CIVIL_PROFILE_LOG
+
+Resumen de un registro acumulado:
+    python -m utils.profiling perfiles.jsonl
+"""
+import contextvars
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# Perfil activo en la ejecución actual (cada sesión de Streamlit corre en su propio hilo)
+_ACTUAL: contextvars.ContextVar = contextvars.ContextVar("perfil_activo", default=None)
+# Archivo JSON lines donde se acumulan los perfiles (None = no se escribe)
+PROFILE_LOG = os.environ.get("SYMPY_CIVIL_PROFILE_LOG") or None
+
+
+class Profiler:
+    """
+    Tiempos de una ejecución de página: tramos con nombre (anidables) medidos con
+    time.perf_counter y, opcionalmente, el perfil completo de cProfile.
+    """
+
+    def __init__(self, pagina: str, cprofile: bool = False, sesion: str = ""):
+        """
+        Args:
+            pagina: Nombre de la página o proceso medido.
+            cprofile: Si es True, captura también el perfil de cProfile.
+            sesion: Identificador de la sesión (para agregar registros).
+        """
+        self.pagina = pagina
+        self.sesion = sesion
+        self.spans: List[Dict[str, Any]] = []
+        self.inicio: Optional[float] = None
+        self.total = 0.0
+        self._nivel = 0
+        if cprofile:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+        else:
+            self._cprofile = None
+        self._activo = False
+
+    def start(self) -> "Profiler":
+        """Activa el perfil en el contexto actual (detiene uno anterior que quedara activo)."""
+        previo = _ACTUAL.get()
+        if previo is not None and previo is not self:
+            previo.stop()
+        _ACTUAL.set(self)
+        self._activo = True
+        self.inicio = time.perf_counter()
+        if self._cprofile is not None:
+            try:
+                self._cprofile.enable()
+            except ValueError:  # otro perfilador activo en el proceso
+                self._cprofile = None
+        return self
+
+    def stop(self) -> "Profiler":
+        """Detiene la medición; llamarlo de nuevo no tiene efecto."""
+        if not self._activo:
+            return self
+        self._activo = False
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        self.total = time.perf_counter() - self.inicio
+        if _ACTUAL.get() is self:
+            _ACTUAL.set(None)
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    @contextmanager
+    def span(self, nombre: str) -> Iterator[None]:
+        """
+        Mide un tramo con nombre; los tramos anidados guardan su nivel.
+        Args:
+            nombre: Nombre del tramo (p. ej. "integrate_shear_moment" o "etapa:flechas").
+        """
+        registro = {"nombre": nombre, "nivel": self._nivel,
+                    "inicio_s": time.perf_counter() - (self.inicio or 0.0), "duracion_s": 0.0}
+        self.spans.append(registro)
+        self._nivel += 1
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            registro["duracion_s"] = time.perf_counter() - t0
+            self._nivel -= 1
+
+    def table(self) -> List[Dict[str, Any]]:
+        """
+        Desglose por nombre de tramo, ordenado por tiempo total.
+        Returns:
+            Lista de filas con tramo, llamadas, total [ms] y % de la ejecución.
+        """
+        acumulado: Dict[str, List[float]] = {}
+        for s in self.spans:
+            acumulado.setdefault(s["nombre"], []).append(s["duracion_s"])
+        filas = [{"tramo": n, "llamadas": len(d), "total [ms]": 1000 * sum(d),
+                  "% ejecución": 100 * sum(d) / self.total if self.total else 0.0}
+                 for n, d in acumulado.items()]
+        return sorted(filas, key=lambda f: -f["total [ms]"])
+
+    def profile_text(self, n: int = 25, orden: str = "cumulative") -> str:
+        """
+        Funciones más costosas según cProfile.
+        Args:
+            n: Número de funciones listadas.
+            orden: Criterio de orden de pstats.
+        Returns:
+            Texto de pstats o cadena vacía si no se capturó el perfil.
+        """
+        if self._cprofile is None:
+            return ""
+        import io
+        import pstats
+        salida = io.StringIO()
+        pstats.Stats(self._cprofile, stream=salida).strip_dirs().sort_stats(orden).print_stats(n)
+        return salida.getvalue()
+
+    def record(self, **extra) -> Dict[str, Any]:
+        """Registro serializable de la ejecución (marca de tiempo, página, sesión, total y tramos)."""
+        return {"ts": time.time(), "pagina": self.pagina, "sesion": self.sesion, "total_s": self.total,
+                "spans": [{"nombre": s["nombre"], "nivel": s["nivel"], "duracion_s": s["duracion_s"]}
+                          for s in self.spans], **extra}
+
+    def write_log(self, path: Optional[str] = None, **extra):
+        """
+        Agrega el registro de la ejecución como una línea JSON.
+        Args:
+            path: Archivo de registro (por defecto PROFILE_LOG; si ambos son None no se escribe).
+            **extra: Campos adicionales del registro.
+        """
+        path = path or PROFILE_LOG
+        if not path:
+            return
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.record(**extra), ensure_ascii=False) + "\n")
+        except OSError:
+            pass  # el registro es diagnóstico: un fallo de escritura no detiene la página
+
+
+def current_profiler() -> Optional[Profiler]:
+    """Perfil activo en el contexto actual o None."""
+    return _ACTUAL.get()
+
+
+@contextmanager
+def span(nombre: str) -> Iterator[None]:
+    """
+    Mide un tramo en el perfil activo; sin perfil activo no hace nada.
+    Args:
+        nombre: Nombre del tramo.
+    """
+    perfil = _ACTUAL.get()
+    if perfil is None:
+        yield
+    else:
+        with perfil.span(nombre):
+            yield
+
+
+def timed(nombre: Optional[str] = None) -> Callable:
+    """
+    Decorador que mide cada llamada de la función como un tramo del perfil activo.
+    Args:
+        nombre: Nombre del tramo (por defecto, el de la función).
+    Returns:
+        Decorador.
+    """
+    def decorador(func: Callable) -> Callable:
+        etiqueta = nombre or func.__name__
+
+        @wraps(func)
+        def envoltura(*args, **kwargs):
+            perfil = _ACTUAL.get()
+            if perfil is None:
+                return func(*args, **kwargs)
+            with perfil.span(etiqueta):
+                return func(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def summarize_log(path: str) -> List[Dict[str, Any]]:
+    """
+    Agrega un registro JSON lines de varias ejecuciones y sesiones por página y tramo.
+    Args:
+        path: Archivo escrito con Profiler.write_log.
+    Returns:
+        Filas con pagina, tramo, llamadas, total_s, medio_ms, p50_ms y p95_ms, ordenadas por total.
+    """
+    duraciones: Dict[tuple, List[float]] = {}
+    with open(path, encoding="utf-8") as f:
+        for linea in f:
+            if not linea.strip():
+                continue
+            r = json.loads(linea)
+            duraciones.setdefault((r["pagina"], "(ejecución)"), []).append(r["total_s"])
+            for s in r["spans"]:
+                duraciones.setdefault((r["pagina"], s["nombre"]), []).append(s["duracion_s"])
+    filas = []
+    for (pagina, tramo), d in duraciones.items():
+        d = sorted(d)
+        filas.append({"pagina": pagina, "tramo": tramo, "llamadas": len(d), "total_s": sum(d),
+                      "medio_ms": 1000 * sum(d) / len(d), "p50_ms": 1000 * d[len(d) // 2],
+                      "p95_ms": 1000 * d[min(len(d) - 1, int(0.95 * len(d)))]})
+    return sorted(filas, key=lambda f: -f["total_s"])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Resume un registro de perfiles (JSON lines) por página y tramo.")
+    parser.add_argument("registro", help="Archivo escrito por las páginas (SYMPY_CIVIL_PROFILE_LOG)")
+    parser.add_argument("-n", type=int, default=30, help="Filas a mostrar (por defecto 30)")
+    args = parser.parse_args(argv)
+    print(f"{'página':<8} {'tramo':<36} {'llamadas':>8} {'total [s]':>10} {'medio [ms]':>11} "
+          f"{'p50 [ms]':>9} {'p95 [ms]':>9}")
+    for f in summarize_log(args.registro)[:args.n]:
+        print(f"{f['pagina']:<8} {f['tramo']:<36} {f['llamadas']:>8} {f['total_s']:>10.3f} "
+              f"{f['medio_ms']:>11.2f} {f['p50_ms']:>9.2f} {f['p95_ms']:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import types
+from collections import OrderedDict
+from functools import partial, wraps
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from utils.lazy import loaded
+
+
+def canonical(obj) -> Any:
+    """
+    Forma canónica serializable en JSON de un modelo (geometría, apoyos, cargas, opciones).
+    Los números se normalizan a float (6 y 6.0 dan la misma clave, -0.0 pasa a 0.0), los
+    diccionarios y conjuntos se ordenan, los arreglos se resumen por tipo, forma y contenido,
+    las expresiones de SymPy por su srepr y los objetos por su clase y atributos.
+    Args:
+        obj: Valor a normalizar.
+    Returns:
+        Estructura de listas, diccionarios, cadenas y números equivalente.
+    Raises:
+        TypeError: Si el valor no se puede normalizar.
+    """
+    if obj is None or isinstance(obj, (bool, str)):
+        return obj
+    if isinstance(obj, (int, float, np.integer, np.floating)) and not isinstance(obj, np.bool_):
+        return float(obj) + 0.0
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, dict):
+        return {"dict": sorted(([canonical(k), canonical(v)] for k, v in obj.items()), key=json.dumps)}
+    if isinstance(obj, (list, tuple)):
+        return [canonical(v) for v in obj]
+    if isinstance(obj, (set, frozenset)):
+        return {"set": sorted((canonical(v) for v in obj), key=json.dumps)}
+    if isinstance(obj, np.ndarray):
+        arr = np.ascontiguousarray(obj)
+        return {"ndarray": [arr.dtype.str, list(arr.shape), hashlib.sha256(arr.tobytes()).hexdigest()]}
+    sympy = loaded("sympy")  # sin SymPy importado no puede haber expresiones de SymPy
+    if sympy is not None and isinstance(obj, sympy.Basic):
+        return {"sympy": sympy.srepr(obj)}
+    if isinstance(obj, (types.FunctionType, types.BuiltinFunctionType, types.MethodType, partial)):
+        raise TypeError("Las funciones no forman parte de la clave de caché.")
+    if hasattr(obj, "__dict__"):
+        return {type(obj).__qualname__: canonical(vars(obj))}
+    raise TypeError(f"No se puede normalizar un valor de tipo {type(obj).__name__} para la caché.")
+
+
+def model_key(*partes, **opciones) -> str:
+    """
+    Clave SHA-256 del modelo normalizado.
+    Args:
+        *partes: Componentes del modelo (etapa, geometría, apoyos, cargas, ...).
+        **opciones: Opciones de cálculo.
+    Returns:
+        Resumen hexadecimal de la forma canónica.
+    """
+    texto = json.dumps(canonical([list(partes), opciones]), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Caché de resultados de cálculo con clave de contenido: LRU en memoria limitada por número
+    de entradas (y opcionalmente por bytes) y un nivel opcional en disco, con un archivo pickle
+    por clave, que sobrevive a los reinicios. Los resultados se comparten entre llamadas y no
+    deben modificarse.
+    """
+
+    def __init__(self, maxsize: int = 128, max_bytes: Optional[int] = None, directorio: Optional[str] = None):
+        """
+        Args:
+            maxsize: Número máximo de resultados en memoria.
+            max_bytes: Tamaño máximo en memoria (estimado con pickle) o None sin límite.
+            directorio: Carpeta del nivel en disco o None para usar solo memoria.
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.directorio = directorio
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave[:2], clave + ".pkl")
+
+    def _load(self, clave: str):
+        try:
+            with open(self._path(clave), "rb") as f:
+                datos = f.read()
+            return True, pickle.loads(datos), len(datos)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False, None, 0
+
+    def _dump(self, clave: str, datos: bytes):
+        destino = self._path(clave)
+        try:
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(destino), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(datos)
+            os.replace(tmp, destino)
+        except OSError:
+            pass  # el nivel en disco es opcional: un fallo de escritura solo pierde la entrada
+
+    def _store(self, clave: str, valor: Any, size: int):
+        with self._lock:
+            if clave in self._data:
+                self.bytes -= self._sizes.pop(clave, 0)
+            self._data[clave] = valor
+            self._data.move_to_end(clave)
+            self._sizes[clave] = size
+            self.bytes += size
+            while self._data and (len(self._data) > self.maxsize or
+                                  (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                viejo, _ = self._data.popitem(last=False)
+                self.bytes -= self._sizes.pop(viejo, 0)
+
+    def get(self, clave: str, defecto=None):
+        """
+        Busca un resultado en memoria y luego en disco.
+        Args:
+            clave: Clave del modelo (model_key).
+            defecto: Valor si no está en caché.
+        Returns:
+            El resultado guardado o defecto.
+        """
+        with self._lock:
+            if clave in self._data:
+                self._data.move_to_end(clave)
+                self.hits += 1
+                return self._data[clave]
+        if self.directorio:
+            encontrado, valor, size = self._load(clave)
+            if encontrado:
+                with self._lock:
+                    self.disk_hits += 1
+                self._store(clave, valor, size)
+                return valor
+        with self._lock:
+            self.misses += 1
+        return defecto
+
+    def put(self, clave: str, valor: Any):
+        """
+        Guarda un resultado en memoria y, si hay directorio, en disco.
+        Args:
+            clave: Clave del modelo (model_key).
+            valor: Resultado (debe poder serializarse con pickle si hay nivel en disco o max_bytes).
+        """
+        datos = None
+        if self.directorio or self.max_bytes is not None:
+            try:
+                datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                datos = None
+        self._store(clave, valor, len(datos) if datos is not None else 0)
+        if self.directorio and datos is not None:
+            self._dump(clave, datos)
+
+    def get_or_compute(self, clave: str, func: Callable[[], Any]) -> Any:
+        """
+        Devuelve el resultado en caché o lo calcula y lo guarda. Las excepciones no se guardan.
+        Args:
+            clave: Clave del modelo (model_key).
+            func: Función sin argumentos que calcula el resultado.
+        Returns:
+            Resultado del cálculo.
+        """
+        faltante = object()
+        valor = self.get(clave, faltante)
+        if valor is faltante:
+            valor = func()
+            self.put(clave, valor)
+        return valor
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de aciertos (memoria y disco), fallos y tamaño actual."""
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "size": len(self._data), "maxsize": self.maxsize, "bytes": self.bytes}
+
+    def summary(self) -> str:
+        """Resumen de los contadores para mostrar en la interfaz."""
+        s = self.stats()
+        return (f"Caché de resultados: {s['hits'] + s['disk_hits']} aciertos "
+                f"({s['disk_hits']} en disco), {s['misses']} fallos, {s['size']}/{s['maxsize']} entradas.")
+
+    def clear(self, disco: bool = False):
+        """
+        Vacía la memoria y reinicia los contadores.
+        Args:
+            disco: Si es True, borra también los archivos del nivel en disco.
+        """
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.hits = self.disk_hits = self.misses = self.bytes = 0
+        if disco and self.directorio and os.path.isdir(self.directorio):
+            for raiz, _, archivos in os.walk(self.directorio):
+                for a in archivos:
+                    if a.endswith(".pkl"):
+                        os.remove(os.path.join(raiz, a))
+
+
+# Caché compartida por las páginas; SYMPY_CIVIL_CACHE_DIR activa el nivel en disco
+RESULT_CACHE = ResultCache(directorio=os.environ.get("SYMPY_CIVIL_CACHE_DIR") or None)
+
+
+def memoize(etapa: str, cache: Optional[ResultCache] = None) -> Callable:
+    """
+    Decorador que guarda el resultado de una etapa de cálculo con clave de contenido
+    de sus argumentos normalizados.
+    Args:
+        etapa: Nombre de la etapa (forma parte de la clave).
+        cache: Caché a usar (por defecto RESULT_CACHE).
+    Returns:
+        Decorador.
+    """
+    def decorador(func: Callable) -> Callable:
+        @wraps(func)
+        def envoltura(*args, **kwargs):
+            c = RESULT_CACHE if cache is None else cache
+            return c.get_or_compute(model_key(etapa, *args, **kwargs), lambda: func(*args, **kwargs))
+        return envoltura
+    return decorador
@@ -0,0 +1,161 @@
+import ast
+from typing import Any, Dict, Mapping
+
+from utils.beam_solver import (PESO_PROPIO, beam_deflection, continuous_beam_diagrams,
+                               parse_distributed_loads, simple_beam_diagrams)
+from utils.catenary import solve_catenary
+from utils.frame_solver import FrameModel, StiffnessSolver
+from utils.truss_solver import FactorizedTruss
+
+# Propiedades por defecto para cerchas hiperestáticas resueltas por rigidez
+E_CERCHA = 2e8  # kN/m²
+A_CERCHA = 1e-3  # m²
+
+
+def _literal(valor, defecto=None):
+    """
+    Convierte un campo de escenario (texto de CSV o valor de JSON) a un objeto de Python.
+    Args:
+        valor: Texto con un literal de Python, número, lista o None.
+        defecto: Valor para campos vacíos.
+    Returns:
+        El valor interpretado con ast.literal_eval, o el propio texto si no es un literal.
+    """
+    if valor is None:
+        return defecto
+    if not isinstance(valor, str):
+        return valor
+    texto = valor.strip()
+    if not texto:
+        return defecto
+    try:
+        return ast.literal_eval(texto)
+    except (ValueError, SyntaxError):
+        return texto
+
+
+def _float(valor, defecto=None):
+    v = _literal(valor, defecto)
+    return defecto if v is None else float(v)
+
+
+def beam_scenario(datos: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Resuelve una viga con el mismo flujo que la página de la viga, sin interfaz.
+    Args:
+        datos: Campos L, Cargas_puntuales [(P, a)], Cargas_distribuidas ("(a,b,expr,tipo);..."),
+            Momentos [(M, a)], Peso_propio y, opcionales, Apoyos (tipo de la página, p. ej.
+            "empotrado-simple", o lista de (x, tipo)) y E [kN/m²], I [m⁴] para las flechas.
+    Returns:
+        Diccionario con reacciones, V_max, x_V_max, M_max, x_M_max y, si hay E e I, v_max y x_v_max.
+    Raises:
+        ValueError: Si los datos no son válidos o la viga es inestable.
+    """
+    L = _float(datos["L"])
+    puntuales = [(float(P), float(a)) for P, a in _literal(datos.get("Cargas_puntuales"), [])]
+    momentos = [(float(M), float(a)) for M, a in _literal(datos.get("Momentos"), [])]
+    for _, a in puntuales + momentos:
+        if not (0 <= a <= L):
+            raise ValueError(f"Carga o momento fuera del rango [0, L]: posición {a}")
+    texto = datos.get("Cargas_distribuidas") or ""
+    distribuidas, no_reconocidos = parse_distributed_loads(str(texto))
+    if no_reconocidos:
+        raise ValueError(f"Tipo de carga no reconocido: {no_reconocidos[0]}")
+    if _literal(datos.get("Peso_propio"), False):
+        distribuidas.append(((0, L), PESO_PROPIO, 'x'))
+
+    apoyos = _literal(datos.get("Apoyos"), "simple-simple")
+    if isinstance(apoyos, str):
+        x_nodos, tipos = [0.0, L], apoyos.split("-")
+    else:
+        x_nodos, tipos = [float(a) for a, _ in apoyos], [str(t) for _, t in apoyos]
+    E, I = _float(datos.get("E")), _float(datos.get("I"))
+    EI = E * I if E and I else 1.0
+
+    if tipos == ["simple", "simple"] and x_nodos == [0.0, L]:
+        viga = simple_beam_diagrams(L, distribuidas, puntuales, momentos)
+        reacciones = {"RA": viga["RA"], "RB": viga["RB"]}
+    else:
+        viga = continuous_beam_diagrams(x_nodos, tipos, distribuidas, puntuales, momentos, EI)
+        reacciones = {}
+        for xi, t, (R, Mr) in zip(viga["x_nodos"], viga["apoyos"], viga["reacciones"]):
+            if t != "libre":
+                reacciones[f"R_{xi:g}"] = float(R)
+            if t == "empotrado":
+                reacciones[f"M_{xi:g}"] = float(Mr)
+    V_max, x_V = viga["V"].abs_max()
+    M_max, x_M = viga["M"].abs_max()
+    res = {"reacciones": reacciones, "V_max": V_max, "x_V_max": x_V, "M_max": M_max, "x_M_max": x_M}
+    if E and I:
+        flecha = beam_deflection(viga["M"], x_nodos, tipos, EI)
+        res.update(v_max=float(flecha["v_max"]), x_v_max=float(flecha["x_v_max"]))
+    return res
+
+
+def truss_scenario(datos: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Resuelve una cercha: por equilibrio de nudos si es isostática y, si no, por el método
+    de rigidez con E y A del escenario (o E_CERCHA, A_CERCHA).
+    Args:
+        datos: Campos Nodos [(nodo, x, y)], Barras [(barra, ni, nj)], Apoyos [(nodo, tipo)],
+            Cargas_nodales [(nodo, Fx, Fy)] y, opcionales, E [kN/m²] y A [m²].
+    Returns:
+        Diccionario con metodo ("nudos" o "rigidez"), N (barra -> axial), reacciones y N_max.
+    Raises:
+        ValueError: Si la cercha es un mecanismo o los datos no son válidos.
+    """
+    nodos = {n: (float(xn), float(yn)) for n, xn, yn in _literal(datos["Nodos"])}
+    barras = [tuple(b) for b in _literal(datos["Barras"])]
+    apoyos = dict(_literal(datos["Apoyos"]))
+    cargas = {n: (float(Fx), float(Fy)) for n, Fx, Fy in _literal(datos.get("Cargas_nodales"), [])}
+    try:
+        N, R = FactorizedTruss(nodos, barras, apoyos).solve(cargas)
+        metodo = "nudos"
+    except ValueError:
+        modelo = FrameModel(nodos, barras, apoyos, _float(datos.get("E"), E_CERCHA),
+                            _float(datos.get("A"), A_CERCHA))
+        N, R = StiffnessSolver(modelo).solve(cargas)
+        metodo = "rigidez"
+    N = {b: float(v) for b, v in N.items()}
+    return {"metodo": metodo, "N": N, "reacciones": {r: float(v) for r, v in R.items()},
+            "N_max": max(map(abs, N.values()), default=0.0)}
+
+
+def cable_scenario(datos: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Resuelve un cable con la misma prioridad que la página: H dada, flecha objetivo o H = wL/4.
+    Args:
+        datos: Campos L, delta_h, w y, opcionales, f_obj y H.
+    Returns:
+        Diccionario con a, H, T_left, T_right, f_max, x_f y S.
+    Raises:
+        ValueError: Si los datos no son válidos o no hay solución.
+    """
+    L, delta_h, w = _float(datos["L"]), _float(datos.get("delta_h"), 0.0), _float(datos["w"])
+    H, f_obj = _float(datos.get("H"), 0.0), _float(datos.get("f_obj"), 0.0)
+    if H > 0:
+        sol = solve_catenary(L, delta_h, w, H=H)
+    elif f_obj > 0:
+        sol = solve_catenary(L, delta_h, w, f_obj=f_obj)
+    else:
+        sol = solve_catenary(L, delta_h, w, H=w * L / 4)
+    return {k: sol[k] for k in ("a", "H", "T_left", "T_right", "f_max", "x_f", "S")}
+
+
+ESCENARIOS = {"viga": beam_scenario, "cercha": truss_scenario, "cable": cable_scenario}
+
+
+def run_scenario(escenario: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Despacha un escenario según su campo Tipo (Viga, Cercha o Cable).
+    Args:
+        escenario: Diccionario con Tipo y los campos del problema.
+    Returns:
+        Resultados del problema.
+    Raises:
+        ValueError: Si el tipo no se reconoce o los datos no son válidos.
+    """
+    tipo = str(escenario.get("Tipo", "")).strip().lower()
+    if tipo not in ESCENARIOS:
+        raise ValueError(f"Tipo de escenario no reconocido: {escenario.get('Tipo')}")
+    return ESCENARIOS[tipo](escenario)
@@ -0,0 +1,121 @@
+from typing import Any, Callable, Dict, List, MutableMapping, Optional, Sequence, Set
+
+from utils.profiling import span
+from utils.result_cache import model_key
+
+
+class StageGraph:
+    """
+    Grafo de etapas de cálculo con dependencias explícitas (entradas → etapas → etapas).
+    Cada etapa guarda su salida junto con una huella de contenido de sus entradas y de las
+    huellas de las etapas de las que depende; al volver a ejecutar la página solo se
+    recalculan las etapas aguas abajo de una entrada que cambió. Las definiciones de las
+    etapas se registran en cada ejecución y el estado (huellas y salidas) vive en un
+    diccionario persistente, por ejemplo st.session_state.
+    """
+
+    def __init__(self, estado: Optional[MutableMapping] = None):
+        """
+        Args:
+            estado: Diccionario persistente nombre de etapa -> (huella, salida).
+        """
+        self.estado = {} if estado is None else estado
+        self._etapas: Dict[str, tuple] = {}
+        self._valores: Dict[str, Any] = {}
+        self._huellas: Dict[str, str] = {}
+        self.ejecutadas: List[str] = []
+        self.reutilizadas: List[str] = []
+
+    def stage(self, nombre: str, entradas: Sequence[str] = (), depende: Sequence[str] = ()) -> Callable:
+        """
+        Decorador que registra una etapa. La función recibe como argumentos con nombre sus
+        entradas y las salidas de las etapas de las que depende.
+        Args:
+            nombre: Nombre de la etapa.
+            entradas: Nombres de las entradas que usa.
+            depende: Etapas previas (deben estar registradas, así el grafo no tiene ciclos).
+        Returns:
+            Decorador que devuelve la función sin cambios.
+        Raises:
+            ValueError: Si una dependencia no está registrada.
+        """
+        for d in depende:
+            if d not in self._etapas:
+                raise ValueError(f"La etapa {nombre} depende de una etapa no registrada: {d}")
+
+        def decorador(func: Callable) -> Callable:
+            self._etapas[nombre] = (func, tuple(entradas), tuple(depende))
+            return func
+        return decorador
+
+    def set_inputs(self, **valores):
+        """Actualiza valores de entrada; las huellas se recalculan en el próximo acceso."""
+        self._valores.update(valores)
+        self._huellas.clear()
+
+    def fingerprint(self, nombre: str) -> str:
+        """
+        Huella de contenido de una etapa: sus entradas y las huellas de sus dependencias.
+        Args:
+            nombre: Nombre de la etapa.
+        Returns:
+            Resumen hexadecimal.
+        Raises:
+            ValueError: Si la etapa no existe o falta una entrada.
+        """
+        if nombre not in self._huellas:
+            if nombre not in self._etapas:
+                raise ValueError(f"Etapa no registrada: {nombre}")
+            _, entradas, depende = self._etapas[nombre]
+            faltan = [e for e in entradas if e not in self._valores]
+            if faltan:
+                raise ValueError(f"Falta la entrada {faltan[0]} de la etapa {nombre}")
+            self._huellas[nombre] = model_key(nombre, [self._valores[e] for e in entradas],
+                                              [self.fingerprint(d) for d in depende])
+        return self._huellas[nombre]
+
+    def get(self, nombre: str) -> Any:
+        """
+        Salida de una etapa, recalculando solo si cambió su huella (y, antes, sus dependencias).
+        Las excepciones de la etapa se propagan y no se guardan.
+        Args:
+            nombre: Nombre de la etapa.
+        Returns:
+            Salida de la etapa.
+        """
+        huella = self.fingerprint(nombre)
+        previo = self.estado.get(nombre)
+        if previo is not None and previo[0] == huella:
+            self.reutilizadas.append(nombre)
+            return previo[1]
+        func, entradas, depende = self._etapas[nombre]
+        args = {e: self._valores[e] for e in entradas}
+        args.update({d: self.get(d) for d in depende})
+        with span(f"etapa:{nombre}"):
+            salida = func(**args)
+        self.estado[nombre] = (huella, salida)
+        self.ejecutadas.append(nombre)
+        return salida
+
+    def downstream(self, nombres: Sequence[str]) -> List[str]:
+        """
+        Etapas afectadas por un cambio en entradas o etapas dadas, en orden de ejecución.
+        Args:
+            nombres: Nombres de entradas o de etapas.
+        Returns:
+            Lista de etapas que se recalcularían.
+        """
+        afectadas: Set[str] = set()
+        for etapa, (_, entradas, depende) in self._etapas.items():  # orden de registro = topológico
+            if etapa in nombres or set(entradas) & set(nombres) or set(depende) & afectadas:
+                afectadas.add(etapa)
+        return [e for e in self._etapas if e in afectadas]
+
+    def invalidate(self, nombres: Optional[Sequence[str]] = None):
+        """
+        Descarta las salidas guardadas de las etapas dadas y de las que dependen de ellas.
+        Args:
+            nombres: Etapas o entradas; None descarta todo.
+        """
+        for etapa in (list(self.estado) if nombres is None else self.downstream(nombres)):
+            self.estado.pop(etapa, None)
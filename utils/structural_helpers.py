@@ -1,11 +1,22 @@
-import sympy as sp
-import numpy as np
-import plotly.graph_objs as go
-from sympy import Piecewise, symbols, Symbol
-from typing import List, Tuple, Dict, Any, Union
+from __future__ import annotations
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import List, Tuple, Dict, Any, Union, Optional
+from utils.lazy import lazy_import
+from utils.piecewise_poly import PiecewisePolynomial
+from utils.lambdify_cache import cached_lambdify
+from utils.profiling import timed
 
-def symbols_safe(names: Union[str, List[str]], **kwargs) -> Union[Symbol, Tuple[Symbol, ...]]:
+# SymPy, NumPy y Plotly se importan en el primer uso: los validadores no los necesitan
+sp = lazy_import("sympy")
+np = lazy_import("numpy")
+go = lazy_import("plotly.graph_objs")
+solveset = lazy_import("sympy.solvers.solveset")
+
+
+def symbols_safe(names: Union[str, List[str]], **kwargs) -> Union[sp.Symbol, Tuple[sp.Symbol, ...]]:
     """
     Crea símbolos de SymPy con nombres LaTeX legibles para expresiones matemáticas.
     Args:
@@ -16,27 +27,152 @@ def symbols_safe(names: Union[str, List[str]], **kwargs) -> Union[Symbol, Tuple[
     """
     if isinstance(names, str):
         names = [n.strip() for n in names.replace(',', ' ').split()]
-    return symbols(names, **kwargs)
+    if len(names) == 1:
+        return sp.symbols(names[0], **kwargs)
+    return sp.symbols(names, **kwargs)
+
+
+def _solve_linear(system, vars_target):
+    """
+    Resuelve un sistema lineal cuadrado por LU (exacto) o con NumPy si los coeficientes son flotantes.
+    Returns:
+        Lista con un diccionario solución, o None si el sistema no es lineal, cuadrado y no singular.
+    """
+    try:
+        A, b = sp.linear_eq_to_matrix(system, vars_target)
+    except solveset.NonlinearError:
+        return None
+    if A.rows != A.cols:
+        return None
+    elementos = list(A) + list(b)
+    if all(e.is_Number for e in elementos) and any(e.is_Float for e in elementos):
+        A_num = np.array(A.tolist(), dtype=float)
+        try:
+            u = np.linalg.solve(A_num, np.array(b.tolist(), dtype=float).ravel())
+        except np.linalg.LinAlgError:
+            return None
+        return [{v: sp.Float(u_i) for v, u_i in zip(vars_target, u)}]
+    if A.det() == 0:
+        return None
+    u = A.LUsolve(b)
+    return [{v: u_i for v, u_i in zip(vars_target, u)}]
+
+
+# Cálculos abandonados por run_with_budget en hilos (solo cuando no se puede usar un proceso)
+MAX_HILOS_ABANDONADOS = 4
+_ABANDONADOS: set = set()
+_ABANDONADOS_LOCK = threading.Lock()
+
+
+def _run_in_thread(func, args, kwargs, timeout: float):
+    """
+    Variante en hilo de run_with_budget: un hilo no se puede detener, así que al agotarse el
+    presupuesto el cálculo se abandona (sigue ocupando CPU hasta terminar por su cuenta).
+    Con MAX_HILOS_ABANDONADOS cálculos abandonados aún en curso no se lanzan más.
+    """
+    with _ABANDONADOS_LOCK:
+        _ABANDONADOS.difference_update([f for f in _ABANDONADOS if f.done()])
+        if len(_ABANDONADOS) >= MAX_HILOS_ABANDONADOS:
+            raise TimeoutError(f"{len(_ABANDONADOS)} cálculos anteriores siguen en curso tras agotar su presupuesto.")
+    ejecutor = ThreadPoolExecutor(max_workers=1)
+    futuro = ejecutor.submit(func, *args, **kwargs)
+    ejecutor.shutdown(wait=False)
+    try:
+        return futuro.result(timeout=timeout)
+    except FuturesTimeout:
+        with _ABANDONADOS_LOCK:
+            _ABANDONADOS.add(futuro)
+        raise TimeoutError(f"{getattr(func, '__name__', 'cálculo')} excedió el presupuesto de {timeout} s.")
+
+
+def run_with_budget(func, *args, timeout: Optional[float] = None, **kwargs):
+    """
+    Ejecuta func(*args, **kwargs) con un presupuesto de tiempo.
+    El cálculo corre en un proceso aparte (BackgroundJob) que se termina al agotarse el
+    presupuesto, de modo que se detiene el trabajo y no solo la espera; el presupuesto se
+    cuenta desde que el proceso empieza a calcular. Dentro de un proceso de trabajo (que no
+    puede lanzar otros) o si func o sus argumentos no se pueden serializar, corre en un hilo
+    que se abandona al agotarse el presupuesto (ver _run_in_thread).
+    Args:
+        func: Función a ejecutar (importable desde un módulo para correr en un proceso).
+        timeout: Presupuesto en segundos (None = sin límite, en el hilo actual).
+    Returns:
+        Resultado de func.
+    Raises:
+        TimeoutError: Si func excede el presupuesto.
+    """
+    if timeout is None:
+        return func(*args, **kwargs)
+    import multiprocessing
+    import pickle
+    from utils.background import BackgroundJob
+    if multiprocessing.current_process().daemon:
+        return _run_in_thread(func, args, kwargs, timeout)
+    trabajo = BackgroundJob(func, args, kwargs, timeout=timeout)
+    try:
+        trabajo.start()
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return _run_in_thread(func, args, kwargs, timeout)
+    try:
+        while not trabajo.poll():
+            time.sleep(0.01)
+    finally:
+        trabajo.cancel()  # sin efecto si ya terminó; termina el proceso si se interrumpe la espera
+    if trabajo.transitorio:  # el proceso no arrancó o murió: se calcula en un hilo
+        return _run_in_thread(func, args, kwargs, timeout)
+    return trabajo.result()
 
 
-def solve_positive(system, vars_target):
+@timed()
+def simplified_latex(expr, timeout: Optional[float] = 2.0) -> str:
     """
-    Resuelve un sistema usando sympy.solve y filtra solo soluciones reales y positivas.
+    LaTeX de la expresión simplificada, o de la original si sympy.simplify excede el presupuesto.
+    Args:
+        expr: Expresión de SymPy.
+        timeout: Presupuesto en segundos para sympy.simplify.
+    Returns:
+        Cadena LaTeX.
+    """
+    try:
+        expr = run_with_budget(sp.simplify, expr, timeout=timeout)
+    except TimeoutError:
+        pass
+    return sp.latex(expr)
+
+
+@timed()
+def solve_positive(system, vars_target, timeout: Optional[float] = None):
+    """
+    Resuelve un sistema y filtra solo soluciones reales y positivas.
+    Los sistemas lineales cuadrados (p. ej. reacciones de equilibrio) se resuelven
+    por LU, o con NumPy si todos los coeficientes son flotantes; sympy.solve queda
+    solo para sistemas no lineales o singulares.
     Args:
         system: Ecuación o lista de ecuaciones.
         vars_target: Variable o lista de variables a resolver.
+        timeout: Presupuesto de tiempo en segundos para sympy.solve (opcional).
     Returns:
         Lista de soluciones reales y positivas.
+    Raises:
+        TimeoutError: Si sympy.solve excede el presupuesto de tiempo.
     """
-    sols = sp.solve(system, vars_target, dict=True)
+    if isinstance(system, (sp.Basic, int, float)):
+        system = [system]
+    if isinstance(vars_target, sp.Symbol):
+        vars_target = [vars_target]
+    system = [eq.lhs - eq.rhs if isinstance(eq, sp.Equality) else sp.sympify(eq) for eq in system]
+    sols = _solve_linear(system, vars_target)
+    if sols is None:
+        sols = run_with_budget(sp.solve, system, vars_target, dict=True, timeout=timeout)
     filtered = []
     for sol in sols:
-        if all(sp.im(sol[v]) == 0 and sp.re(sol[v]) > 0 for v in vars_target):
+        if all(v in sol for v in vars_target) and all(sp.im(sol[v]) == 0 and sp.re(sol[v]) > 0 for v in vars_target):
             filtered.append({v: sp.re(sol[v]) for v in vars_target})
     return filtered
 
 
-def piecewise_load_to_expr(definicion: List[Tuple[Tuple[float, float], Any, str]]) -> Piecewise:
+@timed()
+def piecewise_load_to_expr(definicion: List[Tuple[Tuple[float, float], Any, str]]) -> sp.Piecewise:
     """
     Convierte una definición de carga distribuida por tramos a una expresión Piecewise de SymPy.
     Args:
@@ -49,18 +185,24 @@ def piecewise_load_to_expr(definicion: List[Tuple[Tuple[float, float], Any, str]
     for (a, b), expr, var in definicion:
         x = symbols_safe(var)
         piezas.append((expr, (x >= a) & (x <= b)))
-    return Piecewise(*piezas)
+    return sp.Piecewise(*piezas)
 
 
+@timed()
 def integrate_shear_moment(w_expr, x=None):
     """
-    Calcula V(x) y M(x) a partir de una carga distribuida w(x) por integración simbólica.
+    Calcula V(x) y M(x) a partir de una carga distribuida w(x).
+    Con un PiecewisePolynomial la integración es exacta por aritmética de coeficientes
+    (C1 = C2 = 0 en el inicio del dominio); con una expresión de SymPy es simbólica.
     Args:
-        w_expr: Expresión de carga (puede ser Piecewise).
+        w_expr: Expresión de carga (puede ser Piecewise) o PiecewisePolynomial.
         x: Variable de integración (opcional).
     Returns:
         Tuple (V(x), M(x))
     """
+    if isinstance(w_expr, PiecewisePolynomial):
+        Vx = -w_expr.antiderivative()
+        return Vx, Vx.antiderivative()
     if x is None:
         x = list(w_expr.free_symbols)[0]
     Vx = -sp.integrate(w_expr, x) + sp.Symbol('C1')
@@ -68,21 +210,123 @@ def integrate_shear_moment(w_expr, x=None):
     return Vx, Mx
 
 
-def plot_piecewise(expr, x, dominio: Tuple[float, float], num=400, title=""):
+def _breakpoints(expr, x, dominio: Tuple[float, float]) -> np.ndarray:
+    """Quiebres de una expresión: límites de las condiciones de Piecewise y raíces de los Heaviside."""
+    puntos = {float(dominio[0]), float(dominio[1])}
+    if isinstance(expr, PiecewisePolynomial):
+        puntos.update(float(b) for b in expr.breaks)
+    else:
+        expr = sp.sympify(expr)
+        for pw in expr.atoms(sp.Piecewise):
+            for _, cond in pw.args:
+                for rel in cond.atoms(sp.core.relational.Relational):
+                    puntos.update(float(lado) for lado in (rel.lhs, rel.rhs) if lado.is_number)
+        for h in expr.atoms(sp.Heaviside):
+            arg = h.args[0]
+            if arg.is_polynomial(x) and sp.Poly(arg, x).degree() == 1:
+                # Raíces simbólicas (p. ej. Heaviside(x - a)), complejas o excluidas por las
+                # hipótesis de x no son quiebres: el muestreo adaptativo cubre ese tramo
+                puntos.update(float(r) for r in sp.solve(arg, x) if r.is_real and r.is_number)
+    puntos = np.array(sorted(puntos))
+    return puntos[(puntos >= dominio[0]) & (puntos <= dominio[1])]
+
+
+def adaptive_samples(expr, x, dominio: Tuple[float, float], num: int = 400, tol: float = 1e-3):
+    """
+    Muestreo adaptativo de una función por tramos para graficar.
+    Toma los quiebres de la estructura (Piecewise, Heaviside o PiecewisePolynomial),
+    duplica x en cada salto (valor por la izquierda y por la derecha) y subdivide solo
+    los intervalos donde la curva se aparta de la cuerda más de tol·rango. Los tramos
+    rectos quedan con sus dos extremos.
+    Args:
+        expr: Expresión simbólica o PiecewisePolynomial.
+        x: Variable simbólica.
+        dominio: (xmin, xmax).
+        num: Presupuesto máximo aproximado de puntos.
+        tol: Tolerancia relativa al rango de la función.
+    Returns:
+        Tuple (x_vals, y_vals).
+    """
+    quiebres = _breakpoints(expr, x, dominio)
+    if isinstance(expr, PiecewisePolynomial):
+        f, f_izq, f_der = expr, expr.left_limit, expr
+    else:
+        f = cached_lambdify(x, expr)
+        delta = 1e-9 * max(1.0, dominio[1] - dominio[0])
+        # Límites laterales aproximados en los quiebres interiores; exactos en los extremos
+        lado = lambda v, d: f(np.where((v > dominio[0]) & (v < dominio[1]), v + d, v))
+        f_izq = lambda v: lado(np.asarray(v, dtype=float), -delta)
+        f_der = lambda v: lado(np.asarray(v, dtype=float), delta)
+    evaluar = lambda v: np.broadcast_to(np.asarray(f(v), dtype=float), np.shape(v)).astype(float)
+    # Intervalos iniciales: 4 subdivisiones por tramo
+    a0, b0 = quiebres[:-1], quiebres[1:]
+    t = np.linspace(0, 1, 5)
+    a = (a0[:, None] + (b0 - a0)[:, None] * t[:-1]).ravel()
+    b = (a0[:, None] + (b0 - a0)[:, None] * t[1:]).ravel()
+    tramo = np.repeat(np.arange(len(a0)), 4)
+    fa, fb = evaluar(a), evaluar(b)
+    inicio, fin = np.isin(a, a0), np.isin(b, b0)
+    fa[inicio] = np.broadcast_to(f_der(a[inicio]), a[inicio].shape)
+    fb[fin] = np.broadcast_to(f_izq(b[fin]), b[fin].shape)
+    rango = max(np.ptp(np.concatenate((fa, fb))), 1e-12)
+    while len(a) < num:
+        m = (a + b) / 2
+        fm = evaluar(m)
+        dividir = np.abs(fm - (fa + fb) / 2) > tol * rango
+        if not dividir.any():
+            break
+        dividir &= np.cumsum(dividir) <= num - len(a)
+        a = np.concatenate((a[~dividir], a[dividir], m[dividir]))
+        b, fa, fb, tramo = (np.concatenate((b[~dividir], m[dividir], b[dividir])),
+                            np.concatenate((fa[~dividir], fa[dividir], fm[dividir])),
+                            np.concatenate((fb[~dividir], fm[dividir], fb[dividir])),
+                            np.concatenate((tramo[~dividir], tramo[dividir], tramo[dividir])))
+        orden = np.argsort(a, kind="stable")
+        a, b, fa, fb, tramo = a[orden], b[orden], fa[orden], fb[orden], tramo[orden]
+    # Un punto por intervalo más el extremo derecho de cada tramo (duplica x en los saltos)
+    fin = np.append(tramo[1:] != tramo[:-1], True)
+    x_vals = np.empty(len(a) + fin.sum())
+    y_vals = np.empty_like(x_vals)
+    pos = np.arange(len(a)) + np.concatenate(([0], np.cumsum(fin)[:-1]))
+    x_vals[pos], y_vals[pos] = a, fa
+    x_vals[pos[fin] + 1], y_vals[pos[fin] + 1] = b[fin], fb[fin]
+    # Elimina puntos repetidos donde la función es continua
+    repetido = np.append(False, (np.diff(x_vals) == 0) & (np.diff(y_vals) == 0))
+    x_vals, y_vals = x_vals[~repetido], y_vals[~repetido]
+    # Tramos rectos: basta con sus extremos
+    if len(x_vals) > 2:
+        dx = np.diff(x_vals)
+        pend = np.diff(y_vals) / np.where(dx > 0, dx, 1.0)
+        quitar = np.zeros(len(x_vals), dtype=bool)
+        quitar[1:-1] = (dx[:-1] > 0) & (dx[1:] > 0) & np.isclose(pend[1:], pend[:-1], rtol=1e-9, atol=1e-12 * rango)
+        x_vals, y_vals = x_vals[~quitar], y_vals[~quitar]
+    return x_vals, y_vals
+
+
+@timed()
+def plot_piecewise(expr, x, dominio: Tuple[float, float], num=400, title="", adaptive: bool = True):
     """
     Grafica una función por tramos (Piecewise o similar) usando plotly.
     Args:
-        expr: Expresión simbólica (Piecewise o función de x).
+        expr: Expresión simbólica (Piecewise o función de x) o PiecewisePolynomial,
+              que se evalúa directamente sin lambdify.
         x: Variable simbólica.
         dominio: (xmin, xmax) del eje x.
-        num: Número de puntos.
+        num: Número de puntos (máximo aproximado si adaptive=True).
         title: Título del gráfico.
+        adaptive: Muestreo adaptativo con saltos exactos (por defecto) o uniforme.
     Returns:
         Figura de plotly.
     """
-    x_vals = np.linspace(dominio[0], dominio[1], num)
-    f_lambd = sp.lambdify(x, expr, modules=["numpy"])
-    y_vals = f_lambd(x_vals)
+    if adaptive:
+        x_vals, y_vals = adaptive_samples(expr, x, dominio, num=num)
+    else:
+        x_vals = np.linspace(dominio[0], dominio[1], num)
+        if isinstance(expr, PiecewisePolynomial):
+            y_vals = expr(x_vals)
+        else:
+            f_lambd = cached_lambdify(x, expr)
+            y_vals = f_lambd(x_vals)
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=x_vals, y=y_vals, mode='lines', name=str(expr)))
     fig.update_layout(title=title, xaxis_title=str(x), yaxis_title="y")
@@ -97,9 +341,9 @@ def validar_longitud(valor, nombre="longitud"):
         valor: Valor a validar.
         nombre: Nombre de la variable (para mensajes).
     Raises:
-        ValueError: Si el valor no es positivo.
+        ValueError: Si el valor no es positivo (o es NaN).
     """
-    if valor <= 0:
+    if not valor > 0:  # también rechaza NaN
         raise ValueError(f"{nombre.capitalize()} debe ser mayor que cero. Valor recibido: {valor}")
     return valor
 
@@ -110,9 +354,9 @@ def validar_modulo_elastico(valor, nombre="módulo elástico"):
         valor: Valor a validar.
         nombre: Nombre de la variable (para mensajes).
     Raises:
-        ValueError: Si el valor no es positivo.
+        ValueError: Si el valor no es positivo (o es NaN).
     """
-    if valor <= 0:
+    if not valor > 0:  # también rechaza NaN
         raise ValueError(f"{nombre.capitalize()} debe ser mayor que cero. Valor recibido: {valor}")
     return valor
 
@@ -123,9 +367,9 @@ def validar_area(valor, nombre="área"):
         valor: Valor a validar.
         nombre: Nombre de la variable (para mensajes).
     Raises:
-        ValueError: Si el valor no es positivo.
+        ValueError: Si el valor no es positivo (o es NaN).
     """
-    if valor <= 0:
+    if not valor > 0:  # también rechaza NaN
         raise ValueError(f"{nombre.capitalize()} debe ser mayor que cero. Valor recibido: {valor}")
     return valor
 
@@ -0,0 +1,406 @@
+import numpy as np
+import scipy.sparse as sps
+from scipy.sparse.linalg import splu, onenormest, LinearOperator
+from typing import Callable, List, Tuple, Dict, Any, Optional
+
+
+def reaction_dofs(apoyos: Dict[str, str]) -> List[Tuple[str, str, int]]:
+    """
+    Lista las reacciones de apoyo como incógnitas del sistema de nudos.
+    Args:
+        apoyos: Diccionario nodo -> tipo ("pasador" o "rodillo").
+    Returns:
+        Lista de tuplas (nombre, nodo, dirección) con dirección 0 = x, 1 = y.
+    """
+    reacciones = []
+    for n, tipo in apoyos.items():
+        tipo = str(tipo).lower()
+        if tipo == "pasador":
+            reacciones.append((f"Rx_{n}", n, 0))
+            reacciones.append((f"Ry_{n}", n, 1))
+        elif tipo == "rodillo":
+            reacciones.append((f"Ry_{n}", n, 1))
+        else:
+            raise ValueError(f"Tipo de apoyo no reconocido en nodo {n}: {tipo}")
+    return reacciones
+
+
+class TrussModel:
+    """
+    Modelo compacto de cercha plana basado en arreglos.
+    Guarda coordenadas (n×2), conectividad entera (b×2), longitudes y cosenos
+    directores calculados en una sola pasada vectorizada, y un índice de
+    incidencia nodo -> barras en formato CSR (ptr, bars).
+    """
+
+    def __init__(self, nodos: Dict[str, Tuple[float, float]],
+                 barras: List[Tuple[str, str, str]],
+                 apoyos: Dict[str, str]):
+        """
+        Args:
+            nodos: Diccionario nodo -> (x, y).
+            barras: Lista de tuplas (barra, nodo_i, nodo_j).
+            apoyos: Diccionario nodo -> tipo de apoyo.
+        Raises:
+            ValueError: Si una barra o apoyo referencia un nodo inexistente o hay barras de longitud nula.
+        """
+        self.node_names = list(nodos)
+        self.bar_names = [b for b, _, _ in barras]
+        idx = {n: k for k, n in enumerate(self.node_names)}
+        for b, ni, nj in barras:
+            if ni not in idx or nj not in idx:
+                raise ValueError(f"La barra {b} referencia un nodo inexistente: {ni}-{nj}")
+        xy = np.array([nodos[n] for n in self.node_names], dtype=float).reshape(-1, 2)
+        conn = np.array([(idx[ni], idx[nj]) for _, ni, nj in barras], dtype=np.int64).reshape(-1, 2)
+        reacciones = reaction_dofs(apoyos)
+        for _, n, _ in reacciones:
+            if n not in idx:
+                raise ValueError(f"Apoyo en nodo inexistente: {n}")
+        self.reaction_names = [r for r, _, _ in reacciones]
+        self._setup(xy, conn,
+                    np.array([idx[n] for _, n, _ in reacciones], dtype=np.int64),
+                    np.array([d for _, _, d in reacciones], dtype=np.int64))
+
+    @classmethod
+    def from_arrays(cls, xy, conn, react_node, react_dir):
+        """
+        Construye el modelo directamente desde arreglos (modelos generados o grandes).
+        Args:
+            xy: Coordenadas de nodos (n×2).
+            conn: Conectividad de barras (b×2) con índices de nodo.
+            react_node: Índice de nodo de cada reacción.
+            react_dir: Dirección de cada reacción (0 = x, 1 = y).
+        Returns:
+            TrussModel con nombres generados (n0, n1, ..., b0, b1, ...).
+        """
+        self = cls.__new__(cls)
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        conn = np.asarray(conn, dtype=np.int64).reshape(-1, 2)
+        self.node_names = [f"n{k}" for k in range(len(xy))]
+        self.bar_names = [f"b{k}" for k in range(len(conn))]
+        react_node = np.asarray(react_node, dtype=np.int64)
+        react_dir = np.asarray(react_dir, dtype=np.int64)
+        self.reaction_names = [f"R{'xy'[d]}_{self.node_names[n]}" for n, d in zip(react_node, react_dir)]
+        self._setup(xy, conn, react_node, react_dir)
+        return self
+
+    def _setup(self, xy, conn, react_node, react_dir):
+        self.xy = xy
+        self.conn = conn
+        self.react_node = react_node
+        self.react_dir = react_dir
+        if conn.size and (conn.min() < 0 or conn.max() >= len(xy)):
+            raise ValueError("La conectividad referencia nodos fuera de rango.")
+        d = xy[conn[:, 1]] - xy[conn[:, 0]]
+        self.lengths = np.hypot(d[:, 0], d[:, 1])
+        nulas = np.flatnonzero(self.lengths == 0)
+        if nulas.size:
+            raise ValueError(f"La barra {self.bar_names[nulas[0]]} tiene longitud nula.")
+        self.cosines = d / self.lengths[:, None]
+        # Incidencia CSR: barras del nodo k en bars[ptr[k]:ptr[k+1]]
+        extremos = conn.ravel()
+        orden = np.argsort(extremos, kind="stable")
+        self.incidence_bars = orden // 2
+        self.incidence_ptr = np.concatenate(([0], np.cumsum(np.bincount(extremos, minlength=len(xy)))))
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.xy)
+
+    @property
+    def n_bars(self) -> int:
+        return len(self.conn)
+
+    @property
+    def unknowns(self) -> List[str]:
+        return self.bar_names + self.reaction_names
+
+    def bars_at(self, nodo: int) -> np.ndarray:
+        """
+        Índices de las barras que concurren en un nodo.
+        Args:
+            nodo: Índice del nodo.
+        Returns:
+            Arreglo de índices de barra.
+        """
+        return self.incidence_bars[self.incidence_ptr[nodo]:self.incidence_ptr[nodo + 1]]
+
+    def equilibrium_matrix(self):
+        """
+        Ensambla la matriz de equilibrio de nudos sin bucles de Python.
+        Returns:
+            Matriz dispersa CSC de tamaño 2·nodos × (barras + reacciones).
+        """
+        nb, nr = self.n_bars, len(self.react_node)
+        i, j = self.conn[:, 0], self.conn[:, 1]
+        c, s = self.cosines[:, 0], self.cosines[:, 1]
+        barras = np.arange(nb)
+        # La barra tira del nudo i hacia j y del nudo j hacia i
+        filas = np.concatenate((2 * i, 2 * i + 1, 2 * j, 2 * j + 1, 2 * self.react_node + self.react_dir))
+        cols = np.concatenate((barras, barras, barras, barras, nb + np.arange(nr)))
+        vals = np.concatenate((c, s, -c, -s, np.ones(nr)))
+        return sps.csc_matrix((vals, (filas, cols)), shape=(2 * self.n_nodes, nb + nr))
+
+    def load_vector(self, cargas: Dict[str, Tuple[float, float]]) -> np.ndarray:
+        """
+        Construye el término independiente A·u = -F a partir de cargas por nombre de nodo.
+        Args:
+            cargas: Diccionario nodo -> (Fx, Fy).
+        Returns:
+            Vector de tamaño 2·nodos.
+        """
+        idx = {n: k for k, n in enumerate(self.node_names)}
+        rhs = np.zeros(2 * self.n_nodes)
+        for n, (fx, fy) in cargas.items():
+            if n not in idx:
+                raise ValueError(f"Carga en nodo inexistente: {n}")
+            rhs[2 * idx[n]] -= fx
+            rhs[2 * idx[n] + 1] -= fy
+        return rhs
+
+
+def assemble_truss_matrix(nodos: Dict[str, Tuple[float, float]],
+                          barras: List[Tuple[str, str, str]],
+                          apoyos: Dict[str, str]):
+    """
+    Ensambla la matriz de equilibrio de nudos como matriz dispersa.
+    Cada nudo aporta dos filas (ΣFx, ΣFy); las columnas son las fuerzas axiales
+    de las barras (positivas en tensión) seguidas de las reacciones.
+    Args:
+        nodos: Diccionario nodo -> (x, y).
+        barras: Lista de tuplas (barra, nodo_i, nodo_j).
+        apoyos: Diccionario nodo -> tipo de apoyo.
+    Returns:
+        Tuple (A, incognitas) con A en formato CSC e incognitas la lista de nombres de columna.
+    """
+    modelo = TrussModel(nodos, barras, apoyos)
+    return modelo.equilibrium_matrix(), modelo.unknowns
+
+
+def _cond_estimate(A, lu) -> float:
+    """Estima el número de condición en norma 1 usando la factorización LU."""
+    n = A.shape[0]
+    inv = LinearOperator((n, n), matvec=lu.solve, rmatvec=lambda b: lu.solve(b, trans="T"),
+                         dtype=float)
+    return float(onenormest(A) * onenormest(inv))
+
+
+def truss_stability(model: TrussModel, cond_max: float = 1e12, max_dense: int = 4000) -> Dict[str, Any]:
+    """
+    Verifica rango y condicionamiento de la matriz de equilibrio antes de resolver.
+    Si el sistema es cuadrado y la factorización LU está bien condicionada la cercha
+    es isostática y estable (camino rápido). En otro caso se calcula la SVD para
+    identificar mecanismos (espacio nulo de Aᵀ: desplazamientos sin resistencia)
+    y redundancias (espacio nulo de A: estados de autoesfuerzo).
+    Args:
+        model: Modelo de cercha.
+        cond_max: Número de condición a partir del cual el sistema se trata como singular.
+        max_dense: Tamaño máximo para el diagnóstico detallado con SVD densa.
+    Returns:
+        Diccionario con ecuaciones, incognitas, rango, condicion, estable, isostatica,
+        mecanismos (lista de nudos involucrados por modo), modos_mecanismo (2·nodos × k)
+        y redundantes (lista de incógnitas involucradas por estado de autoesfuerzo).
+    """
+    A = model.equilibrium_matrix()
+    n_eq, n_unk = A.shape
+    reporte = {"ecuaciones": n_eq, "incognitas": n_unk, "rango": None, "condicion": None,
+               "estable": False, "isostatica": False, "mecanismos": [],
+               "modos_mecanismo": np.zeros((n_eq, 0)), "redundantes": []}
+    if n_eq == n_unk and n_eq > 0:
+        try:
+            cond = _cond_estimate(A, splu(A))
+        except RuntimeError:
+            cond = np.inf
+        reporte["condicion"] = cond
+        if cond < cond_max:
+            reporte.update(rango=n_eq, estable=True, isostatica=True)
+            return reporte
+    if max(n_eq, n_unk) > max_dense:
+        return reporte
+    U, sv, Vt = np.linalg.svd(A.toarray())
+    tol = max(sv.max(initial=0.0) / cond_max, np.finfo(float).eps * max(n_eq, n_unk) * sv.max(initial=0.0))
+    r = int((sv > tol).sum())
+    reporte["rango"] = r
+    reporte["condicion"] = float(sv[0] / sv[r - 1]) if r else np.inf
+    reporte["estable"] = r == n_eq
+    reporte["isostatica"] = r == n_eq == n_unk
+    modos = U[:, r:]
+    reporte["modos_mecanismo"] = modos
+    for k in range(modos.shape[1]):
+        d = np.hypot(modos[0::2, k], modos[1::2, k])
+        reporte["mecanismos"].append([model.node_names[i] for i in np.flatnonzero(d > 1e-6 * d.max())])
+    incognitas = model.unknowns
+    for k in range(r, n_unk):
+        t = np.abs(Vt[k])
+        reporte["redundantes"].append([incognitas[i] for i in np.flatnonzero(t > 1e-6 * t.max())])
+    return reporte
+
+
+def _clean(u: np.ndarray) -> np.ndarray:
+    """Anula el ruido de redondeo (por columna) para clasificar barras nulas."""
+    escala = np.maximum(1.0, np.abs(u).max(axis=0, initial=0.0))
+    u[np.abs(u) < 1e-9 * escala] = 0.0
+    return u
+
+
+class FactorizedTruss:
+    """
+    Cercha isostática con la matriz de equilibrio factorizada (LU disperso) una sola vez.
+    La geometría y los apoyos fijan la factorización; cada caso de carga es solo
+    un término independiente, así que muchos casos se resuelven en una llamada.
+    """
+
+    def __init__(self, nodos: Dict[str, Tuple[float, float]],
+                 barras: List[Tuple[str, str, str]],
+                 apoyos: Dict[str, str]):
+        """
+        Args:
+            nodos: Diccionario nodo -> (x, y).
+            barras: Lista de tuplas (barra, nodo_i, nodo_j).
+            apoyos: Diccionario nodo -> tipo de apoyo.
+        Raises:
+            ValueError: Si el sistema no es cuadrado o es singular (mecanismo).
+        """
+        self._factorize(TrussModel(nodos, barras, apoyos))
+
+    @classmethod
+    def from_model(cls, model: TrussModel) -> "FactorizedTruss":
+        """
+        Factoriza un TrussModel ya construido (por ejemplo, desde arreglos).
+        Args:
+            model: Modelo de cercha.
+        Returns:
+            FactorizedTruss listo para resolver casos de carga.
+        """
+        self = cls.__new__(cls)
+        self._factorize(model)
+        return self
+
+    def _factorize(self, model: TrussModel):
+        self.model = model
+        self.A = self.model.equilibrium_matrix()
+        self.incognitas = self.model.unknowns
+        self.barras = self.model.bar_names
+        self.reacciones = self.model.reaction_names
+        if self.A.shape[0] != self.A.shape[1]:
+            raise ValueError(
+                f"Sistema no isostático: ecuaciones={self.A.shape[0]}, incógnitas={self.A.shape[1]}."
+            )
+        try:
+            self.lu = splu(self.A)
+        except RuntimeError:
+            raise ValueError("Sistema singular: la cercha es un mecanismo o está mal apoyada.")
+
+    def _solve(self, rhs: np.ndarray) -> np.ndarray:
+        u = self.lu.solve(rhs)
+        if not np.all(np.isfinite(u)):
+            raise ValueError("Sistema singular: la cercha es un mecanismo o está mal apoyada.")
+        return _clean(u)
+
+    def solve(self, cargas: Dict[str, Tuple[float, float]]):
+        """
+        Resuelve un caso de carga.
+        Args:
+            cargas: Diccionario nodo -> (Fx, Fy).
+        Returns:
+            Tuple (N, R): fuerzas axiales por barra y reacciones por nombre.
+        """
+        u = self._solve(self.model.load_vector(cargas))
+        nb = len(self.barras)
+        return dict(zip(self.barras, u[:nb])), dict(zip(self.reacciones, u[nb:]))
+
+    def solve_cases(self, casos: Dict[str, Dict[str, Tuple[float, float]]]):
+        """
+        Resuelve varios casos de carga contra la misma factorización.
+        Args:
+            casos: Diccionario caso -> cargas (nodo -> (Fx, Fy)).
+        Returns:
+            Tuple (N, R, N_max): N es una matriz barras × casos, R reacciones × casos
+            y N_max el máximo |N| de cada caso.
+        """
+        rhs = np.column_stack([self.model.load_vector(c) for c in casos.values()]) \
+            if casos else np.zeros((self.A.shape[0], 0))
+        u = self._solve(rhs)
+        nb = len(self.barras)
+        N, R = u[:nb], u[nb:]
+        return N, R, np.abs(N).max(axis=0, initial=0.0)
+
+
+def solve_truss(nodos: Dict[str, Tuple[float, float]],
+                barras: List[Tuple[str, str, str]],
+                apoyos: Dict[str, str],
+                cargas: Dict[str, Tuple[float, float]]):
+    """
+    Resuelve una cercha isostática por el método de nudos con un solver disperso directo.
+    Args:
+        nodos: Diccionario nodo -> (x, y).
+        barras: Lista de tuplas (barra, nodo_i, nodo_j).
+        apoyos: Diccionario nodo -> tipo de apoyo.
+        cargas: Diccionario nodo -> (Fx, Fy).
+    Returns:
+        Tuple (N, R): fuerzas axiales por barra y reacciones por nombre.
+    Raises:
+        ValueError: Si el sistema no es cuadrado o es singular (mecanismo).
+    """
+    return FactorizedTruss(nodos, barras, apoyos).solve(cargas)
+
+
+def solve_truss_symbolic(nodos: Dict[str, Tuple[float, float]],
+                         barras: List[Tuple[str, str, str]],
+                         apoyos: Dict[str, str],
+                         cargas: Dict[str, Tuple[float, float]],
+                         progreso: Optional[Callable[[float, str], None]] = None
+                         ) -> Optional[Tuple[Dict[str, float], Dict[str, float]]]:
+    """
+    Resuelve una cercha por el método de nudos con sympy.solve (ejemplos pequeños).
+    Args:
+        nodos: Diccionario nodo -> (x, y).
+        barras: Lista de tuplas (barra, nodo_i, nodo_j).
+        apoyos: Diccionario nodo -> tipo de apoyo.
+        cargas: Diccionario nodo -> (Fx, Fy).
+        progreso: Función (fracción, descripción) que recibe el avance por etapas
+            (p. ej. utils.background.report_progress en un trabajo en segundo plano).
+    Returns:
+        Tuple (N, R) con fuerzas axiales por barra y reacciones por nombre, o None si no hay solución.
+    Raises:
+        ValueError: Si la geometría o los apoyos no son válidos.
+    """
+    import sympy as sp
+    from utils.structural_helpers import symbols_safe
+
+    if progreso is not None:
+        progreso(0.0, "Ensamblando ecuaciones de nudos")
+    modelo = TrussModel(nodos, barras, apoyos)
+    # --- Variables simbólicas para fuerzas en barras y reacciones ---
+    N_barras = {b: symbols_safe(f'N_{b}') for b in modelo.bar_names}
+    reacciones = {nombre: symbols_safe(nombre) for nombre, _, _ in reaction_dofs(apoyos)}
+    eqs = []
+    for k, n in enumerate(modelo.node_names):
+        # Barras conectadas al nodo (índice de incidencia nodo -> barras)
+        eq_fx = 0
+        eq_fy = 0
+        for bi in modelo.bars_at(k):
+            cos, sen = modelo.cosines[bi]
+            # Sentido: de i a j
+            if modelo.conn[bi, 0] != k:
+                cos, sen = -cos, -sen
+            b = modelo.bar_names[bi]
+            eq_fx += N_barras[b] * cos
+            eq_fy += N_barras[b] * sen
+        if f"Rx_{n}" in reacciones:
+            eq_fx += reacciones[f"Rx_{n}"]
+        if f"Ry_{n}" in reacciones:
+            eq_fy += reacciones[f"Ry_{n}"]
+        fx, fy = cargas.get(n, (0, 0))
+        eqs.append(eq_fx + fx)
+        eqs.append(eq_fy + fy)
+
+    incognitas = list(N_barras.values()) + list(reacciones.values())
+    if progreso is not None:
+        progreso(0.2, f"sympy.solve: {len(eqs)} ecuaciones, {len(incognitas)} incógnitas")
+    sols = sp.solve(eqs, incognitas, dict=True)
+    if not sols or any(v not in sols[0] for v in incognitas):
+        return None
+    sol = sols[0]
+    return ({b: float(sol[v]) for b, v in N_barras.items()},
+            {k: float(sol[v]) for k, v in reacciones.items()})